@@ -1,45 +1,243 @@
 # app.py
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import plotly.express as px
-from matplotlib.ticker import MaxNLocator
-import seaborn as sns
-import openai
 import sys
 import os
-import io
 from datetime import datetime
 
 # 모듈 경로 추가
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from modules.analysis.categorize import run_keyword_analysis, generate_wordcloud_from_freq
-from modules.analysis.summary_module import generate_summary_with_gpt
-from modules.analysis.sentiment_module import (
-    analyze_sentiment_with_finbert,
-    refine_neutral_keywords_with_gpt,
-    merge_sentiment_results,
-    summarize_sentiment_by_category
+from modules.llm_cache import get_default_cache
+from modules.keyword_index import canon_settings, configure_canonicalization, get_default_keyword_index
+from modules.analysis.category_classifier import (
+    CATEGORY_MODES,
+    classifier_settings,
+    configure_category_classifier,
+    get_default_category_classifier
 )
-from modules.analysis_pipeline import AnalysisPipeline
-from langchain_openai import ChatOpenAI
-from modules.question_detector import detect_question_columns
-from modules.make_longformat import make_longformat
-
-# 폰트 설정
-plt.rcParams['font.family'] = 'AppleGothic'
-plt.rcParams['axes.unicode_minus'] = False
+from modules.analysis.dedup import DEDUP_MODES, configure_dedup, dedup_settings
+from modules.analysis.local_keywords import KEYWORD_MODES, configure_keyword_extractor, extractor_settings
+from modules.analysis.finbert_backend import (
+    available_backends,
+    finbert_settings,
+    configure_finbert,
+    is_classifier_loaded
+)
+from modules.charts import ensure_charts, ensure_store_charts
+from modules.file_loader import ingest_file
+from modules.llm_client import configure_rate_limits, rate_limiter
+from modules.job_queue import JobQueue
+from modules.metrics import METRICS_FILE_NAME, load_metrics
+from modules.result_browser import (
+    build_run_index,
+    discover_runs,
+    list_subject_files,
+    make_thumbnail,
+    page_count,
+    paginate,
+    run_signature,
+    subject_dir_signature
+)
+from modules.result_store import CHART_FILES, RESULT_TABLES, ResultStore
 
 # 기본 설정
 st.set_page_config(page_title="HR 응답 분석", layout="wide")
 
-# GPT 모델 정의
-llm = ChatOpenAI(
-    model="gpt-4o-mini",
-    temperature=0,
-    openai_api_key=st.secrets["openai_section"]["api_key"]
-)
+# 분석 작업 큐 (서버 프로세스에서 하나만 생성, 작업자 수는 HR_JOB_WORKERS로 지정, 0이면 별도 작업자 프로세스 사용)
+@st.cache_resource
+def get_job_queue():
+    return JobQueue().start(int(os.environ.get("HR_JOB_WORKERS", "1")))
+
+job_queue = get_job_queue()
+
+JOB_STATUS_LABELS = {
+    "queued": "⏳ 대기 중",
+    "running": "🏃 실행 중",
+    "cancelling": "🛑 취소 중",
+    "completed": "✔️ 완료",
+    "failed": "❌ 실패",
+    "cancelled": "⏹️ 취소됨",
+}
+
+# 최근 작업 목록 (몇 초마다 이 영역만 새로고침)
+@st.fragment(run_every=3)
+def show_jobs_panel():
+    jobs = job_queue.list(limit=10)
+    if not jobs:
+        st.caption("등록된 분석 작업이 없습니다.")
+        return
+    for job in jobs:
+        params = job["params"]
+        with st.container(border=True):
+            col_info, col_action = st.columns([5, 1])
+            col_info.markdown(
+                f"**{params.get('source') or job['id']}** · `{job['id']}` · {JOB_STATUS_LABELS.get(job['status'], job['status'])}"
+            )
+            col_info.progress(min(max(job["progress"], 0.0), 1.0), text=job["message"] or "")
+            if job["result"]:
+                result = job["result"]
+                col_info.caption(
+                    f"분석 {result['saved']}명, 재사용 {result['reused']}명, 건너뜀 {result['skipped']}명 → "
+                    f"`{result['analysis_dir']}`"
+                )
+            if job["error"]:
+                col_info.error(job["error"])
+
+            if job["status"] in ("queued", "running"):
+                if col_action.button("취소", key=f"cancel_{job['id']}"):
+                    job_queue.cancel(job["id"])
+            elif job["status"] in ("failed", "cancelled"):
+                if col_action.button("이어서 실행", key=f"resume_{job['id']}"):
+                    job_queue.resume(job["id"])
+
+            # 실행 중인 대상자의 작성 중인 요약 (GPT 스트리밍)
+            if job["status"] in ("running", "cancelling") and job["partial"]:
+                with col_info.expander("작성 중인 요약", expanded=True):
+                    for key, text in job["partial"].items():
+                        st.caption(key)
+                        st.markdown(text)
+
+            with col_info.expander("로그"):
+                for entry in job_queue.logs(job["id"], limit=20):
+                    st.text(f"[{entry['level']}] {entry['message']}")
+
+# 결과 저장소는 경로별로 한 번만 열어 재사용
+@st.cache_resource
+def open_result_store(path):
+    return ResultStore(path)
+
+# 분석 결과 탐색용 캐시 (signature에 수정 시각을 넘겨 파일이 바뀌면 다시 읽음)
+TABLE_PAGE_SIZES = [50, 100, 500]
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def load_discovered_runs(base_dir, signature):
+    return discover_runs(base_dir)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def load_run_index(path, signature):
+    store = open_result_store(path) if ResultStore.exists(path) else None
+    return build_run_index(path, store=store)
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def load_subject_files(subject_dir, signature):
+    return list_subject_files(subject_dir)
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def read_result_csv(file_path, signature):
+    return pd.read_csv(file_path)
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def load_store_page(path, signature, table, subject, page, page_size):
+    store = open_result_store(path)
+    return store.load(table, subject, limit=page_size, offset=(page - 1) * page_size).drop(columns="subject")
+
+@st.cache_data(show_spinner=False, max_entries=512)
+def load_store_chart(path, signature, subject, name, thumbnail):
+    png = open_result_store(path).charts(subject, names=[name]).get(name)
+    return make_thumbnail(png) if png and thumbnail else png
+
+@st.cache_data(show_spinner=False, max_entries=512)
+def load_image_file(image_path, signature, thumbnail):
+    if thumbnail:
+        return make_thumbnail(image_path)
+    with open(image_path, "rb") as f:
+        return f.read()
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def read_run_metrics(path, signature):
+    return load_metrics(path)
+
+# 실행 진단: 단계별 소요 시간, LLM 요청/토큰/캐시, 대상자별 비용
+def show_diagnostics(metrics):
+    run = metrics["run"]
+    llm_stats = run["llm"]
+    col1, col2, col3, col4, col5 = st.columns(5)
+    col1.metric("전체 소요 시간 (초)", round(metrics["wall_seconds"], 1))
+    col2.metric("GPT 요청 수", llm_stats["requests"], help=f"실패 {llm_stats['failed_requests']}건, 재시도 {llm_stats['retries']}회")
+    col3.metric("토큰 (입력 / 출력)", f"{llm_stats['prompt_tokens']:,} / {llm_stats['completion_tokens']:,}")
+    col4.metric("캐시 적중률", f"{llm_stats['cache_hit_rate']:.1%}")
+    col5.metric("예상 비용 (USD)", f"{llm_stats['estimated_cost_usd']:.4f}")
+
+    st.markdown("**단계별 소요 시간**")
+    stages_df = pd.DataFrame([{"단계": name, **values} for name, values in run["stages"].items()])
+    if not stages_df.empty:
+        st.dataframe(stages_df.sort_values("seconds", ascending=False), hide_index=True, use_container_width=True)
+
+    structured = llm_stats.get("structured") or {}
+    if structured:
+        st.markdown("**GPT 응답 형식 검증** (형식 오류 응답과 빠진 항목만 다시 요청)")
+        st.dataframe(
+            pd.DataFrame([{"요청 종류": kind, **values} for kind, values in structured.items()]),
+            hide_index=True, use_container_width=True
+        )
+
+    dedup = run.get("dedup") or {}
+    if dedup.get("responses"):
+        st.markdown(
+            f"**중복 응답 정리**: 응답 {dedup['responses']:,}건 중 {dedup['unique']:,}건만 키워드 추출 "
+            f"(중복률 {dedup['duplicate_rate']:.1%}, 완전 중복 {dedup['exact_duplicates']:,}건 / "
+            f"유사 중복 {dedup['near_duplicates']:,}건)"
+        )
+
+    canon = run.get("canonicalization") or {}
+    if canon.get("raw_keywords"):
+        st.markdown(
+            f"**키워드 표준화**: 추출된 키워드 {canon['raw_keywords']:,}개 → 대표 키워드 {canon['canonical_keywords']:,}개 "
+            f"({canon['reduction_rate']:.1%} 감소, 대상자별 합계)"
+        )
+
+    categorization = run.get("categorization") or {}
+    if categorization.get("local") or categorization.get("escalated"):
+        st.markdown(
+            f"**카테고리 분류**: 로컬 분류 {categorization['local']:,}개 / GPT 분류 {categorization['escalated']:,}개 "
+            f"(로컬 비율 {categorization['local_rate']:.1%})"
+        )
+
+    st.markdown("**대상자별**")
+    subjects_df = pd.DataFrame([
+        {
+            "대상자": subject,
+            "seconds": values["stages"].get("analyze_subject", {}).get("seconds", 0.0),
+            "requests": values["llm"]["requests"],
+            "retries": values["llm"]["retries"],
+            "prompt_tokens": values["llm"]["prompt_tokens"],
+            "completion_tokens": values["llm"]["completion_tokens"],
+            "cache_hit_rate": values["llm"]["cache_hit_rate"],
+            "duplicate_rate": values.get("dedup", {}).get("duplicate_rate", 0.0),
+            "estimated_cost_usd": values["llm"]["estimated_cost_usd"],
+        }
+        for subject, values in metrics["subjects"].items()
+    ])
+    if not subjects_df.empty:
+        st.dataframe(subjects_df.sort_values("seconds", ascending=False), hide_index=True, use_container_width=True)
+
+    st.json({key: metrics[key] for key in ("status", "settings", "counts", "registry", "charts") if key in metrics},
+            expanded=False)
+
+# 페이지 단위로 표 표시 (fetch_page(page, page_size) → DataFrame)
+def show_paginated_table(title, total_rows, fetch_page, key):
+    st.subheader(title)
+    if not total_rows:
+        st.caption("데이터가 없습니다.")
+        return
+    col_page, col_size = st.columns(2)
+    page_size = col_size.selectbox("페이지당 행 수", TABLE_PAGE_SIZES, key=f"{key}_size")
+    n_pages = page_count(total_rows, page_size)
+    page = col_page.number_input(f"페이지 (1~{n_pages})", min_value=1, max_value=n_pages, value=1, key=f"{key}_page")
+    st.dataframe(fetch_page(int(page), page_size), use_container_width=True, hide_index=True)
+    st.caption(f"전체 {total_rows}행")
+
+# 차트 이미지 표시 (images: [(제목, load_image 인자)]), 썸네일은 나란히 / 원본은 한 줄에 하나씩
+def show_chart_images(images, load_image, full_size=False):
+    if not images:
+        return
+    st.subheader("🖼️ 차트")
+    columns = [st.container() for _ in images] if full_size else st.columns(len(images))
+    for column, (title, ref) in zip(columns, images):
+        image = load_image(ref)
+        if image:
+            column.image(image, caption=title)
 
 # 페이지 선택
 menu = st.sidebar.selectbox("페이지 선택", ["🏠 홈", "📊 분석", "⚙️ 설정"])
@@ -49,11 +247,12 @@ if menu == "🏠 홈":
     st.title("💼 HR 응답 분석 대시보드")
     
     # 1. 파일 업로드
-    uploaded = st.file_uploader("📂 엑셀 파일 업로드", type=["xlsx", "xls"])
+    uploaded = st.file_uploader("📂 엑셀 파일 업로드", type=["xlsx", "xls", "csv", "parquet"])
     
     # 2. 분석 시작
     if uploaded:
-        df = pd.read_excel(uploaded)
+        # 같은 파일은 한 번만 파싱하고, 이후 재실행 시에는 Parquet 캐시에서 읽음
+        df, ingest_path = ingest_file(uploaded)
         st.success("업로드 완료!")
         st.dataframe(df.head())
         
@@ -79,125 +278,69 @@ if menu == "🏠 홈":
                 key="user_prompt"
             )
             use_llm = st.checkbox("GPT가 자동으로 질문 컬럼을 찾아내도록 하기", value=True)
+            col_workers, col_inflight = st.columns(2)
+            max_workers = col_workers.number_input(
+                "동시에 분석할 대상자 수", min_value=1, max_value=32, value=4,
+                help="1이면 대상자별 분석 과정을 화면에 자세히 표시합니다."
+            )
+            max_inflight = col_inflight.number_input(
+                "최대 동시 GPT 요청 수", min_value=1, max_value=64, value=8,
+                help="OpenAI 사용량 한도에 맞춰 조정하세요."
+            )
+            lazy_charts = st.checkbox(
+                "차트 이미지는 결과를 처음 확인할 때 생성하기", value=False,
+                help="대상자가 많을 때 분석 완료까지의 시간을 줄일 수 있습니다."
+            )
+            export_folders = st.checkbox(
+                "대상자별 폴더(CSV/PNG)로도 저장하기", value=False,
+                help="결과는 항상 실행 폴더의 results.sqlite3에 저장됩니다."
+            )
+            previous_runs = dict(discover_runs("."))
+            previous_run = st.selectbox(
+                "이전 분석 결과 재사용", ["(사용 안 함)"] + list(previous_runs),
+                help="같은 파일의 수정본을 다시 분석할 때, 응답이 바뀌지 않은 대상자는 이전 결과를 복사합니다."
+            )
             submitted = st.form_submit_button("분석 시작")
 
         if submitted:
             if not user_prompt.strip():
                 st.error("데이터에 대한 설명을 입력해주세요.")
             else:
-                # 🚨 수정된 부분: 분석과 저장을 하나의 루프에서 처리
-                
-                # GPT가 질문 컬럼을 탐지
-                with st.spinner("✨ 데이터 전처리 중..."):
-                    question_cols = []
-                    if use_llm:
-                        st.info("AI가 질문 컬럼을 탐지하고 있습니다...")
-                        question_cols = detect_question_columns(df.columns.tolist(), section_name="openai_section")
-                        if not question_cols:
-                            st.warning("GPT가 질문 컬럼을 찾지 못했습니다. 전체 컬럼을 분석 대상으로 지정합니다.")
-                            question_cols = [col for col in df.columns if col != id_col]
-                    else:
-                        question_cols = [col for col in df.columns if col != id_col]
-                    st.success(f"✔️ 분석 대상 컬럼: {question_cols}")
-                
-                # 분석 대상자 리스트 정의
+                # 분석 대상자 리스트 정의 (None이면 전체 대상자)
+                subjects_to_analyze = None
                 if analysis_mode == "특정 대상자 분석" and selected_subject:
                     subjects_to_analyze = [selected_subject]
-                else:
-                    subjects_to_analyze = df[id_col].dropna().unique().tolist()
 
                 now = datetime.now().strftime("%Y%m%d_%H%M%S")
                 file_name_prefix = uploaded.name.split('.')[0]
                 base_dir = f"./{file_name_prefix}_{now}"
                 analysis_dir = base_dir
-                
-                st.markdown("---")
-                st.subheader("📦 분석 및 결과 저장")
-                progress_bar = st.progress(0, text=f"분석 및 저장 진행 중 (0 / {len(subjects_to_analyze)})")
-
-                with st.spinner("분석 및 파일을 저장하는 중입니다..."):
-                    try:
-                        for i, subject in enumerate(subjects_to_analyze):
-                            st.info(f"✨ '{subject}'에 대한 분석을 시작합니다.")
-                            
-                            filtered_df = df[df[id_col] == subject].copy()
-                            long_df, _ = make_longformat(filtered_df, id_column=id_col, use_llm=False)
-                            long_df = long_df[long_df['질문'].isin(question_cols)]
-                            
-                            st.subheader("📁 Long Format 변환 결과")
-                            st.dataframe(long_df)
-
-                            texts = long_df['응답'].tolist()
-
-                            if not texts:
-                                st.warning(f"'{subject}'에 대한 분석할 텍스트가 없습니다. 다음 대상자로 넘어갑니다.")
-                                progress_bar.progress((i + 1) / len(subjects_to_analyze), text=f"분석 및 저장 진행 중 ({i + 1} / {len(subjects_to_analyze)})")
-                                continue
-
-                            pipeline = AnalysisPipeline(llm, long_df)
-                            if pipeline.run():
-                                results = pipeline.get_results()
-
-                                # 각 대상자별 폴더 생성
-                                participant_dir = os.path.join(analysis_dir, subject)
-                                os.makedirs(participant_dir, exist_ok=True)
-                                st.info(f"분석 결과가 '{participant_dir}' 폴더에 저장됩니다.")
-                                
-                                # 시각화는 저장할 때 생성
-                                fig_wc, ax_wc = plt.subplots()
-                                wc = generate_wordcloud_from_freq(results['freq_df'])
-                                if wc:
-                                    ax_wc.imshow(wc, interpolation='bilinear')
-                                    ax_wc.axis('off')
-                                else:
-                                    st.warning(f"'{subject}'에 대한 워드클라우드 생성 실패.")
-
-                                fig_bar, ax_bar = plt.subplots()
-                                freq_df = results['freq_df'].copy()
-                                freq_df["count"] = freq_df["count"].astype(int)
-                                freq_plot_df = freq_df.sort_values(by="count", ascending=False).head(20)
-                                sns.barplot(data=freq_plot_df, y='keyword', x='count', hue='category', dodge=False, ax=ax_bar)
-                                ax_bar.xaxis.set_major_locator(MaxNLocator(integer=True))
-                                ax_bar.set_ylabel("키워드")
-                                ax_bar.set_xlabel("count")
-                                
-                                overall_sentiment = results['sentiment_summary'].groupby('sentiment')['percentage'].sum().reset_index()
-                                fig_pie = px.pie(
-                                    overall_sentiment,
-                                    names='sentiment',
-                                    values='percentage',
-                                    title='전체 감정 분포 (모든 키워드 기준)',
-                                    color='sentiment',
-                                    color_discrete_map={'긍정': '#63b2ee', '부정': '#ff9999', '중립': '#ffcc66'}
-                                )
-                                
-                                # 파일 저장
-                                results['freq_df'].to_csv(os.path.join(participant_dir, "keyword_freq.csv"), index=False)
-                                results['updated_df'].to_csv(os.path.join(participant_dir, "sentiment.csv"), index=False)
-                                if wc:
-                                    fig_wc.savefig(os.path.join(participant_dir, "wordcloud.png"))
-                                fig_pie.write_image(os.path.join(participant_dir, "piechart.png"))
-                                fig_bar.savefig(os.path.join(participant_dir, "barchart.png"))
-                                summary_df = pd.DataFrame([{'summary': results['summary_text']}])
-                                summary_df.to_csv(os.path.join(participant_dir, "summary.csv"), index=False)
-                                
-                                st.success(f"✔️ '{subject}' 분석 및 저장 완료!")
-                            progress_bar.progress((i + 1) / len(subjects_to_analyze), text=f"분석 및 저장 진행 중 ({i + 1} / {len(subjects_to_analyze)})")
-                        
-                        st.success("✔️ 모든 대상자 분석 및 저장이 성공적으로 완료되었습니다.")
-                        st.warning("PDF 보고서 생성 기능은 현재 지원하지 않습니다.")
-                        
-                        # 저장 경로를 세션 상태에 저장
-                        if 'last_analysis_path' not in st.session_state:
-                            st.session_state.last_analysis_path = {}
-                        st.session_state.last_analysis_path[os.path.basename(base_dir)] = analysis_dir
-                        
-                        # 분석 페이지로 이동
-                        st.session_state['menu'] = '📊 분석'
-                        st.rerun()
-
-                    except Exception as e:
-                        st.error(f"파일 저장 중 오류가 발생했습니다: {e}")
+
+                # 분석은 백그라운드 작업으로 실행 (페이지를 이동하거나 브라우저를 닫아도 계속 진행)
+                job_id = job_queue.submit({
+                    "input_path": ingest_path,
+                    "source": uploaded.name,
+                    "id_col": id_col,
+                    "use_llm": use_llm,
+                    "subjects": subjects_to_analyze,
+                    "analysis_dir": analysis_dir,
+                    "previous_dir": previous_runs.get(previous_run),
+                    "max_workers": int(max_workers),
+                    "max_inflight": int(max_inflight),
+                    "lazy_charts": lazy_charts,
+                    "export_folders": export_folders,
+                    "section_name": "openai_section",
+                }, df=df)
+                st.success(f"✔️ 분석 작업을 등록했습니다. (작업 ID: `{job_id}`) 아래에서 진행 상황을 확인하세요.")
+
+                # 저장 경로를 세션 상태에 저장
+                if 'last_analysis_path' not in st.session_state:
+                    st.session_state.last_analysis_path = {}
+                st.session_state.last_analysis_path[os.path.basename(base_dir)] = analysis_dir
+
+    st.write("---")
+    st.subheader("🧵 분석 작업")
+    show_jobs_panel()
 
 # 📊 분석 페이지
 elif menu == "📊 분석":
@@ -211,53 +354,252 @@ elif menu == "📊 분석":
         placeholder="예: ./데이터가많은편_리더십,조직문화 다면진단 Data_2023_20250821_233332"
     )
     
-    # 🚨 수정된 부분: 경로를 처리하는 로직
+    # 최근 분석 결과: 이번 세션에서 실행한 결과 + 현재 폴더에서 찾은 결과 저장소
+    recent_runs = dict(st.session_state.get('last_analysis_path', {}))
+    for name, path in load_discovered_runs(".", run_signature(".")):
+        recent_runs.setdefault(name, path)
+
     current_path = None
     if path_input:
         if os.path.isdir(path_input):
             current_path = path_input
         else:
             st.error("⚠️ 유효하지 않은 경로입니다. 폴더가 존재하는지 확인해 주세요.")
-    elif 'last_analysis_path' in st.session_state and st.session_state.last_analysis_path:
+    elif recent_runs:
         selected_key = st.selectbox(
             "최근 분석 결과 폴더를 선택하거나, 위 경로를 직접 입력하세요.",
-            list(st.session_state.last_analysis_path.keys())
+            list(recent_runs.keys())
         )
         if selected_key:
-            current_path = st.session_state.last_analysis_path[selected_key]
+            current_path = recent_runs[selected_key]
     else:
         st.info("아직 저장된 분석 결과가 없습니다. '홈' 페이지에서 분석을 먼저 실행해 주세요.")
 
     if current_path:
         st.write(f"📂 현재 경로: `{current_path}`")
-        
-        # 폴더 내 파일 목록 가져오기
-        files = [f for f in os.listdir(current_path) if os.path.isdir(os.path.join(current_path, f))]
-        sorted_files = sorted(files, key=lambda x: int(x.split('대상자')[1]))
+        signature = run_signature(current_path)
+        run_index = load_run_index(current_path, signature)
+        subjects = run_index["subjects"]
+        manifest = run_index["manifest"]
+        if manifest:
+            st.caption(
+                f"원본 파일: {manifest.get('source') or '-'} · 상태: {manifest.get('status', '-')} · "
+                f"저장된 대상자 {len(subjects)}명"
+            )
 
-        selected_file_name = st.selectbox(
-            "분석 대상자 폴더를 선택하세요.",
-            sorted_files
+        run_metrics = read_run_metrics(
+            current_path, subject_dir_signature(os.path.join(current_path, METRICS_FILE_NAME))
         )
-        
-        if selected_file_name:
-            file_path = os.path.join(current_path, selected_file_name)
-            
-            inner_files = [f for f in os.listdir(file_path) if os.path.isfile(os.path.join(file_path, f))]
+        if run_metrics:
+            with st.expander("🩺 실행 진단 (소요 시간 · 토큰 · 비용)"):
+                show_diagnostics(run_metrics)
+
+        # 대상자가 많을 때 ID 일부로 목록 좁히기
+        subject_filter = st.text_input("대상자 검색", value="", placeholder="ID 일부를 입력하세요.")
+        if subject_filter:
+            subjects = [s for s in subjects if subject_filter.lower() in str(s).lower()]
+        selected_subject = st.selectbox(f"분석 대상자를 선택하세요. ({len(subjects)}명)", subjects)
+        show_full_images = st.checkbox("차트를 원본 크기로 보기", value=False)
+
+        if selected_subject and run_index["kind"] == "store":
+            store = open_result_store(current_path)
+
+            # 차트 없이 저장된 결과는 처음 볼 때 생성
+            try:
+                chart_names = ensure_store_charts(store, selected_subject)
+            except Exception as e:
+                st.warning(f"차트 생성 실패: {e}")
+                chart_names = store.chart_names(selected_subject)
+            signature = run_signature(current_path)
+
+            st.subheader("📝 요약")
+            st.markdown(store.summary(selected_subject) or "요약이 없습니다.")
+            for table in ("keyword_freq", "sentiment"):
+                show_paginated_table(
+                    f"📄 {table}",
+                    store.count(table, selected_subject),
+                    lambda page, page_size, table=table: load_store_page(
+                        current_path, signature, table, selected_subject, page, page_size
+                    ),
+                    key=f"{table}_{selected_subject}"
+                )
+            show_chart_images(
+                [(CHART_FILES[name], name) for name in CHART_FILES if name in chart_names],
+                lambda name: load_store_chart(current_path, signature, selected_subject, name, not show_full_images),
+                full_size=show_full_images
+            )
+
+            # 전체 대상자 결과를 하나의 파일로 내려받기
+            with st.expander("📦 전체 대상자 결과 내보내기"):
+                export_table = st.selectbox("내보낼 결과", list(RESULT_TABLES))
+                if st.button("CSV 만들기"):
+                    st.download_button(
+                        f"{export_table}.csv 다운로드",
+                        data=store.load(export_table).to_csv(index=False).encode("utf-8-sig"),
+                        file_name=f"{export_table}.csv",
+                        mime="text/csv"
+                    )
+
+        # 결과 저장소가 없는 이전 실행 결과는 대상자별 폴더에서 읽음
+        elif selected_subject:
+            file_path = os.path.join(current_path, selected_subject)
 
-            for file in inner_files:
+            # 차트 없이 저장된 결과는 처음 볼 때 생성
+            try:
+                ensure_charts(file_path)
+            except Exception as e:
+                st.warning(f"차트 생성 실패: {e}")
+
+            subject_files = load_subject_files(file_path, subject_dir_signature(file_path))
+            for file in subject_files["tables"]:
                 inner_file_path = os.path.join(file_path, file)
-                file_extension = os.path.splitext(file)[1].lower()
-                
-                if file_extension in ['.csv', '.txt']:
+                file_mtime = subject_dir_signature(inner_file_path)
+                if file == "summary.csv":
+                    st.subheader("📝 요약")
+                    summary_df = read_result_csv(inner_file_path, file_mtime)
+                    st.markdown(str(summary_df['summary'].iloc[0]) if not summary_df.empty else "요약이 없습니다.")
+                elif file.endswith(".csv"):
+                    table_df = read_result_csv(inner_file_path, file_mtime)
+                    show_paginated_table(
+                        f"📄 {file}", len(table_df),
+                        lambda page, page_size, table_df=table_df: paginate(table_df, page, page_size),
+                        key=f"{file}_{selected_subject}"
+                    )
+                else:
                     st.subheader(f"📄 {file}")
-                    df_or_text = pd.read_csv(inner_file_path) if file_extension == '.csv' else open(inner_file_path, 'r', encoding='utf-8').read()
-                    st.code(df_or_text.to_csv(index=False) if file_extension == '.csv' else df_or_text)
-                elif file_extension in ['.png', '.jpg', '.jpeg']:
-                    st.subheader(f"🖼️ {file}")
-                    st.image(inner_file_path)
+                    with open(inner_file_path, 'r', encoding='utf-8') as f:
+                        st.text(f.read())
+            show_chart_images(
+                [(file, os.path.join(file_path, file)) for file in subject_files["images"]],
+                lambda image_path: load_image_file(
+                    image_path, subject_dir_signature(image_path), not show_full_images
+                ),
+                full_size=show_full_images
+            )
 
 # ⚙️ 설정 페이지
 elif menu == "⚙️ 설정":
     st.title("⚙️ 설정")
-    st.write("API 키 등 설정 가능")
\ No newline at end of file
+    st.write("API 키 등 설정 가능")
+
+    # LLM 응답 캐시 현황
+    st.subheader("🗄️ LLM 응답 캐시")
+    cache = get_default_cache()
+    cache_stats = cache.stats()
+    st.write(f"📂 캐시 경로: `{cache_stats['path']}`")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("저장된 응답 수", cache_stats['entries'])
+    col2.metric("캐시 적중 / 미스", f"{cache_stats['hits']} / {cache_stats['misses']}")
+    col3.metric("캐시 크기 (MB)", round(cache_stats['size_bytes'] / (1024 * 1024), 2))
+    if st.button("캐시 비우기"):
+        cache.clear()
+        st.success("✔️ LLM 응답 캐시를 비웠습니다.")
+
+    # 키워드 표준화 인덱스 현황
+    st.subheader("🏷️ 키워드 표준화")
+    keyword_index = get_default_keyword_index()
+    index_stats = keyword_index.stats()
+    st.write(f"📂 인덱스 경로: `{index_stats['path']}`")
+    col1, col2 = st.columns(2)
+    col1.metric("대표 키워드 수", index_stats['canonical_keywords'])
+    col2.metric("등록된 표현 수", index_stats['aliases'])
+    canonicalize = st.toggle(
+        "표현만 다른 키워드를 대표 키워드로 묶기", value=canon_settings["enabled"],
+        help="'소통', '소통 능력', '원활한 소통'을 '소통' 하나로 집계해 분류/감정 분석 요청 수를 줄입니다."
+    )
+    if canonicalize != canon_settings["enabled"]:
+        configure_canonicalization(enabled=canonicalize)
+    if st.button("인덱스 비우기"):
+        keyword_index.clear()
+        st.success("✔️ 키워드 표준화 인덱스를 비웠습니다.")
+
+    # OpenAI 요청 한도
+    st.subheader("🚦 OpenAI 요청 한도")
+    with st.form("rate_limit_form"):
+        col_rpm, col_tpm = st.columns(2)
+        rpm = col_rpm.number_input("분당 최대 요청 수 (RPM)", min_value=1, value=int(rate_limiter.requests.capacity))
+        tpm = col_tpm.number_input("분당 최대 토큰 수 (TPM)", min_value=1000, value=int(rate_limiter.tokens.capacity))
+        if st.form_submit_button("한도 적용"):
+            configure_rate_limits(rpm=int(rpm), tpm=int(tpm))
+            st.success("✔️ 요청 한도를 적용했습니다.")
+
+    # 키워드 추출 방식
+    st.subheader("🔑 키워드 추출 방식")
+    with st.form("keyword_extractor_form"):
+        extractor_mode = st.selectbox(
+            "추출 방식",
+            KEYWORD_MODES,
+            index=KEYWORD_MODES.index(extractor_settings["mode"]),
+            help="llm: 모든 응답을 GPT로 추출, local: GPT 없이 TF-IDF로 빠르게 추출(비용 없음), "
+                 "hybrid: 로컬 추출 신뢰도가 낮은 응답만 GPT로 추출"
+        )
+        min_confidence = st.slider(
+            "로컬 결과 최소 신뢰도 (hybrid)", min_value=0.0, max_value=1.0,
+            value=float(extractor_settings["min_confidence"]), step=0.05
+        )
+        if st.form_submit_button("추출 방식 적용"):
+            configure_keyword_extractor(mode=extractor_mode, min_confidence=float(min_confidence))
+            st.success("✔️ 설정을 적용했습니다. 다음 분석부터 반영됩니다.")
+
+    # 키워드 카테고리 분류 방식 (로컬 임베딩 분류기)
+    st.subheader("🗂️ 카테고리 분류 방식")
+    category_classifier = get_default_category_classifier()
+    classifier_stats = category_classifier.stats()
+    st.write(f"📂 저장소 경로: `{classifier_stats['path']}` (임베딩 모델: `{classifier_stats['model']}`)")
+    col1, col2 = st.columns(2)
+    col1.metric("저장된 GPT 분류 결과", classifier_stats['labels'])
+    col2.metric("저장된 키워드 임베딩", classifier_stats['embeddings'])
+    with st.form("category_classifier_form"):
+        category_mode = st.selectbox(
+            "분류 방식",
+            CATEGORY_MODES,
+            index=CATEGORY_MODES.index(classifier_settings["mode"]),
+            help="llm: 모든 키워드를 GPT로 분류, hybrid: 로컬 분류 신뢰도가 낮은 키워드만 GPT로 분류, "
+                 "local: GPT 없이 임베딩 유사도로 분류"
+        )
+        category_min_confidence = st.slider(
+            "로컬 분류 최소 신뢰도 (hybrid)", min_value=0.0, max_value=1.0,
+            value=float(classifier_settings["min_confidence"]), step=0.05
+        )
+        if st.form_submit_button("분류 방식 적용"):
+            configure_category_classifier(mode=category_mode, min_confidence=float(category_min_confidence))
+            st.success("✔️ 설정을 적용했습니다. 다음 분석부터 반영됩니다.")
+    if st.button("분류 저장소 비우기"):
+        category_classifier.clear()
+        st.success("✔️ 저장된 GPT 분류 결과와 키워드 임베딩을 비웠습니다.")
+
+    # 키워드 추출 전 중복 응답 정리
+    st.subheader("🧹 중복 응답 정리")
+    with st.form("dedup_form"):
+        dedup_mode = st.selectbox(
+            "정리 방식",
+            DEDUP_MODES,
+            index=DEDUP_MODES.index(dedup_settings["mode"]),
+            help="exact: 공백/문장부호/대소문자만 다른 응답을 합침, near: 표현이 조금 다른 유사 응답까지 합침, off: 정리 안 함"
+        )
+        dedup_threshold = st.slider(
+            "유사 응답 기준 (near)", min_value=0.5, max_value=1.0, value=float(dedup_settings["threshold"]), step=0.05
+        )
+        if st.form_submit_button("중복 정리 적용"):
+            configure_dedup(mode=dedup_mode, threshold=float(dedup_threshold))
+            st.success("✔️ 설정을 적용했습니다. 다음 분석부터 반영됩니다.")
+
+    # FinBERT 감정 분석 모델 설정
+    st.subheader("🧠 감정 분석 모델 (FinBERT)")
+    # onnx는 optimum[onnxruntime]이 설치된 경우에만 선택 가능
+    backends = available_backends()
+    with st.form("finbert_form"):
+        backend = st.selectbox(
+            "추론 백엔드",
+            backends,
+            index=backends.index(finbert_settings["backend"]) if finbert_settings["backend"] in backends else 0,
+            help="quantized: int8 동적 양자화(CPU), onnx: ONNX Runtime (optimum[onnxruntime] 필요)"
+        )
+        num_threads = st.number_input("CPU 스레드 수 (0 = 기본값)", min_value=0, value=finbert_settings["num_threads"])
+        batch_size = st.number_input("배치 크기", min_value=1, value=finbert_settings["batch_size"])
+        if st.form_submit_button("적용"):
+            configure_finbert(backend=backend, num_threads=int(num_threads), batch_size=int(batch_size))
+            st.success("✔️ 설정을 적용했습니다. 다음 감정 분석부터 반영됩니다.")
+    if "onnx" not in backends:
+        st.caption("ONNX Runtime 백엔드를 쓰려면 `pip install optimum[onnxruntime]`를 설치하세요.")
+    st.caption(f"모델 로딩 상태: {'로딩됨' if is_classifier_loaded() else '미로딩 (첫 분석 시 로딩)'}")
\ No newline at end of file
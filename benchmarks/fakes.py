@@ -0,0 +1,271 @@
+# benchmarks/fakes.py
+# 네트워크 없이 분석 파이프라인을 실행하기 위한 결정적(deterministic) 가짜 모델
+# - FakeLLMBackend: 프롬프트 종류(키워드 추출 / 카테고리 분류 / 중립 재분류 / 질문 컬럼 탐지 / 요약)를 구분해 그럴듯한 응답 생성
+#   지연 시간, 오류율, 형식이 깨진 응답 비율을 지정할 수 있으며, 같은 프롬프트의 n번째 시도는 항상 같은 결과를 냄
+# - FakeChatModel: ChatOpenAI 대체 (invoke → AIMessage + usage_metadata)
+# - FakeOpenAI: openai.OpenAI 대체 (chat.completions.create, stream 지원)
+# - FakeSentimentClassifier: FinBERT 파이프라인 대체
+# - FakeEmbedder: 카테고리 분류용 문장 임베딩 모델 대체
+import ast
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+from langchain.schema import AIMessage
+
+from benchmarks.synthetic_survey import ID_COLUMN, KEYWORD_CATEGORIES, RATER_COLUMN, RELATION_COLUMN
+from modules.analysis.token_budget import count_tokens
+
+FAKE_MODEL = "gpt-4o-mini"
+
+
+# 메시지 목록(langchain 메시지 / dict / 문자열)을 하나의 텍스트로
+def prompt_text(messages) -> str:
+    if isinstance(messages, str):
+        return messages
+    return "\n".join(
+        str(message["content"] if isinstance(message, dict) else getattr(message, "content", message))
+        for message in messages
+    )
+
+def _seed(*parts) -> int:
+    digest = hashlib.sha256("\x1f".join(str(part) for part in parts).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+# 재시도 대상 오류 (llm_client.is_retryable이 status_code로 판단)
+class FakeAPIError(Exception):
+    def __init__(self, status_code=503):
+        super().__init__(f"fake API error (status {status_code})")
+        self.status_code = status_code
+
+
+# 1. 응답 생성 + 지연/오류 시뮬레이션
+class FakeLLMBackend:
+    def __init__(self, latency=0.05, jitter=0.5, error_rate=0.0, malformed_rate=0.0, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        # 응답 일부가 잘린(형식이 깨진) JSON을 돌려주는 비율 (재요청 경로 측정용)
+        self.malformed_rate = malformed_rate
+        self.seed = seed
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self.calls = 0
+            self.errors = 0
+            self.latencies = []
+            self.prompt_tokens = 0
+            self.completion_tokens = 0
+            self._attempts = {}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "errors": self.errors,
+                "latencies": list(self.latencies),
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+            }
+
+    # 같은 프롬프트의 n번째 시도마다 고정된 난수 (스레드 실행 순서와 무관)
+    def _rng(self, prompt):
+        with self._lock:
+            attempt = self._attempts.get(prompt, 0)
+            self._attempts[prompt] = attempt + 1
+        return random.Random(_seed(self.seed, attempt, prompt))
+
+    def complete(self, prompt, sleep=True):
+        rng = self._rng(prompt)
+        latency = max(0.0, self.latency * (1 + rng.uniform(-self.jitter, self.jitter)))
+        failed = rng.random() < self.error_rate
+        if sleep:
+            time.sleep(latency)
+
+        content = None if failed else respond(prompt, rng)
+        if content and rng.random() < self.malformed_rate:
+            content = content[:len(content) // 2]
+        prompt_tokens = count_tokens(prompt)
+        completion_tokens = count_tokens(content) if content else 0
+        with self._lock:
+            self.calls += 1
+            self.errors += int(failed)
+            self.latencies.append(latency)
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+        if failed:
+            raise FakeAPIError(rng.choice([429, 500, 503]))
+        return content, prompt_tokens, completion_tokens, latency
+
+
+# 2. 프롬프트 종류별 응답
+def _json_list_after(prompt, marker):
+    start = prompt.find(marker)
+    match = re.search(r"\[.*?\]", prompt[start if start >= 0 else 0:], flags=re.DOTALL)
+    if not match:
+        return []
+    try:
+        values = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return []
+    return [value for value in values if isinstance(value, str)]
+
+def _keywords_in(text):
+    counts = {keyword: text.count(keyword) for keyword in KEYWORD_CATEGORIES}
+    return [keyword for keyword, count in sorted(counts.items(), key=lambda item: -item[1]) if count]
+
+# 실제 GPT처럼 같은 키워드를 가끔 다른 표현으로 반환 ('소통' → '소통 능력', '원활한 소통')
+KEYWORD_VARIANTS = ["{kw} 능력", "{kw}능력", "원활한 {kw}", "뛰어난 {kw}", "{kw} 역량"]
+VARIANT_RATE = 0.3
+
+# 번호가 붙은 응답([0] ...)마다 키워드를 찾아 나온 응답 번호와 함께 반환 (여러 응답에 나온 키워드부터)
+def _keyword_response(prompt, rng):
+    match = re.search(r"핵심 키워드 (\d+)~(\d+)개", prompt)
+    max_keywords = int(match.group(2)) if match else 10
+    texts = prompt[match.end() if match else 0:].split("JSON 예시")[0]
+    sources = {}
+    for index, text in re.findall(r"^\s*\[(\d+)\] (.*)$", texts, flags=re.MULTILINE):
+        for keyword in _keywords_in(text):
+            sources.setdefault(keyword, []).append(int(index))
+    ranked = sorted(sources, key=lambda keyword: (-len(sources[keyword]), keyword))[:max_keywords]
+    found = [
+        {
+            "keyword": rng.choice(KEYWORD_VARIANTS).format(kw=kw) if rng.random() < VARIANT_RATE else kw,
+            "sources": sources[kw],
+        }
+        for kw in ranked
+    ]
+    return json.dumps({"keywords": found}, ensure_ascii=False)
+
+def _base_category(keyword):
+    if keyword in KEYWORD_CATEGORIES:
+        return KEYWORD_CATEGORIES[keyword]
+    return next((category for kw, category in KEYWORD_CATEGORIES.items() if kw in keyword), "기타")
+
+def _category_response(prompt, rng):
+    keywords = _json_list_after(prompt, "키워드 목록:")
+    categorized = [{"keyword": kw, "category": _base_category(kw)} for kw in keywords]
+    return json.dumps({"categorized": categorized}, ensure_ascii=False)
+
+def _refine_response(prompt, rng):
+    keywords = _json_list_after(prompt, "키워드 목록:")
+    return json.dumps({kw: rng.choice([0, 1, 1, 2]) for kw in keywords}, ensure_ascii=False)
+
+def _question_columns_response(prompt, rng):
+    match = re.search(r"컬럼 목록:\s*(\[.*?\])\n", prompt, flags=re.DOTALL)
+    try:
+        # 날짜 등 repr로 표시된 컬럼명(Timestamp('2024-01-01 00:00:00'))은 실제 GPT처럼 문자열로 돌려줌
+        columns = ast.literal_eval(re.sub(r"\w+\(('[^']*')\)", r"\1", match.group(1))) if match else []
+    except (ValueError, SyntaxError):
+        columns = []
+    meta = {ID_COLUMN, RATER_COLUMN, RELATION_COLUMN}
+    return json.dumps([col for col in columns if col not in meta], ensure_ascii=False)
+
+def _summary_response(prompt, rng):
+    keywords = _keywords_in(prompt)[:6] or ["업무"]
+    return (
+        f"💡1. 긍정적인 피드백\n- {', '.join(keywords[:3])} 측면에서 좋은 평가를 받고 있습니다.\n"
+        f"🛠️2. 개선점\n- {', '.join(keywords[3:] or keywords[:1])} 부분의 보완이 필요하다는 의견이 있습니다.\n"
+        "👥3. 구성원에 대한 팀 내 인식\n- 전반적으로 신뢰받는 구성원으로 인식되고 있습니다."
+    )
+
+def respond(prompt, rng) -> str:
+    if "긍정/부정/중립" in prompt:
+        return _refine_response(prompt, rng)
+    if "카테고리로" in prompt:
+        return _category_response(prompt, rng)
+    if "컬럼명 목록" in prompt:
+        return _question_columns_response(prompt, rng)
+    if re.search(r"핵심 키워드 \d+~\d+개", prompt):
+        return _keyword_response(prompt, rng)
+    return _summary_response(prompt, rng)
+
+
+# 3. ChatOpenAI 대체
+class FakeChatModel:
+    def __init__(self, backend, model_name=FAKE_MODEL, temperature=0):
+        self.backend = backend
+        self.model_name = model_name
+        self.temperature = temperature
+
+    def invoke(self, messages, **kwargs):
+        content, prompt_tokens, completion_tokens, _ = self.backend.complete(prompt_text(messages))
+        return AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": prompt_tokens,
+                "output_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            }
+        )
+
+
+# 4. openai.OpenAI 대체 (client.chat.completions.create만 지원)
+class FakeOpenAI:
+    def __init__(self, backend, stream_chunk_chars=8):
+        self.backend = backend
+        self.stream_chunk_chars = stream_chunk_chars
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model, messages, temperature=0, stream=False, **kwargs):
+        if not stream:
+            content, prompt_tokens, completion_tokens, _ = self.backend.complete(prompt_text(messages))
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+                usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens),
+            )
+        # 스트리밍: 지연 시간을 조각마다 나눠서 적용
+        content, _, _, latency = self.backend.complete(prompt_text(messages), sleep=False)
+        return self._stream(content, latency)
+
+    def _stream(self, content, latency):
+        size = self.stream_chunk_chars
+        pieces = [content[i:i + size] for i in range(0, len(content), size)] or [""]
+        for piece in pieces:
+            time.sleep(latency / len(pieces))
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+
+
+# 5. FinBERT 파이프라인 대체 (키워드별로 고정된 라벨, 키워드당 지연 시간)
+class FakeSentimentClassifier:
+    labels = ("positive", "negative", "neutral")
+
+    def __init__(self, latency_per_item=0.0005, seed=0):
+        self.latency_per_item = latency_per_item
+        self.seed = seed
+
+    def __call__(self, keywords, batch_size=32, truncation=True):
+        keywords = list(keywords)
+        time.sleep(self.latency_per_item * len(keywords))
+        results = []
+        for keyword in keywords:
+            rng = random.Random(_seed(self.seed, keyword))
+            results.append({"label": rng.choice(self.labels), "score": round(rng.uniform(0.5, 1.0), 4)})
+        return results
+
+
+# 6. 문장 임베딩 모델 대체 (글자 / 글자 bigram을 해시한 벡터, 글자가 많이 겹치는 키워드일수록 유사)
+class FakeEmbedder:
+    name = "fake-embedder"
+
+    def __init__(self, dim=256, latency_per_item=0.0002):
+        self.dim = dim
+        self.latency_per_item = latency_per_item
+
+    def __call__(self, texts, batch_size=64):
+        texts = list(texts)
+        time.sleep(self.latency_per_item * len(texts))
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            compact = text.replace(" ", "")
+            for feature in list(compact) + [compact[i:i + 2] for i in range(len(compact) - 1)]:
+                vectors[row, _seed(feature) % self.dim] += 1.0
+        return vectors
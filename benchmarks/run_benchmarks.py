@@ -0,0 +1,462 @@
+# benchmarks/run_benchmarks.py
+# 오프라인 성능 측정: 가상 설문 데이터 + 가짜 LLM / FinBERT로 주요 단계의 처리량과 p50/p95 지연 시간 측정
+# API 키와 네트워크 없이 실행되므로 일반 Linux CI에서도 성능 저하를 확인할 수 있음
+# 사용 예: python -m benchmarks.run_benchmarks --scale small --json bench.json
+#         python -m benchmarks.run_benchmarks --scale small --baseline bench.json  (기준보다 느려지면 종료 코드 1)
+import os
+import tempfile
+
+# 실제 LLM 캐시(.cache/llm)와 키워드 표준화 인덱스(.cache/keyword_index)를 건드리지 않도록 분석 모듈을 불러오기 전에 임시 위치 지정
+os.environ["HR_CACHE_DIR"] = tempfile.mkdtemp(prefix="hr_bench_llm_cache_")
+os.environ["HR_KEYWORD_INDEX_DIR"] = tempfile.mkdtemp(prefix="hr_bench_keyword_index_")
+
+import argparse
+import json
+import platform
+import shutil
+import sys
+import time
+from datetime import datetime
+
+from benchmarks.fakes import (
+    KEYWORD_VARIANTS,
+    FakeChatModel,
+    FakeEmbedder,
+    FakeLLMBackend,
+    FakeOpenAI,
+    FakeSentimentClassifier,
+    _base_category
+)
+from benchmarks.synthetic_survey import ID_COLUMN, KEYWORD_CATEGORIES, generate_survey, question_columns
+from modules.analysis.categorize import run_keyword_analysis
+from modules.analysis.category_classifier import (
+    CATEGORY_MODES,
+    CategoryClassifier,
+    configure_category_classifier,
+    get_default_category_classifier,
+    set_embedder
+)
+from modules.analysis.dedup import DEDUP_MODES, configure_dedup
+from modules.analysis.local_keywords import (
+    KEYWORD_MODES,
+    LocalKeywordExtractor,
+    configure_keyword_extractor,
+    extractor_settings
+)
+from modules.analysis.finbert_backend import set_classifier
+from modules.analysis.sentiment_module import (
+    analyze_sentiment_with_finbert,
+    merge_sentiment_results,
+    refine_neutral_keywords_with_gpt,
+    summarize_sentiment_by_category
+)
+from modules.analysis_pipeline import AnalysisPipeline
+from modules.batch_runner import run_analysis
+from modules.keyword_index import configure_canonicalization, get_default_keyword_index
+from modules.keyword_registry import KeywordRegistry
+from modules.llm_cache import CachedLLM, get_default_cache
+from modules.llm_client import ManagedLLM, configure_rate_limits, set_max_inflight, set_openai_client
+from modules.long_format_converter import LongFormatIndex, convert_to_long_format
+from modules.metrics import RunMetrics, metrics_scope
+
+SCALES = {
+    "small": {"subjects": 8, "raters": 6, "questions": 4},
+    "medium": {"subjects": 40, "raters": 8, "questions": 5},
+    "large": {"subjects": 200, "raters": 10, "questions": 6},
+}
+SCENARIOS = ("long_format", "keyword_analysis", "sentiment", "pipeline", "batch", "categorization")
+# categorization 시나리오에서 일치율을 측정할 로컬 분류 최소 신뢰도
+CALIBRATION_THRESHOLDS = (0.4, 0.5, 0.6, 0.7, 0.8, 0.9)
+
+
+# 1. 통계
+def percentile(values, q) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def _ms(seconds) -> float:
+    return round(seconds * 1000, 2)
+
+
+# 2. 벤치마크 실행 환경 (데이터, 가짜 모델, 캐시)
+class BenchContext:
+    def __init__(self, df, question_cols, backend, repeat=3, workers=4, warm_cache=False):
+        self.df = df
+        self.question_cols = question_cols
+        self.backend = backend
+        self.repeat = repeat
+        self.workers = workers
+        self.warm_cache = warm_cache
+        self.long_index = LongFormatIndex(df, ID_COLUMN, question_cols)
+        self.subjects = self.long_index.subjects()
+        # config.build_llm과 같은 구성: 캐시 → 요청 관리 → (가짜) ChatOpenAI
+        self.llm = CachedLLM(ManagedLLM(FakeChatModel(backend)), get_default_cache())
+        # run_analysis와 같이 로컬/hybrid 추출은 전체 응답으로 계산한 문서 빈도를 공유
+        self.keyword_extractor = None
+        if extractor_settings["mode"] != "llm":
+            self.keyword_extractor = LocalKeywordExtractor(self.long_index.long_df['응답'].tolist())
+
+    def texts(self, subject):
+        return self.long_index.get(subject)['응답'].tolist()
+
+    # 반복마다 캐시, 키워드 표준화 인덱스, 카테고리 분류기 저장소를 비워 매번 실제 요청 경로를 측정 (--warm-cache이면 유지)
+    def new_iteration(self):
+        if not self.warm_cache:
+            get_default_cache().clear()
+            get_default_keyword_index().clear()
+            get_default_category_classifier().clear()
+
+
+# 3. 시나리오: 각 함수는 처리 단위, 처리량, 표본(초) 목록, 측정 시간(초)을 반환
+def bench_long_format(ctx):
+    samples = []
+    for _ in range(ctx.repeat):
+        start = time.perf_counter()
+        convert_to_long_format(ctx.df, ID_COLUMN, ctx.question_cols)
+        samples.append(time.perf_counter() - start)
+    cells = len(ctx.df) * len(ctx.question_cols)
+    return {"unit": "cells", "items": cells * ctx.repeat, "samples": samples, "wall": sum(samples)}
+
+def bench_keyword_analysis(ctx):
+    samples, items = [], 0
+    for _ in range(ctx.repeat):
+        ctx.new_iteration()
+        registry = KeywordRegistry()
+        for subject in ctx.subjects:
+            texts = ctx.texts(subject)
+            start = time.perf_counter()
+            run_keyword_analysis(texts, ctx.llm, registry=registry, extractor=ctx.keyword_extractor)
+            samples.append(time.perf_counter() - start)
+            items += len(texts)
+    return {"unit": "responses", "items": items, "samples": samples, "wall": sum(samples)}
+
+def bench_sentiment(ctx):
+    # 키워드 분석 결과는 미리 준비하고 감정 분석 단계만 측정
+    prepared = {}
+    registry = KeywordRegistry()
+    for subject in ctx.subjects:
+        prepared[subject] = run_keyword_analysis(
+            ctx.texts(subject), ctx.llm, registry=registry, extractor=ctx.keyword_extractor
+        )
+    ctx.backend.reset_stats()
+
+    samples, items = [], 0
+    for _ in range(ctx.repeat):
+        ctx.new_iteration()
+        registry = KeywordRegistry()
+        for subject in ctx.subjects:
+            freq_df, categorized = prepared[subject]
+            start = time.perf_counter()
+            sentiment_df = analyze_sentiment_with_finbert(ctx.texts(subject), ctx.llm, freq_df, categorized, registry=registry)
+            refined_df = refine_neutral_keywords_with_gpt(sentiment_df, ctx.llm, registry=registry)
+            updated_df = merge_sentiment_results(sentiment_df, refined_df)
+            summarize_sentiment_by_category(freq_df, updated_df)
+            samples.append(time.perf_counter() - start)
+            items += len(freq_df)
+    return {"unit": "keywords", "items": items, "samples": samples, "wall": sum(samples)}
+
+def bench_pipeline(ctx):
+    samples, items = [], 0
+    for _ in range(ctx.repeat):
+        ctx.new_iteration()
+        registry = KeywordRegistry()
+        for subject in ctx.subjects:
+            long_df = ctx.long_index.get(subject)
+            start = time.perf_counter()
+            AnalysisPipeline(ctx.llm, long_df, registry=registry, keyword_extractor=ctx.keyword_extractor).run()
+            samples.append(time.perf_counter() - start)
+            items += len(long_df)
+    return {"unit": "responses", "items": items, "samples": samples, "wall": sum(samples)}
+
+def bench_batch(ctx):
+    # 대상자 동시 분석 + 결과 저장소 기록까지 포함한 전체 실행 (차트는 지연 생성)
+    samples, wall, stages, structured, dedup, canonicalization, categorization = [], 0.0, {}, {}, {}, {}, {}
+    for _ in range(ctx.repeat):
+        ctx.new_iteration()
+        run_dir = tempfile.mkdtemp(prefix="hr_bench_run_")
+        try:
+            start = time.perf_counter()
+            result = run_analysis(
+                ctx.df, ID_COLUMN, ctx.question_cols, run_dir, ctx.llm,
+                max_workers=ctx.workers, lazy_charts=True
+            )
+            wall += time.perf_counter() - start
+        finally:
+            shutil.rmtree(run_dir, ignore_errors=True)
+        metrics = result["metrics"]
+        stages = metrics["run"]["stages"]
+        structured = metrics["run"]["llm"]["structured"]
+        dedup = metrics["run"]["dedup"]
+        canonicalization = metrics["run"]["canonicalization"]
+        categorization = metrics["run"]["categorization"]
+        samples.extend(
+            subject["stages"]["analyze_subject"]["seconds"]
+            for subject in metrics["subjects"].values() if "analyze_subject" in subject["stages"]
+        )
+    return {
+        "unit": "subjects", "items": len(ctx.subjects) * ctx.repeat, "samples": samples, "wall": wall,
+        "stages": stages, "structured": structured, "dedup": dedup, "canonicalization": canonicalization,
+        "categorization": categorization,
+    }
+
+# 로컬 카테고리 분류기의 신뢰도 기준별 로컬 분류 비율(coverage)과 가짜 GPT 분류 결과와의 일치율(accuracy)
+# - seeds: 분류 프롬프트의 주요 사례만으로 분류 / labels: 키워드 절반의 GPT 분류 결과를 배운 뒤 나머지 절반 분류
+# --real-embedder와 함께 실행하면 실제 임베딩 모델로 min_confidence 기본값을 점검할 수 있음
+def _calibration(predictions, keywords):
+    rows = []
+    for threshold in CALIBRATION_THRESHOLDS:
+        confident = [kw for kw in keywords if predictions[kw][1] >= threshold]
+        correct = sum(predictions[kw][0] == _base_category(kw) for kw in confident)
+        rows.append({
+            "threshold": threshold,
+            "coverage": round(len(confident) / len(keywords), 3) if keywords else 0.0,
+            "accuracy": round(correct / len(confident), 3) if confident else 0.0,
+        })
+    return rows
+
+def bench_categorization(ctx):
+    keywords = sorted(set(KEYWORD_CATEGORIES) | {
+        variant.format(kw=kw) for kw in KEYWORD_CATEGORIES for variant in KEYWORD_VARIANTS
+    })
+    learned, held_out = keywords[::2], keywords[1::2]
+    samples, calibration = [], {}
+    for _ in range(ctx.repeat):
+        classifier = CategoryClassifier(cache_dir=tempfile.mkdtemp(prefix="hr_bench_classifier_"))
+        try:
+            start = time.perf_counter()
+            seeds_only = classifier.classify(keywords)
+            samples.append(time.perf_counter() - start)
+            classifier.learn({kw: _base_category(kw) for kw in learned})
+            with_labels = classifier.classify(held_out)
+        finally:
+            shutil.rmtree(classifier.cache_dir, ignore_errors=True)
+        if not seeds_only:
+            raise RuntimeError("임베딩 모델을 불러오지 못해 로컬 카테고리 분류를 측정할 수 없습니다.")
+        calibration = {"seeds": _calibration(seeds_only, keywords), "labels": _calibration(with_labels, held_out)}
+    return {
+        "unit": "keywords", "items": len(keywords) * ctx.repeat, "samples": samples, "wall": sum(samples),
+        "calibration": calibration,
+    }
+
+SCENARIO_FUNCS = {
+    "long_format": bench_long_format,
+    "keyword_analysis": bench_keyword_analysis,
+    "sentiment": bench_sentiment,
+    "pipeline": bench_pipeline,
+    "batch": bench_batch,
+    "categorization": bench_categorization,
+}
+
+
+def run_scenario(name, ctx) -> dict:
+    ctx.backend.reset_stats()
+    metrics = RunMetrics()
+    with metrics_scope(metrics):
+        out = SCENARIO_FUNCS[name](ctx)
+    llm = ctx.backend.stats()
+    run = metrics.to_dict()["run"]
+    samples = out["samples"]
+    return {
+        "scenario": name,
+        "unit": out["unit"],
+        "items": out["items"],
+        "samples": len(samples),
+        "wall_seconds": round(out["wall"], 4),
+        "throughput": round(out["items"] / out["wall"], 2) if out["wall"] else 0.0,
+        "p50_ms": _ms(percentile(samples, 0.5)),
+        "p95_ms": _ms(percentile(samples, 0.95)),
+        "llm_calls": llm["calls"],
+        "llm_errors": llm["errors"],
+        "llm_p50_ms": _ms(percentile(llm["latencies"], 0.5)),
+        "llm_p95_ms": _ms(percentile(llm["latencies"], 0.95)),
+        "prompt_tokens": llm["prompt_tokens"],
+        "completion_tokens": llm["completion_tokens"],
+        "stages": out.get("stages") or run["stages"],
+        # 구조화 응답 검증 결과 (형식 오류율, 누락 항목 비율)
+        "structured": out.get("structured") or run["llm"]["structured"],
+        # 키워드 추출 전 중복 응답 정리 결과 (pipeline / batch 시나리오)
+        "dedup": out.get("dedup") or run["dedup"],
+        # 키워드 표준화 전/후 고유 키워드 수
+        "canonicalization": out.get("canonicalization") or run["canonicalization"],
+        # 로컬 분류기로 확정한 키워드 / GPT로 넘긴 키워드 수
+        "categorization": out.get("categorization") or run["categorization"],
+        # 로컬 카테고리 분류 신뢰도 기준별 로컬 분류 비율 / 일치율 (categorization 시나리오)
+        "calibration": out.get("calibration"),
+    }
+
+
+# 4. 결과 출력 / 기준 결과와 비교
+def print_report(results):
+    header = f"{'scenario':<18}{'unit':>11}{'items':>9}{'wall(s)':>10}{'items/s':>11}{'p50(ms)':>10}{'p95(ms)':>10}{'llm calls':>11}{'llm p95(ms)':>13}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['scenario']:<18}{r['unit']:>11}{r['items']:>9}{r['wall_seconds']:>10.3f}{r['throughput']:>11.1f}"
+            f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['llm_calls']:>11}{r['llm_p95_ms']:>13.1f}"
+        )
+    for r in results:
+        canon = r.get("canonicalization") or {}
+        if canon.get("raw_keywords"):
+            print(
+                f"[{r['scenario']}] 키워드 표준화: {canon['raw_keywords']}개 → {canon['canonical_keywords']}개 "
+                f"({canon['reduction_rate']:.1%} 감소)"
+            )
+        categorization = r.get("categorization") or {}
+        if categorization.get("local") or categorization.get("escalated"):
+            print(
+                f"[{r['scenario']}] 카테고리 분류: 로컬 {categorization['local']}개 / GPT {categorization['escalated']}개 "
+                f"(로컬 비율 {categorization['local_rate']:.1%})"
+            )
+        for name, rows in (r.get("calibration") or {}).items():
+            print(
+                f"[{r['scenario']}] 신뢰도 기준별 로컬 분류 비율 / 일치율 ({name}): "
+                + ", ".join(f"{row['threshold']}: {row['coverage']:.0%} / {row['accuracy']:.0%}" for row in rows)
+            )
+        dedup = r.get("dedup") or {}
+        if dedup.get("responses"):
+            print(
+                f"[{r['scenario']}] 중복 응답 정리: {dedup['responses']}건 → {dedup['unique']}건 "
+                f"(중복률 {dedup['duplicate_rate']:.1%}, 완전 {dedup['exact_duplicates']} / 유사 {dedup['near_duplicates']})"
+            )
+
+# 처리량이 tolerance 비율 이상 줄었거나 p95 지연 시간이 그만큼 늘었으면 성능 저하로 판단
+def compare_with_baseline(results, baseline, tolerance) -> list:
+    previous = {r["scenario"]: r for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        base = previous.get(r["scenario"])
+        if not base:
+            continue
+        problems = []
+        if base["throughput"] and r["throughput"] < base["throughput"] * (1 - tolerance):
+            problems.append(f"처리량 {base['throughput']} → {r['throughput']} {r['unit']}/s")
+        if base["p95_ms"] and r["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            problems.append(f"p95 {base['p95_ms']} → {r['p95_ms']} ms")
+        if problems:
+            regressions.append((r["scenario"], problems))
+    return regressions
+
+
+# 5. CLI 진입점
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="HR 응답 분석 파이프라인 오프라인 벤치마크")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small", help="데이터 규모 기본값")
+    parser.add_argument("--subjects", type=int, default=None, help="대상자 수 (규모 기본값 대신 사용)")
+    parser.add_argument("--raters", type=int, default=None, help="대상자 1명당 평가자 수")
+    parser.add_argument("--questions", type=int, default=None, help="질문 컬럼 수")
+    parser.add_argument("--min-words", type=int, default=12, help="응답 최소 단어 수")
+    parser.add_argument("--max-words", type=int, default=60, help="응답 최대 단어 수")
+    parser.add_argument("--duplicate-rate", type=float, default=0.0, help="중복/유사 응답 비율")
+    parser.add_argument("--dedup", choices=DEDUP_MODES, default=None, help="중복 응답 정리 방식 (기본: HR_DEDUP 또는 exact)")
+    parser.add_argument("--keyword-extractor", choices=KEYWORD_MODES, default=None,
+                        help="키워드 추출 방식 (기본: HR_KEYWORD_EXTRACTOR 또는 llm)")
+    parser.add_argument("--no-canonicalize", action="store_true", help="키워드 표준화 끄기")
+    parser.add_argument("--category-classifier", choices=CATEGORY_MODES, default=None,
+                        help="카테고리 분류 방식 (기본: HR_CATEGORY_CLASSIFIER 또는 llm)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"실행할 시나리오 (쉼표 구분, 가능: {', '.join(SCENARIOS)})")
+    parser.add_argument("--repeat", type=int, default=3, help="시나리오별 반복 횟수")
+    parser.add_argument("--latency", type=float, default=0.02, help="가짜 LLM 평균 응답 지연 (초)")
+    parser.add_argument("--jitter", type=float, default=0.5, help="응답 지연 변동 비율 (0.5 = ±50%%)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="가짜 LLM 오류율 (오류는 실제 재시도/백오프 경로를 거치므로 측정 시간이 늘어남)")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="형식이 깨진 JSON 응답 비율")
+    parser.add_argument("--finbert-latency", type=float, default=0.0005, help="가짜 FinBERT 키워드당 지연 (초)")
+    parser.add_argument("--real-finbert", action="store_true", help="가짜 분류기 대신 실제 FinBERT 모델 사용")
+    parser.add_argument("--real-embedder", action="store_true", help="가짜 임베딩 대신 실제 문장 임베딩 모델 사용")
+    parser.add_argument("--workers", type=int, default=4, help="batch 시나리오에서 동시에 분석할 대상자 수")
+    parser.add_argument("--max-inflight", type=int, default=8, help="동시 LLM 요청 수 상한 (0이면 제한 없음)")
+    parser.add_argument("--rpm", type=int, default=0, help="분당 요청 수 한도 (0이면 제한 없음)")
+    parser.add_argument("--tpm", type=int, default=0, help="분당 토큰 수 한도 (0이면 제한 없음)")
+    parser.add_argument("--warm-cache", action="store_true", help="반복 사이에 LLM 캐시를 비우지 않음")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", default=None, help="결과를 저장할 JSON 경로")
+    parser.add_argument("--baseline", default=None, help="비교할 기준 결과 JSON 경로")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="성능 저하로 판단할 변화 비율")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in scenarios if name not in SCENARIO_FUNCS]
+    if unknown:
+        raise SystemExit(f"알 수 없는 시나리오: {', '.join(unknown)} (가능: {', '.join(SCENARIOS)})")
+
+    scale = dict(SCALES[args.scale])
+    for key in ("subjects", "raters", "questions"):
+        if getattr(args, key) is not None:
+            scale[key] = getattr(args, key)
+    df = generate_survey(
+        n_subjects=scale["subjects"], raters_per_subject=scale["raters"], n_questions=scale["questions"],
+        min_words=args.min_words, max_words=args.max_words, duplicate_rate=args.duplicate_rate, seed=args.seed
+    )
+
+    # 모든 LLM / FinBERT 호출을 가짜 모델로 연결
+    backend = FakeLLMBackend(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        malformed_rate=args.malformed_rate, seed=args.seed
+    )
+    set_openai_client(FakeOpenAI(backend))
+    if not args.real_finbert:
+        set_classifier(FakeSentimentClassifier(latency_per_item=args.finbert_latency, seed=args.seed))
+    if not args.real_embedder:
+        set_embedder(FakeEmbedder())
+    configure_rate_limits(rpm=args.rpm, tpm=args.tpm)
+    set_max_inflight(args.max_inflight)
+    configure_dedup(mode=args.dedup)
+    configure_keyword_extractor(mode=args.keyword_extractor)
+    if args.no_canonicalize:
+        configure_canonicalization(enabled=False)
+    configure_category_classifier(mode=args.category_classifier)
+
+    ctx = BenchContext(
+        df, question_columns(scale["questions"]), backend,
+        repeat=args.repeat, workers=args.workers, warm_cache=args.warm_cache
+    )
+    print(
+        f"데이터: 대상자 {scale['subjects']}명 × 평가자 {scale['raters']}명 × 질문 {scale['questions']}개 "
+        f"(정제 후 응답 {len(ctx.long_index.long_df)}건), 가짜 LLM 지연 {args.latency * 1000:.0f}ms, 오류율 {args.error_rate}"
+    )
+    results = []
+    try:
+        for name in scenarios:
+            results.append(run_scenario(name, ctx))
+    finally:
+        set_openai_client(None)
+        set_classifier(None)
+        set_embedder(None)
+        shutil.rmtree(os.environ["HR_CACHE_DIR"], ignore_errors=True)
+        shutil.rmtree(os.environ["HR_KEYWORD_INDEX_DIR"], ignore_errors=True)
+    print_report(results)
+
+    if args.json_path:
+        report = {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": {**vars(args), **scale},
+            "results": results,
+        }
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"✔️ 결과 저장: {args.json_path}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        for scenario, problems in regressions:
+            print(f"⚠️ 성능 저하 [{scenario}]: {'; '.join(problems)}")
+        if regressions:
+            sys.exit(1)
+        print(f"✔️ 기준 결과({args.baseline}) 대비 성능 저하 없음 (허용 범위 {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+# benchmarks/synthetic_survey.py
+# 벤치마크용 가상 다면진단 설문 데이터 생성기
+# - 대상자 1명을 여러 평가자가 평가하는 형식 (대상자 / 응답자 / 대상자와의 관계 / 질문 컬럼)
+# - 대상자마다 자주 언급되는 키워드가 있어 실제 데이터처럼 키워드가 대상자 간에 겹침
+# - 빈 응답, 무의미한 응답, 짧은 응답을 섞어 Long Format 정제 단계도 함께 측정
+# - 복사해 붙인 응답, 상투적인 문구, 표현만 조금 바꾼 응답을 섞어 중복 응답 정리도 측정
+# 사용 예: python -m benchmarks.synthetic_survey survey.xlsx --subjects 50 --raters 8 --questions 5
+import argparse
+import random
+
+import pandas as pd
+
+ID_COLUMN = "대상자"
+RATER_COLUMN = "응답자"
+RELATION_COLUMN = "대상자와의 관계"
+RELATIONS = ["상사", "동료", "부하", "타부서"]
+
+QUESTION_BANK = [
+    "이 분의 가장 큰 강점은 무엇입니까?",
+    "이 분이 개선하면 좋을 점은 무엇입니까?",
+    "함께 일하면서 인상 깊었던 경험을 적어 주세요.",
+    "이 분의 협업 방식에 대해 자유롭게 적어 주세요.",
+    "이 분에게 하고 싶은 말을 적어 주세요.",
+    "이 분의 리더십에 대해 평가해 주세요.",
+    "업무 수행 과정에서 아쉬웠던 점을 적어 주세요.",
+    "조직 내에서 이 분에 대한 전반적인 인식은 어떻습니까?",
+]
+
+# 키워드 → 카테고리 (가짜 LLM이 같은 표를 사용해 분류)
+KEYWORD_CATEGORIES = {
+    "소통": "커뮤니케이션", "협업": "커뮤니케이션", "리더십": "커뮤니케이션", "경청": "커뮤니케이션",
+    "피드백": "커뮤니케이션", "배려": "커뮤니케이션", "보고": "커뮤니케이션", "조율": "커뮤니케이션",
+    "책임감": "업무태도", "성실함": "업무태도", "열정": "업무태도", "적극성": "업무태도",
+    "꼼꼼함": "업무태도", "솔선수범": "업무태도", "끈기": "업무태도", "시간관리": "업무태도",
+    "문제해결": "역량", "전문성": "역량", "분석력": "역량", "기획력": "역량",
+    "추진력": "역량", "판단력": "역량", "업무이해도": "역량", "실행력": "역량",
+    "복지": "제도 및 환경", "근무환경": "제도 및 환경", "교육": "제도 및 환경", "워라밸": "제도 및 환경",
+    "평가제도": "제도 및 환경", "업무분장": "제도 및 환경", "시스템": "제도 및 환경",
+    "유머": "기타", "여유": "기타", "자신감": "기타",
+}
+KEYWORDS = list(KEYWORD_CATEGORIES)
+
+POSITIVE_TEMPLATES = [
+    "{kw} 측면에서 팀에 큰 도움이 되고 있습니다.",
+    "평소 {kw} 부분이 뛰어나서 동료들이 많이 의지하는 편입니다.",
+    "회의 자리에서도 {kw} 모습을 자주 보여 주셔서 본받고 싶습니다.",
+    "프로젝트를 진행하면서 {kw} 역량이 특히 돋보였다고 생각합니다.",
+    "어려운 상황에서도 {kw} 태도를 잃지 않는 점이 인상 깊었습니다.",
+]
+NEGATIVE_TEMPLATES = [
+    "다만 {kw} 관련해서는 조금 더 노력이 필요해 보입니다.",
+    "{kw} 면에서 아쉬운 점이 있어 앞으로 개선되면 좋겠습니다.",
+    "가끔 {kw} 부족으로 일정이 지연된 적이 있었습니다.",
+]
+NEUTRAL_TEMPLATES = [
+    "{kw} 부분에 대해서는 특별히 드릴 말씀이 많지는 않습니다.",
+    "업무 특성상 {kw} 부분을 직접 볼 기회는 많지 않았습니다.",
+]
+# 여러 평가자가 그대로 쓰는 상투적인 문구
+BOILERPLATE_RESPONSES = [
+    "항상 책임감 있게 업무를 수행하시고 동료들과의 소통도 원활하여 팀에 큰 도움이 되고 있습니다.",
+    "업무 전문성이 높고 협업 태도가 좋아 함께 일하기 편한 분입니다. 앞으로도 지금처럼 잘 부탁드립니다.",
+    "특별히 개선할 점은 떠오르지 않으며 지금처럼 성실함을 유지해 주시면 좋겠습니다.",
+]
+LOW_QUALITY_RESPONSES = ["", "-", "없음", "없습니다.", "해당 없음", "x", "특별히 없습니다.", "잘하고 계십니다."]
+
+
+# 1. 응답 문장 생성
+def _sentence(rng, keyword):
+    roll = rng.random()
+    if roll < 0.6:
+        templates = POSITIVE_TEMPLATES
+    elif roll < 0.85:
+        templates = NEGATIVE_TEMPLATES
+    else:
+        templates = NEUTRAL_TEMPLATES
+    return rng.choice(templates).format(kw=keyword)
+
+def make_response(rng, profile, min_words, max_words) -> str:
+    target = rng.randint(min_words, max_words)
+    sentences, words = [], 0
+    while words < target:
+        # 대상자 특징 키워드 위주로, 가끔 다른 키워드도 언급
+        keyword = rng.choice(profile) if rng.random() < 0.75 else rng.choice(KEYWORDS)
+        sentence = _sentence(rng, keyword)
+        sentences.append(sentence)
+        words += len(sentence.split())
+    return " ".join(sentences)
+
+
+# 이전 응답을 그대로 / 문장부호·띄어쓰기만 바꿔 / 한 마디 덧붙여 재사용 (앞의 둘은 완전 중복, 마지막은 유사 중복)
+def duplicate_response(rng, previous) -> str:
+    text = rng.choice(previous) if previous and rng.random() < 0.7 else rng.choice(BOILERPLATE_RESPONSES)
+    roll = rng.random()
+    if roll < 0.5:
+        return text
+    if roll < 0.75:
+        return text.replace(".", "!").replace(" ", "  ", 1)
+    return f"{text} 감사합니다."
+
+
+# 2. 설문 데이터 생성
+def question_columns(n_questions) -> list:
+    columns = QUESTION_BANK[:n_questions]
+    # 질문 은행보다 많이 요청하면 번호를 붙여 추가
+    for i in range(len(columns), n_questions):
+        columns.append(f"{QUESTION_BANK[i % len(QUESTION_BANK)]} ({i + 1})")
+    return columns
+
+def generate_survey(n_subjects=20, raters_per_subject=8, n_questions=4, min_words=12, max_words=60,
+                    low_quality_rate=0.1, duplicate_rate=0.0, profile_size=6, seed=0) -> pd.DataFrame:
+    rng = random.Random(seed)
+    questions = question_columns(n_questions)
+    rows = []
+    for subject in range(1, n_subjects + 1):
+        profile = rng.sample(KEYWORDS, min(profile_size, len(KEYWORDS)))
+        previous = []
+        for rater in range(1, raters_per_subject + 1):
+            row = {
+                ID_COLUMN: f"대상자{subject}",
+                RATER_COLUMN: f"R{subject:04d}-{rater:02d}",
+                RELATION_COLUMN: rng.choice(RELATIONS),
+            }
+            for question in questions:
+                roll = rng.random()
+                if roll < low_quality_rate:
+                    row[question] = rng.choice(LOW_QUALITY_RESPONSES)
+                elif roll < low_quality_rate + duplicate_rate:
+                    row[question] = duplicate_response(rng, previous)
+                else:
+                    row[question] = make_response(rng, profile, min_words, max_words)
+                    previous.append(row[question])
+            rows.append(row)
+    return pd.DataFrame(rows, columns=[ID_COLUMN, RATER_COLUMN, RELATION_COLUMN] + questions)
+
+
+# 3. 파일로 저장 (확장자에 따라 xlsx / csv / parquet)
+def write_survey(df, path):
+    lower = path.lower()
+    if lower.endswith(".parquet"):
+        df.to_parquet(path, index=False)
+    elif lower.endswith(".csv"):
+        df.to_csv(path, index=False, encoding="utf-8-sig")
+    elif lower.endswith((".xlsx", ".xls")):
+        df.to_excel(path, index=False)
+    else:
+        raise ValueError("Unsupported file type: must be CSV, Excel or Parquet")
+    return path
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="벤치마크용 가상 다면진단 설문 데이터 생성")
+    parser.add_argument("output", help="저장할 파일 경로 (.xlsx / .csv / .parquet)")
+    parser.add_argument("--subjects", type=int, default=20, help="대상자 수")
+    parser.add_argument("--raters", type=int, default=8, help="대상자 1명당 평가자 수")
+    parser.add_argument("--questions", type=int, default=4, help="질문 컬럼 수")
+    parser.add_argument("--min-words", type=int, default=12, help="응답 최소 단어 수")
+    parser.add_argument("--max-words", type=int, default=60, help="응답 최대 단어 수")
+    parser.add_argument("--low-quality-rate", type=float, default=0.1, help="빈/무의미한 응답 비율")
+    parser.add_argument("--duplicate-rate", type=float, default=0.0, help="중복/유사 응답 비율")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    df = generate_survey(
+        n_subjects=args.subjects, raters_per_subject=args.raters, n_questions=args.questions,
+        min_words=args.min_words, max_words=args.max_words, low_quality_rate=args.low_quality_rate,
+        duplicate_rate=args.duplicate_rate, seed=args.seed
+    )
+    write_survey(df, args.output)
+    print(f"✔️ {args.output}: {len(df)}행 (대상자 {args.subjects}명 × 평가자 {args.raters}명, 질문 {args.questions}개)")
+
+
+if __name__ == "__main__":
+    main()
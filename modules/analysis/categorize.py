@@ -1,35 +1,93 @@
 # modules/analysis/categorize.py
-import json, re
+import json, logging, os, threading
 import pandas as pd
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
 from langchain.prompts import ChatPromptTemplate
-from langchain.schema import HumanMessage
-from langchain.output_parsers import StructuredOutputParser, ResponseSchema
-from langchain_core.exceptions import OutputParserException
+from langchain.schema import AIMessage, HumanMessage
 from wordcloud import WordCloud
-import streamlit as st # st.progress를 위해 streamlit 임포트 추가
-import time
 
-# 1. 프롬프트 엔지니어링으로 키워드 추출 + 키워드 카테고리 분류 
-keyword_schema = ResponseSchema(name='keywords', description='추출된 핵심 키워드 리스트')
-keyword_parser = StructuredOutputParser.from_response_schemas([keyword_schema])
+from modules.analysis.category_classifier import classifier_settings, get_default_category_classifier
+from modules.analysis.dedup import expand_keyword_counts
+from modules.analysis.local_keywords import KEYWORD_MODES, LocalKeywordExtractor, extractor_settings, guess_category
+from modules.analysis.token_budget import keyword_range, pack_texts_by_tokens
+from modules.keyword_index import canon_settings, get_default_keyword_index
+from modules.metrics import (
+    ContextThreadPoolExecutor,
+    record_canonicalization,
+    record_categorization,
+    record_structured,
+    stage
+)
+from modules.progress import ensure_reporter
+
+logger = logging.getLogger("hr_analytics")
+
+CATEGORIES = ['커뮤니케이션', '업무태도', '역량', '제도 및 환경', '기타']
+# 형식에 맞지 않거나 빠진 항목만 다시 요청하는 최대 횟수
+MAX_REASKS = 2
+
+# 1. 프롬프트 엔지니어링으로 키워드 추출 + 키워드 카테고리 분류
+# 응답은 JSON 스키마(Structured Outputs)로 받고, 파싱 후 한 번 더 검증
+# 키워드마다 그 키워드가 나온 응답 번호(sources)를 함께 받아 키워드 빈도를 응답 단위로 계산
+keyword_schema = {
+    "name": "keywords",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "keywords": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "keyword": {"type": "string"},
+                        "sources": {"type": "array", "items": {"type": "integer"}},
+                    },
+                    "required": ["keyword", "sources"],
+                    "additionalProperties": False,
+                },
+            },
+        },
+        "required": ["keywords"],
+        "additionalProperties": False,
+    },
+}
 keyword_prompt = ChatPromptTemplate.from_template("""
                                          
     당신은 정성적 응답 데이터를 분석하는 전문가입니다.
-    아래 응답 목록에서 **핵심 키워드 3~5개**를 식별하세요.
+    아래 응답 목록에서 **핵심 키워드 {min_keywords}~{max_keywords}개**를 식별하고,
+    키워드마다 그 키워드가 나온 응답 번호를 모두 적으세요.
     {texts}
-    JSON 예시: {{ "keywords": ["소통", "책임감", "문제해결"] }}
+    JSON 예시: {{ "keywords": [{{"keyword": "소통", "sources": [0, 2]}}, {{"keyword": "책임감", "sources": [1]}}] }}
     
 """)
 
-category_schema = ResponseSchema(name='categorized', description='키워드별 카테고리 매핑')
-category_parser = StructuredOutputParser.from_response_schemas([category_schema])
+category_schema = {
+    "name": "categorized_keywords",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "categorized": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "keyword": {"type": "string"},
+                        "category": {"type": "string", "enum": CATEGORIES},
+                    },
+                    "required": ["keyword", "category"],
+                    "additionalProperties": False,
+                },
+            },
+        },
+        "required": ["categorized"],
+        "additionalProperties": False,
+    },
+}
 category_prompt = ChatPromptTemplate.from_template("""
-                                                 
-    아래 키워드를 주제별 카테고리로 분류하세요.
-    {keywords}
-    JSON 예시: [{{"keyword": "소통", "category": "커뮤니케이션"}}]
-    
+    아래 키워드를 주제별 카테고리로 빠짐없이 한 번씩 분류하세요.
+
     지침:
     - 카테고리는 '커뮤니케이션', '업무태도', '역량', '제도 및 환경', '기타' 5개로 지정함
     - '커뮤니케이션'의 주요 사례는 '소통, 협업, 리더십, 조직문화 등'임
@@ -37,120 +95,330 @@ category_prompt = ChatPromptTemplate.from_template("""
     - '역량'의 주요 사례는 '해결, 전문성, 능력, 이해도 등'임
     - '제도 및 환경'의 주요 사례는 '복지, 시스템, 근무환경, 조직문화, 교육 운영, 워라밸 등'임
     - '기타'는 위 네 가지에 명확히 분류되지 않는 의견, 제안, 단순 감정 표현, 모호한 응답 등을 포함함
-    - JSON 리스트 형식으로 반환
-    - 불필요한 설명 없이 JSON만 응답
+    - 출력 예시: {{"categorized": [{{"keyword": "소통", "category": "커뮤니케이션"}}]}}
 
     키워드 목록:
     {keywords}
+""")
+
+
+def _response_format(schema):
+    return {"type": "json_schema", "json_schema": schema}
+
+# 스키마 검증 실패 (JSON 오류 포함)
+class OutputValidationError(ValueError):
+    pass
+
+def _load_json(raw):
+    text = (raw or "").strip()
+    # 코드 블록으로 감싼 응답 허용
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        text = text.rsplit("```", 1)[0]
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as e:
+        raise OutputValidationError(f"JSON 파싱 실패: {e}") from e
 
-    출력 예시:
-    [
-      {{ "keyword": "소통", "category": "커뮤니케이션}},
-      {{ "keyword": "책임감", "category": "업무태도" }}
+# 반환값: [(키워드, 응답 번호 목록)] — 범위를 벗어난 응답 번호는 제외
+def parse_keywords(raw, n_texts) -> list:
+    data = _load_json(raw)
+    if not isinstance(data, dict) or not isinstance(data.get("keywords"), list):
+        raise OutputValidationError("'keywords' 배열이 없습니다.")
+    items = []
+    for item in data["keywords"]:
+        if not isinstance(item, dict) or not isinstance(item.get("keyword"), str) or not item["keyword"].strip():
+            continue
+        sources = item.get("sources") if isinstance(item.get("sources"), list) else []
+        sources = sorted({i for i in sources if isinstance(i, int) and not isinstance(i, bool) and 0 <= i < n_texts})
+        items.append((item["keyword"].strip(), sources))
+    return items
+
+# 요청한 키워드 중 허용된 카테고리로 분류된 항목만 반환
+def parse_categories(raw, keywords) -> dict:
+    data = _load_json(raw)
+    items = data.get("categorized") if isinstance(data, dict) else None
+    if not isinstance(items, list):
+        raise OutputValidationError("'categorized' 배열이 없습니다.")
+    wanted = set(keywords)
+    categories = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        keyword, category = item.get("keyword"), item.get("category")
+        if keyword in wanted and category in CATEGORIES:
+            categories[keyword] = category
+    return categories
+
+# 같은 프롬프트를 다시 보내면 캐시된 잘못된 응답이 돌아오므로, 이전 응답과 오류 내용을 이어 붙여 다시 요청
+def _reask_messages(messages, raw, error):
+    return list(messages) + [
+        AIMessage(content=raw or ""),
+        HumanMessage(content=f"이전 응답이 요청한 형식에 맞지 않습니다: {error}\n지정한 JSON 형식으로만 다시 응답하세요."),
     ]
-    
-""")
+
 
 # 🔹 2. 키워드 추출
-def process_batch(batch, llm):
-    messages = keyword_prompt.format_messages(texts=batch)
-    response = llm.invoke(messages)
-    raw = response.content
+# 응답 번호를 붙여 한 줄에 하나씩 나열 (키워드 응답의 sources가 이 번호를 가리킴)
+def format_texts(batch) -> str:
+    return "\n".join(f"[{i}] {text}" for i, text in enumerate(batch))
 
-    try:
-        return keyword_parser.parse(raw)["keywords"]
-    except OutputParserException:
-        match = re.search(r"\{.*\}", raw, flags=re.DOTALL)
-        if match:
-            try:
-                parsed = json.loads(match.group(0))
-                return parsed.get("keywords", [])
-            except:
-                return [] 
-        return []
+# 반환값: [(키워드, 응답 번호 목록)]
+def process_batch(batch, llm, max_reasks=MAX_REASKS):
+    # 묶음 크기에 비례해 키워드 개수를 지정해 출력 길이를 일정하게 유지
+    min_keywords, max_keywords = keyword_range(len(batch))
+    messages = keyword_prompt.format_messages(
+        texts=format_texts(batch), min_keywords=min_keywords, max_keywords=max_keywords
+    )
+
+    for _ in range(max_reasks + 1):
+        raw = llm.invoke(messages, response_format=_response_format(keyword_schema)).content
+        try:
+            keywords = parse_keywords(raw, len(batch))
+        except OutputValidationError as e:
+            record_structured("keywords", False)
+            messages = _reask_messages(messages, raw, e)
+            continue
+        record_structured("keywords", True)
+        return keywords
 
-def extract_keywords_parallel(texts, llm, chunk_size=5, max_workers=4):
+    logger.warning("키워드 추출 응답이 %d회 모두 형식에 맞지 않아 응답 %d건을 제외합니다.", max_reasks + 1, len(batch))
+    return []
+
+def extract_keywords_parallel(texts, llm, max_input_tokens=None, max_workers=4):
     all_keywords = []
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = [executor.submit(process_batch, texts[i:i+chunk_size], llm)
-                   for i in range(0, len(texts), chunk_size)]
+    texts_chunks, _ = pack_texts_by_tokens(texts, max_input_tokens=max_input_tokens)
+    with ContextThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(process_batch, chunk, llm): chunk for chunk in texts_chunks}
         for f in as_completed(futures):
-            all_keywords.extend(f.result())
+            all_keywords.extend(expand_keyword_counts(f.result(), futures[f]))
     return all_keywords
 
 # 3. 카테고리 분류
-def categorize_keywords_batch(keywords, llm, batch_size=50):
+# 응답에서 빠졌거나 허용되지 않은 카테고리로 분류된 키워드만 다시 요청
+def categorize_keywords_batch(keywords, llm, batch_size=50, max_reasks=MAX_REASKS):
     categorized = []
     for i in range(0, len(keywords), batch_size):
-        batch = keywords[i:i+batch_size]
-        prompt_text = category_prompt.format_messages(
-            keywords=json.dumps(batch, ensure_ascii=False))[0].content
-        
-        
-        response = llm.invoke([HumanMessage(content=prompt_text)])
-        raw = response.content
+        pending = keywords[i:i+batch_size]
+        messages = category_prompt.format_messages(keywords=json.dumps(pending, ensure_ascii=False))
 
-        try:
-            parsed = category_parser.parse(raw)
-            categorized.extend(parsed)
-        except:
-            match = re.search(r"\[.*\]", raw, flags=re.DOTALL)
-            if match:
-                try:
-                    categorized.extend(json.loads(match.group(0)))
-                except:
-                    continue
+        for _ in range(max_reasks + 1):
+            raw = llm.invoke(messages, response_format=_response_format(category_schema)).content
+            try:
+                categories = parse_categories(raw, pending)
+            except OutputValidationError as e:
+                record_structured("categories", False, len(pending), len(pending))
+                messages = _reask_messages(messages, raw, e)
+                continue
+
+            missing = [kw for kw in pending if kw not in categories]
+            record_structured("categories", True, len(pending), len(missing))
+            categorized.extend({"keyword": kw, "category": category} for kw, category in categories.items())
+            if not missing:
+                pending = []
+                break
+            if len(missing) == len(pending):
+                messages = _reask_messages(messages, raw, f"분류되지 않은 키워드: {json.dumps(missing, ensure_ascii=False)}")
+            else:
+                messages = category_prompt.format_messages(keywords=json.dumps(missing, ensure_ascii=False))
+            pending = missing
+
+        if pending:
+            logger.warning("카테고리를 받지 못한 키워드 %d개는 '기타'로 분류합니다: %s", len(pending), pending)
     return categorized
 
 
-# 4. 통합 함수 
-def run_keyword_analysis(texts, llm):
-    # 진행률 바를 표시할 컨테이너
-    progress_placeholder = st.empty()
-    progress_bar = progress_placeholder.progress(0, text="키워드 추출 중...")
-    
-    # 키워드 추출 부분
+# 4. 통합 함수
+# 키워드 추출 결과를 묶음 순서대로 받으면서, 새 키워드가 CATEGORY_BATCH_SIZE개 모이면 바로 카테고리 분류를 시작
+# (추출이 모두 끝날 때까지 기다리지 않음, 묶음 순서대로 모으므로 분류 요청 구성은 실행마다 같아 캐시 적중)
+CATEGORY_BATCH_SIZE = 50
+
+# weights: {대표 응답: 대신하는 응답 수} — 중복 정리한 응답을 넘기면 키워드 빈도를 원래 건수 기준으로 되돌림
+# mode: llm(GPT 추출) / local(로컬 TF-IDF 추출 + 로컬 분류, GPT 호출 없음) / hybrid(로컬 신뢰도가 낮은 응답만 GPT 추출)
+# extractor: 코호트 전체로 문서 빈도를 계산한 LocalKeywordExtractor (없으면 이 대상자의 응답으로 계산)
+# keyword_index: 표현만 다른 키워드를 대표 키워드로 묶는 KeywordIndex (없으면 기본 인덱스, 표준화를 끄면 사용 안 함)
+# category_classifier: 임베딩 기반 로컬 카테고리 분류기 (없으면 기본 분류기, 분류 방식이 llm이면 사용 안 함)
+def run_keyword_analysis(texts, llm, registry=None, reporter=None, max_input_tokens=None, weights=None,
+                         mode=None, extractor=None, keyword_index=None, category_classifier=None):
+    # 진행률은 reporter를 통해 표시 (Streamlit / CLI 공통)
+    reporter = ensure_reporter(reporter)
+    reporter.progress("keywords", 0.0, text="키워드 추출 중...")
+    mode = mode or extractor_settings["mode"]
+    if mode not in KEYWORD_MODES:
+        raise ValueError(f"지원하지 않는 키워드 추출 방식입니다: {mode} (가능: {', '.join(KEYWORD_MODES)})")
+    weights = weights or {}
+    if keyword_index is None and canon_settings["enabled"]:
+        keyword_index = get_default_keyword_index()
+    if category_classifier is None and classifier_settings["mode"] != "llm":
+        category_classifier = get_default_category_classifier()
+
+    # 추출된 키워드를 카테고리 분류/감정 분석 전에 대표 키워드로 바꿈
+    raw_keywords = set()
+    def canonicalize(keywords):
+        raw_keywords.update(keywords)
+        if keyword_index is None:
+            return list(keywords)
+        with stage("canonicalization"):
+            return keyword_index.canonicalize(keywords)
+
+    # 로컬 추출: local이면 모든 응답, hybrid이면 신뢰도가 기준 이상인 응답의 결과를 그대로 사용
     all_keywords = []
-    texts_chunks = [texts[i:i + 5] for i in range(0, len(texts), 5)]
+    llm_texts = texts
+    if mode != "llm":
+        with stage("local_keyword_extraction"):
+            extractor = extractor or LocalKeywordExtractor(texts)
+            extracted = extractor.extract_many(texts)
+        min_confidence = extractor_settings["min_confidence"]
+        llm_texts = []
+        for text, (keywords, confidence) in zip(texts, extracted):
+            if mode == "local" or confidence >= min_confidence:
+                all_keywords.extend(keywords * weights.get(text, 1))
+            else:
+                llm_texts.append(text)
+        all_keywords = canonicalize(all_keywords)
+        reporter.debug("로컬 키워드 추출:", f"응답 {len(texts) - len(llm_texts)}건 로컬 처리, {len(llm_texts)}건 GPT 추출")
+
+    # 키워드 추출 부분: 토큰 예산에 맞춰 응답을 묶어 요청 수를 줄임
+    texts_chunks, pack_stats = pack_texts_by_tokens(llm_texts, max_input_tokens=max_input_tokens)
     total_chunks = len(texts_chunks)
-    
-    with ThreadPoolExecutor(max_workers=4) as executor:
-        futures = {executor.submit(process_batch, chunk, llm): i for i, chunk in enumerate(texts_chunks)}
-        
-        chunk_count = 0
-        for future in as_completed(futures):
-            all_keywords.extend(future.result())
-            chunk_count += 1
-            progress_percent = int(chunk_count / total_chunks * 50) # 총 50% 비중
-            progress_bar.progress(progress_percent, text=f"키워드 추출 중...")
+    if total_chunks:
+        reporter.debug(
+            "키워드 추출 요청 묶음:",
+            f"{pack_stats['requests']}건 (고정 5개 묶음 대비 {pack_stats['requests_saved']}건 절감, "
+            f"요청당 평균 {pack_stats['avg_tokens_per_request']} 토큰)"
+        )
 
-    unique_keywords = sorted(set(all_keywords))
+    # 실행 전체에서 이미 분류됐거나 다른 대상자가 분류 중인 키워드는 제외하고 새 키워드만 분류
+    requested = set()
+    def new_keywords(keywords):
+        fresh = [kw for kw in dict.fromkeys(keywords) if kw not in requested]
+        requested.update(fresh)
+        return registry.missing_categories(fresh) if registry is not None else fresh
+
+    # 로컬 분류기 신뢰도가 기준 이상인 키워드는 그대로 쓰고 나머지만 GPT로 분류 (local 방식은 모두 로컬 결과 사용)
+    def categorize(batch):
+        try:
+            return _categorize(batch)
+        finally:
+            # 분류 결과를 얻지 못한 키워드(요청 실패, GPT 응답 누락)는 예약을 풀어 기다리는 대상자가 계속 진행
+            if registry is not None:
+                registry.release_categories(batch)
+
+    def _categorize(batch):
+        with stage("categorization"):
+            local = {}
+            if category_classifier is not None:
+                with stage("local_categorization"):
+                    predictions = category_classifier.classify(batch)
+                min_confidence = 0.0 if classifier_settings["mode"] == "local" else classifier_settings["min_confidence"]
+                local = {kw: category for kw, (category, confidence) in predictions.items() if confidence >= min_confidence}
+            escalated = [kw for kw in batch if kw not in local]
+            categorized = [{"keyword": kw, "category": category} for kw, category in local.items()]
+            if escalated:
+                from_llm = categorize_keywords_batch(escalated, llm, batch_size=CATEGORY_BATCH_SIZE)
+                categorized.extend(from_llm)
+                if category_classifier is not None:
+                    # GPT 분류 결과는 다음 실행에서도 재사용하고 카테고리 대표 벡터에 반영
+                    category_classifier.learn({item["keyword"]: item["category"] for item in from_llm})
+            if category_classifier is not None:
+                record_categorization(len(local), len(escalated))
+        if registry is not None:
+            # 동시에 분석 중인 다른 대상자도 바로 재사용할 수 있도록 묶음마다 등록
+            registry.update_categories({item["keyword"]: item["category"] for item in categorized})
+        return categorized
 
-    # 카테고리 분류 부분
-    total_batches = len(unique_keywords) // 50 + (1 if len(unique_keywords) % 50 != 0 else 0)
-    batch_count = 0
     categorized = []
-    
-    for i in range(0, len(unique_keywords), 50):
-        batch = unique_keywords[i:i+50]
-        parsed_cat = categorize_keywords_batch(batch, llm)
-        categorized.extend(parsed_cat)
-        batch_count += 1
-        progress_percent = int(50 + (batch_count / total_batches * 50)) # 나머지 50% 비중
-        progress_bar.progress(progress_percent, text=f"카테고리 분류 중...")
-
-    progress_bar.progress(100, text="분석 완료!")
-    time.sleep(0.5)
-    progress_placeholder.empty() # 진행률 바를 화면에서 제거
+    with ContextThreadPoolExecutor(max_workers=4) as executor:
+        extract_futures = [executor.submit(process_batch, chunk, llm) for chunk in texts_chunks]
+        category_futures = []
+        # local 방식은 GPT로 분류하지 않음 (아래에서 로컬 분류)
+        pending = new_keywords(all_keywords) if mode != "local" else []
+        def submit_full_batches():
+            while len(pending) >= CATEGORY_BATCH_SIZE:
+                category_futures.append(executor.submit(categorize, pending[:CATEGORY_BATCH_SIZE]))
+                del pending[:CATEGORY_BATCH_SIZE]
+        submit_full_batches()
+
+        failed_chunks = 0
+        try:
+            with stage("keyword_extraction"):
+                for chunk_count, future in enumerate(extract_futures, start=1):
+                    try:
+                        items = future.result()
+                    except Exception as e:
+                        # 재시도 후에도 실패한 묶음은 건너뛰되 화면/로그에 알림
+                        failed_chunks += 1
+                        reporter.warning(f"⚠️ 키워드 추출 요청 실패 (응답 {len(texts_chunks[chunk_count - 1])}건 제외): {e}")
+                        items = []
+                    # 표준화 후 같은 대표 키워드의 응답 번호를 합치고, 응답별 weight(중복 정리로 합쳐진 응답 수)만큼 빈도 계산
+                    canonical = canonicalize([keyword for keyword, _ in items])
+                    keywords = expand_keyword_counts(
+                        [(keyword, sources) for keyword, (_, sources) in zip(canonical, items)],
+                        texts_chunks[chunk_count - 1], weights
+                    )
+                    all_keywords.extend(keywords)
+                    pending.extend(new_keywords(keywords))
+                    submit_full_batches()
+                    reporter.progress("keywords", chunk_count / total_chunks * 0.5, text="키워드 추출 중...") # 총 50% 비중
+            if pending:
+                category_futures.append(executor.submit(categorize, pending[:]))
+                pending.clear()
+        finally:
+            # 예약만 하고 분류 요청에 넘기지 못한 키워드는 예약을 풀어 기다리는 대상자가 계속 진행
+            if registry is not None and pending:
+                registry.release_categories(pending)
+
+        # 카테고리 분류 부분 (남은 묶음 대기)
+        for batch_count, future in enumerate(category_futures, start=1):
+            categorized.extend(future.result())
+            reporter.progress("keywords", 0.5 + batch_count / len(category_futures) * 0.5, text="카테고리 분류 중...") # 나머지 50% 비중
+
+    if failed_chunks:
+        reporter.warning(f"⚠️ 키워드 추출 요청 {total_chunks}건 중 {failed_chunks}건이 실패해 일부 응답이 분석에서 제외되었습니다.")
+
+    unique_keywords = sorted(set(all_keywords))
+    record_canonicalization(len(raw_keywords), len(unique_keywords))
+    if len(unique_keywords) < len(raw_keywords):
+        reporter.debug("키워드 표준화:", f"{len(raw_keywords)}개 → {len(unique_keywords)}개")
+    category_map = {item["keyword"]: item["category"] for item in categorized}
+    if registry is not None:
+        registry.observe(unique_keywords)
+        category_map = registry.categories_for(unique_keywords)
+    if mode == "local":
+        # 이전에 분류된 키워드는 그 결과를, 나머지는 로컬 분류기(쓸 수 없으면 카테고리 힌트)로 분류
+        unknown = [kw for kw in unique_keywords if kw not in category_map]
+        predicted = {}
+        if unknown and category_classifier is not None:
+            with stage("local_categorization"):
+                predicted = category_classifier.classify(unknown)
+            record_categorization(len(predicted), 0)
+        category_map = {
+            kw: category_map.get(kw) or (predicted[kw][0] if kw in predicted else guess_category(kw))
+            for kw in unique_keywords
+        }
+
+    reporter.progress("keywords", 1.0, text="분석 완료!")
+    reporter.clear("keywords") # 진행률 바를 화면에서 제거
 
     df_kw = pd.DataFrame(all_keywords, columns=["keyword"])
-    df_kw["category"] = df_kw["keyword"].map({item["keyword"]: item["category"] for item in categorized}).fillna("기타")
+    df_kw["category"] = df_kw["keyword"].map(category_map).fillna("기타")
     freq = df_kw.groupby(["keyword", "category"]).size().reset_index(name="count")
 
 
-    return freq, {item["keyword"]: item["category"] for item in categorized}
+    return freq, category_map
 
 # 5. 워드클라우드 
+# WordCloud 객체(폰트 설정 포함)는 스레드별로 한 번만 만들어 재사용
+WORDCLOUD_FONT_PATH = os.environ.get("HR_WORDCLOUD_FONT", '/Library/Fonts/AppleGothic.ttf')
+_wordcloud_local = threading.local()
+
+def _get_wordcloud():
+    wc = getattr(_wordcloud_local, "wc", None)
+    if wc is None:
+        wc = WordCloud(width=800, height=400, background_color='white', font_path=WORDCLOUD_FONT_PATH)
+        _wordcloud_local.wc = wc
+    return wc
+
 def generate_wordcloud_from_freq(freq_df):
     
     # 빈 워드클라우드 반환
@@ -159,5 +427,4 @@ def generate_wordcloud_from_freq(freq_df):
         return None
 
     freq_dict = pd.Series(freq_df['count'].values, index=freq_df['keyword']).to_dict()
-    wc = WordCloud(width=800, height=400, background_color='white', font_path='/Library/Fonts/AppleGothic.ttf')
-    return wc.generate_from_frequencies(freq_dict)
\ No newline at end of file
+    return _get_wordcloud().generate_from_frequencies(freq_dict)
@@ -0,0 +1,271 @@
+# modules/analysis/category_classifier.py
+# GPT 없이 키워드 카테고리를 분류하는 로컬 분류기 (CPU 문장 임베딩 + 카테고리 대표 벡터)
+# - 카테고리 대표 벡터(prototype)는 category_prompt의 주요 사례와 이전에 GPT가 분류한 키워드의 임베딩 평균
+# - 키워드 임베딩과 GPT 분류 결과는 디스크(SQLite)에 저장해 다음 실행에서는 모델 추론 없이 재사용
+# - 대표 벡터와의 유사도로 신뢰도를 계산해 hybrid 방식에서는 신뢰도가 낮은 키워드만 GPT로 분류
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from modules.analysis.local_keywords import CATEGORY_HINTS
+from modules.llm_cache import DEFAULT_CACHE_DIR
+from modules.metrics import stage
+
+logger = logging.getLogger("hr_analytics")
+
+EMBEDDING_MODEL = "snunlp/KR-SBERT-V40K-klueNLI-augSTS"
+CATEGORY_MODES = ("llm", "hybrid", "local")
+
+# 환경변수로 기본 설정 지정
+# - HR_CATEGORY_CLASSIFIER: llm(기본, 모든 키워드 GPT 분류) / hybrid(신뢰도가 낮은 키워드만 GPT) / local(GPT 호출 없음)
+#   hybrid/local은 임베딩 모델을 내려받아 사용하므로 직접 선택한 경우에만 사용
+# - HR_CATEGORY_MIN_CONFIDENCE: hybrid 방식에서 로컬 분류 결과를 그대로 쓸 최소 신뢰도 (0~1)
+#   벤치마크의 categorization 시나리오로 기준별 로컬 분류 비율과 GPT 결과 일치율을 확인한 뒤 조정
+# - HR_EMBEDDING_MODEL: 키워드 임베딩에 사용할 문장 임베딩 모델 (Hugging Face 모델 이름)
+# - HR_EMBEDDING_BATCH_SIZE: 한 번에 모델에 넣는 키워드 수
+classifier_settings = {
+    "mode": os.environ.get("HR_CATEGORY_CLASSIFIER", "llm"),
+    "min_confidence": float(os.environ.get("HR_CATEGORY_MIN_CONFIDENCE", "0.6")),
+    "model": os.environ.get("HR_EMBEDDING_MODEL", EMBEDDING_MODEL),
+    "batch_size": int(os.environ.get("HR_EMBEDDING_BATCH_SIZE", "64")),
+}
+
+# 카테고리 대표 벡터의 초기 사례 (category_prompt의 주요 사례 + '기타' 설명)
+CATEGORY_SEEDS = {
+    **CATEGORY_HINTS,
+    "기타": ("의견", "제안", "감정 표현", "기대", "바람", "모호한 응답"),
+}
+# 유사도 차이를 신뢰도(softmax 확률)로 바꿀 때의 온도: 작을수록 1위 카테고리의 신뢰도가 높아짐
+# (보정된 확률이 아니므로 min_confidence는 벤치마크로 측정한 일치율을 기준으로 정함)
+TEMPERATURE = 0.05
+
+# 프로세스 전체에서 하나만 생성되는 임베딩 모델 (최초 사용 시 로딩, 실패하면 GPT 분류로 대체)
+_embedder = None
+_load_error = None
+_lock = threading.Lock()
+# 여러 대상자를 동시에 분석할 때 토크나이저/모델을 동시에 사용하지 않도록 추론을 직렬화
+_inference_lock = threading.Lock()
+
+
+# 1. 임베딩 모델 (문장 임베딩 = 토큰 임베딩의 평균)
+class TransformerEmbedder:
+    def __init__(self, model_name):
+        import torch
+        from transformers import AutoModel, AutoTokenizer
+
+        self.name = model_name
+        self._torch = torch
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = AutoModel.from_pretrained(model_name)
+        self.model.eval()
+
+    def __call__(self, texts, batch_size=64):
+        vectors = []
+        with self._torch.no_grad():
+            for i in range(0, len(texts), batch_size):
+                encoded = self.tokenizer(
+                    list(texts[i:i + batch_size]), padding=True, truncation=True, max_length=32, return_tensors="pt"
+                )
+                hidden = self.model(**encoded).last_hidden_state
+                mask = encoded["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+                pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+                vectors.append(pooled.numpy())
+        return np.vstack(vectors)
+
+
+def configure_category_classifier(mode=None, min_confidence=None, model=None):
+    global _embedder, _load_error
+    if mode is not None:
+        if mode not in CATEGORY_MODES:
+            raise ValueError(f"지원하지 않는 카테고리 분류 방식입니다: {mode} (가능: {', '.join(CATEGORY_MODES)})")
+        classifier_settings["mode"] = mode
+    if min_confidence is not None:
+        classifier_settings["min_confidence"] = min_confidence
+    with _lock:
+        # 모델이 바뀌면 다음 사용 시 다시 로딩
+        if model is not None and model != classifier_settings["model"]:
+            classifier_settings["model"] = model
+            _embedder = None
+            _load_error = None
+
+# 모델을 불러올 수 없으면(오프라인, torch 미설치, 모델 오류 등) None — 다시 시도하지 않고 GPT 분류 사용
+def get_embedder():
+    global _embedder, _load_error
+    if _embedder is None and _load_error is None:
+        with _lock:
+            if _embedder is None and _load_error is None:
+                try:
+                    _embedder = TransformerEmbedder(classifier_settings["model"])
+                except Exception as e:
+                    _load_error = e
+                    logger.warning("임베딩 모델을 불러오지 못해 키워드 카테고리를 GPT로 분류합니다: %s", e)
+    return _embedder
+
+# 마지막 모델 로딩 오류 (실행 시작 시 reporter로 알림)
+def embedder_load_error():
+    return _load_error
+
+# 벤치마크 등에서 임베딩 모델을 직접 지정 (None이면 다음 사용 시 설정된 모델을 다시 로딩)
+def set_embedder(embedder):
+    global _embedder, _load_error
+    with _lock:
+        _embedder = embedder
+        _load_error = None
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-9)
+
+
+# 2. 임베딩 / GPT 분류 결과 저장소 + 분류기
+class CategoryClassifier:
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        # 모델 이름 → {키워드: 정규화된 임베딩}
+        self._vectors = {}
+        # GPT가 분류한 키워드 → 카테고리
+        self.labels = {}
+        # 모델 이름 → (카테고리 목록, 대표 벡터 행렬), GPT 분류 결과가 추가되면 다시 계산
+        self._prototypes = {}
+        self._lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.path = os.path.join(self.cache_dir, "category_classifier.sqlite3")
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    model TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    PRIMARY KEY (model, text)
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS labels (
+                    keyword TEXT PRIMARY KEY,
+                    category TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            self._conn.commit()
+            self.labels = dict(self._conn.execute("SELECT keyword, category FROM labels"))
+
+    # 모델별 저장된 임베딩은 처음 사용할 때 한 번에 읽음
+    def _model_vectors(self, model):
+        vectors = self._vectors.get(model)
+        if vectors is None:
+            rows = self._conn.execute("SELECT text, vector FROM embeddings WHERE model = ?", (model,))
+            vectors = self._vectors[model] = {text: np.frombuffer(blob, dtype=np.float32) for text, blob in rows}
+        return vectors
+
+    # 반환값: 텍스트 순서대로 쌓은 정규화 임베딩 행렬 (저장되지 않은 텍스트만 모델로 계산)
+    def _embed(self, embedder, texts):
+        model = getattr(embedder, "name", classifier_settings["model"])
+        with self._lock:
+            vectors = self._model_vectors(model)
+            missing = [text for text in dict.fromkeys(texts) if text not in vectors]
+        if missing:
+            with stage("embedding"), _inference_lock:
+                computed = _normalize(embedder(missing, batch_size=classifier_settings["batch_size"]))
+            with self._lock:
+                vectors.update(zip(missing, computed))
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?)",
+                    [(model, text, vector.tobytes()) for text, vector in zip(missing, computed)]
+                )
+                self._conn.commit()
+        return np.stack([vectors[text] for text in texts])
+
+    def _category_prototypes(self, embedder):
+        model = getattr(embedder, "name", classifier_settings["model"])
+        with self._lock:
+            cached = self._prototypes.get(model)
+            if cached is not None:
+                return cached
+            examples = {category: list(seeds) for category, seeds in CATEGORY_SEEDS.items()}
+            for keyword, category in self.labels.items():
+                examples.setdefault(category, []).append(keyword)
+
+        categories = list(examples)
+        prototypes = _normalize([self._embed(embedder, examples[category]).mean(axis=0) for category in categories])
+        with self._lock:
+            self._prototypes[model] = (categories, prototypes)
+        return categories, prototypes
+
+    # 반환값: {키워드: (카테고리, 신뢰도)} — 임베딩 모델을 쓸 수 없으면 빈 dict (호출한 쪽에서 GPT로 분류)
+    # GPT가 이미 분류한 키워드는 그 결과를 신뢰도 1.0으로 반환
+    def classify(self, keywords) -> dict:
+        keywords = list(dict.fromkeys(keywords))
+        with self._lock:
+            predictions = {kw: (self.labels[kw], 1.0) for kw in keywords if kw in self.labels}
+        unknown = [kw for kw in keywords if kw not in predictions]
+        if not unknown:
+            return predictions
+        with stage("embedding_load"):
+            embedder = get_embedder()
+        if embedder is None:
+            return predictions
+
+        categories, prototypes = self._category_prototypes(embedder)
+        similarity = self._embed(embedder, unknown) @ prototypes.T
+        scores = np.exp((similarity - similarity.max(axis=1, keepdims=True)) / TEMPERATURE)
+        probabilities = scores / scores.sum(axis=1, keepdims=True)
+        best = probabilities.argmax(axis=1)
+        for kw, index, row in zip(unknown, best, probabilities):
+            predictions[kw] = (categories[index], round(float(row[index]), 3))
+        return predictions
+
+    # GPT 분류 결과를 저장하고 다음 분류부터 대표 벡터에 반영
+    def learn(self, category_map):
+        if not category_map:
+            return
+        now = time.time()
+        with self._lock:
+            changed = {kw: category for kw, category in category_map.items() if self.labels.get(kw) != category}
+            if not changed:
+                return
+            self.labels.update(changed)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO labels VALUES (?, ?, ?)",
+                [(kw, category, now) for kw, category in changed.items()]
+            )
+            self._conn.commit()
+            self._prototypes.clear()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.execute("DELETE FROM labels")
+            self._conn.commit()
+            self._vectors.clear()
+            self.labels.clear()
+            self._prototypes.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            embeddings = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            return {
+                "labels": len(self.labels),
+                "embeddings": embeddings,
+                "model": classifier_settings["model"],
+                "path": self.path,
+            }
+
+
+_default_classifier = None
+_default_classifier_lock = threading.Lock()
+
+def get_default_category_classifier() -> CategoryClassifier:
+    global _default_classifier
+    with _default_classifier_lock:
+        if _default_classifier is None:
+            _default_classifier = CategoryClassifier()
+        return _default_classifier
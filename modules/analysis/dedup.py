@@ -0,0 +1,146 @@
+# modules/analysis/dedup.py
+# 키워드 추출 전 중복 응답 정리
+# - exact: 정규화(유니코드 NFKC, 소문자, 공백/문장부호 정리)한 응답이 같으면 하나로 합침
+# - near: 글자 n-gram(shingle) MinHash + LSH로 유사도가 threshold 이상인 응답도 합침
+# 대표 응답별로 몇 건을 대신하는지(weight)를 함께 반환해 키워드 빈도를 원래 건수로 되돌림
+# (키워드 추출 응답의 응답 번호로 키워드가 나온 대표 응답을 찾아 그 weight만큼 셈)
+import hashlib
+import os
+import re
+import unicodedata
+
+import numpy as np
+
+DEDUP_MODES = ("off", "exact", "near")
+
+# 환경변수로 기본 설정 지정
+# - HR_DEDUP: off / exact(기본) / near
+# - HR_NEAR_DUP_THRESHOLD: near 방식에서 같은 응답으로 볼 최소 유사도 (0~1)
+dedup_settings = {
+    "mode": os.environ.get("HR_DEDUP", "exact"),
+    "threshold": float(os.environ.get("HR_NEAR_DUP_THRESHOLD", "0.85")),
+}
+SHINGLE_SIZE = 3
+NUM_PERM = 64
+NUM_BANDS = 16
+# MinHash 순열: (a * x + b) mod p (p = 2^31 - 1, uint64 곱셈이 넘치지 않는 범위)
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20240822)
+_PERM_A = _rng.integers(1, _PRIME, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, _PRIME, size=NUM_PERM, dtype=np.uint64)
+
+_PUNCT_PATTERN = re.compile(r"[^\w\s]")
+_SPACE_PATTERN = re.compile(r"\s+")
+
+
+def configure_dedup(mode=None, threshold=None):
+    if mode is not None:
+        if mode not in DEDUP_MODES:
+            raise ValueError(f"지원하지 않는 중복 정리 방식입니다: {mode} (가능: {', '.join(DEDUP_MODES)})")
+        dedup_settings["mode"] = mode
+    if threshold is not None:
+        dedup_settings["threshold"] = threshold
+
+
+# 1. 정규화 / 해시
+def normalize_text(text) -> str:
+    text = unicodedata.normalize("NFKC", str(text)).lower()
+    text = _PUNCT_PATTERN.sub(" ", text)
+    return _SPACE_PATTERN.sub(" ", text).strip()
+
+def text_hash(normalized) -> str:
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+# 2. MinHash 서명 (공백을 뺀 글자 n-gram 기준, 띄어쓰기만 다른 응답도 같은 shingle)
+# 유니코드 코드값(21비트) 3개를 64비트 정수 하나로 묶어 shingle을 파이썬 루프 없이 계산
+def _shingle_hashes(normalized, size=SHINGLE_SIZE):
+    codes = np.frombuffer(normalized.replace(" ", "").encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    if len(codes) <= size:
+        codes = np.pad(codes, (0, size - len(codes)))
+    shingles = np.zeros(len(codes) - size + 1, dtype=np.uint64)
+    for offset in range(size):
+        shingles = (shingles << np.uint64(21)) | codes[offset:offset + len(shingles)]
+    return np.unique(shingles % np.uint64(_PRIME))
+
+def minhash_signature(normalized) -> np.ndarray:
+    hashes = _shingle_hashes(normalized)
+    return ((np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % np.uint64(_PRIME)).min(axis=1)
+
+
+# 3. 중복 정리
+# 반환값: (대표 응답 목록, 대표별 weight, 통계)
+# 대표는 처음 등장한 응답이며 입력 순서를 유지
+def dedupe_texts(texts, mode=None, threshold=None):
+    mode = mode or dedup_settings["mode"]
+    if mode not in DEDUP_MODES:
+        raise ValueError(f"지원하지 않는 중복 정리 방식입니다: {mode} (가능: {', '.join(DEDUP_MODES)})")
+    threshold = threshold or dedup_settings["threshold"]
+    texts = [str(text) for text in texts]
+
+    if mode == "off":
+        return texts, [1] * len(texts), dedup_stats(len(texts), len(texts), 0, 0)
+
+    representatives, weights = [], []
+    by_hash = {}
+    signatures, buckets = [], {}
+    rows_per_band = NUM_PERM // NUM_BANDS
+    exact = near = 0
+
+    for text in texts:
+        normalized = normalize_text(text)
+        key = text_hash(normalized)
+        if key in by_hash:
+            weights[by_hash[key]] += 1
+            exact += 1
+            continue
+
+        if mode == "near":
+            signature = minhash_signature(normalized)
+            bands = [signature[b * rows_per_band:(b + 1) * rows_per_band].tobytes() for b in range(NUM_BANDS)]
+            # 같은 band를 가진 후보만 한 번에 비교하고, 기준을 넘는 후보 중 먼저 등장한 대표에 합침
+            candidates = sorted({index for band, value in enumerate(bands) for index in buckets.get((band, value), ())})
+            match = None
+            if candidates:
+                similarity = (np.stack([signatures[index] for index in candidates]) == signature).mean(axis=1)
+                matched = np.flatnonzero(similarity >= threshold)
+                match = candidates[matched[0]] if len(matched) else None
+            if match is not None:
+                by_hash[key] = match
+                weights[match] += 1
+                near += 1
+                continue
+            for band, value in enumerate(bands):
+                buckets.setdefault((band, value), []).append(len(representatives))
+            signatures.append(signature)
+
+        by_hash[key] = len(representatives)
+        representatives.append(text)
+        weights.append(1)
+
+    return representatives, weights, dedup_stats(len(texts), len(representatives), exact, near)
+
+def dedup_stats(total, unique, exact, near) -> dict:
+    return {
+        "responses": total,
+        "unique": unique,
+        "exact_duplicates": exact,
+        "near_duplicates": near,
+        "duplicate_rate": round(1 - unique / total, 3) if total else 0.0,
+    }
+
+
+# 4. 키워드 빈도 되돌리기
+# items: [(키워드, 묶음 안의 응답 번호 목록)] — 키워드 빈도 = 키워드가 나온 응답의 weight 합 (중복이 없으면 응답 수)
+# 같은 키워드(표준화 후 포함)가 여러 번 나오면 응답 번호를 합쳐 응답마다 한 번만 세고, 응답 번호가 없으면 1건으로 셈
+def expand_keyword_counts(items, batch, weights=None) -> list:
+    weights = weights or {}
+    sources = {}
+    for keyword, indices in items:
+        sources.setdefault(keyword, set()).update(indices)
+
+    expanded = []
+    for keyword, indices in sources.items():
+        count = sum(weights.get(batch[i], 1) for i in indices) or 1
+        expanded.extend([keyword] * count)
+    return expanded
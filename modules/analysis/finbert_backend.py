@@ -0,0 +1,146 @@
+# modules/analysis/finbert_backend.py
+import importlib.util
+import os
+import threading
+
+from modules.metrics import stage
+
+FINBERT_MODEL = "snunlp/KR-FinBert-SC"
+FINBERT_BACKENDS = ("torch", "quantized", "onnx")
+
+# 환경변수로 기본 설정 지정
+# - FINBERT_BACKEND: torch(기본) / quantized(동적 int8 양자화) / onnx(ONNX Runtime)
+# - FINBERT_NUM_THREADS: CPU 추론 스레드 수 (0이면 라이브러리 기본값)
+# - FINBERT_BATCH_SIZE: 한 번에 모델에 넣는 키워드 수
+finbert_settings = {
+    "backend": os.environ.get("FINBERT_BACKEND", "torch"),
+    "num_threads": int(os.environ.get("FINBERT_NUM_THREADS", "0")),
+    "batch_size": int(os.environ.get("FINBERT_BATCH_SIZE", "32")),
+    "onnx_dir": os.environ.get("FINBERT_ONNX_DIR", os.path.join(".cache", "finbert_onnx")),
+}
+
+# 프로세스 전체에서 하나만 생성되는 분류기 (최초 사용 시 로딩)
+# 로딩할 때의 백엔드/스레드 수를 기억해 두고, 설정이 바뀌면 다음 사용 시 다시 로딩
+_classifier = None
+_classifier_backend = None
+_classifier_threads = None
+# num_threads를 0(기본값)으로 되돌릴 때 사용할 torch의 원래 스레드 수
+_torch_default_threads = None
+_lock = threading.Lock()
+# 여러 대상자를 동시에 분석할 때 토크나이저/모델을 동시에 사용하지 않도록 추론을 직렬화
+_inference_lock = threading.Lock()
+
+
+# 1. 백엔드별 로딩
+def _load_torch(quantize=False):
+    global _torch_default_threads
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer, pipeline
+
+    if _torch_default_threads is None:
+        _torch_default_threads = torch.get_num_threads()
+    torch.set_num_threads(finbert_settings["num_threads"] or _torch_default_threads)
+
+    tokenizer = AutoTokenizer.from_pretrained(FINBERT_MODEL)
+    model = AutoModelForSequenceClassification.from_pretrained(FINBERT_MODEL)
+    model.eval()
+    if quantize:
+        # Linear 레이어만 int8로 동적 양자화 (CPU 전용)
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer, device=-1)
+
+def _load_onnx():
+    try:
+        import onnxruntime
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+    except ImportError as e:
+        raise ImportError("ONNX 백엔드를 사용하려면 `pip install optimum[onnxruntime]`를 먼저 실행하세요.") from e
+    from transformers import AutoTokenizer, pipeline
+
+    session_options = onnxruntime.SessionOptions()
+    if finbert_settings["num_threads"]:
+        session_options.intra_op_num_threads = finbert_settings["num_threads"]
+
+    # 최초 1회만 ONNX로 내보내고 이후에는 저장된 모델을 사용
+    onnx_dir = finbert_settings["onnx_dir"]
+    if os.path.exists(os.path.join(onnx_dir, "model.onnx")):
+        model = ORTModelForSequenceClassification.from_pretrained(onnx_dir, session_options=session_options)
+        tokenizer = AutoTokenizer.from_pretrained(onnx_dir)
+    else:
+        model = ORTModelForSequenceClassification.from_pretrained(
+            FINBERT_MODEL, export=True, session_options=session_options
+        )
+        tokenizer = AutoTokenizer.from_pretrained(FINBERT_MODEL)
+        model.save_pretrained(onnx_dir)
+        tokenizer.save_pretrained(onnx_dir)
+    return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
+
+
+# 반환값: 이 환경에서 쓸 수 있는 백엔드 (onnx는 optimum[onnxruntime]이 설치된 경우만)
+def available_backends() -> tuple:
+    onnx_ready = all(importlib.util.find_spec(name) is not None for name in ("optimum", "onnxruntime"))
+    return tuple(backend for backend in FINBERT_BACKENDS if backend != "onnx" or onnx_ready)
+
+
+# 2. 설정 변경 및 분류기 조회
+def configure_finbert(backend=None, num_threads=None, batch_size=None):
+    global _classifier, _classifier_backend, _classifier_threads
+    if backend is not None and backend not in FINBERT_BACKENDS:
+        raise ValueError(f"지원하지 않는 FinBERT 백엔드입니다: {backend} (가능: {', '.join(FINBERT_BACKENDS)})")
+    with _lock:
+        if backend is not None:
+            finbert_settings["backend"] = backend
+        if num_threads is not None:
+            finbert_settings["num_threads"] = num_threads
+        if batch_size is not None:
+            finbert_settings["batch_size"] = batch_size
+        # 백엔드나 스레드 수가 바뀌면 다음 사용 시 다시 로딩 (스레드 수는 로딩할 때 적용됨)
+        if _classifier is not None and (
+            _classifier_backend != finbert_settings["backend"] or _classifier_threads != finbert_settings["num_threads"]
+        ):
+            _classifier = None
+            _classifier_backend = None
+            _classifier_threads = None
+
+def get_classifier():
+    global _classifier, _classifier_backend, _classifier_threads
+    if _classifier is None:
+        with _lock:
+            if _classifier is None:
+                backend = finbert_settings["backend"]
+                if backend == "onnx":
+                    _classifier = _load_onnx()
+                elif backend == "quantized":
+                    _classifier = _load_torch(quantize=True)
+                elif backend == "torch":
+                    _classifier = _load_torch()
+                else:
+                    raise ValueError(f"지원하지 않는 FinBERT 백엔드입니다: {backend}")
+                _classifier_backend = backend
+                _classifier_threads = finbert_settings["num_threads"]
+    return _classifier
+
+# 벤치마크 등에서 분류기를 직접 지정 (None이면 다음 사용 시 설정된 백엔드로 다시 로딩)
+def set_classifier(classifier):
+    global _classifier, _classifier_backend, _classifier_threads
+    with _lock:
+        _classifier = classifier
+        _classifier_backend = finbert_settings["backend"] if classifier is not None else None
+        _classifier_threads = finbert_settings["num_threads"] if classifier is not None else None
+
+def is_classifier_loaded() -> bool:
+    return _classifier is not None
+
+
+# 3. 키워드 감정 분류
+def classify_keywords(keywords, batch_size=None):
+    if not keywords:
+        return []
+    with stage("finbert_load"):
+        classifier = get_classifier()
+    with stage("finbert"), _inference_lock:
+        return classifier(
+            list(keywords),
+            batch_size=batch_size or finbert_settings["batch_size"],
+            truncation=True
+        )
@@ -0,0 +1,190 @@
+# modules/analysis/local_keywords.py
+# GPT 없이 응답에서 키워드를 뽑는 로컬 추출기 (TF-IDF)
+# - 어절에서 조사/어미를 떼어 명사에 가까운 형태로 만든 뒤, 단어 1개와 이웃한 단어 2개(n-gram)를 후보로 사용
+# - 문서 빈도(df)는 대상자 전체(코호트) 응답으로 계산해, 모든 응답에 나오는 상투적인 표현은 점수가 낮아짐
+# - 응답마다 신뢰도를 계산해 hybrid 방식에서는 신뢰도가 낮은 응답만 GPT로 추출
+import math
+import os
+import re
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+
+KEYWORD_MODES = ("llm", "local", "hybrid")
+
+# 환경변수로 기본 설정 지정
+# - HR_KEYWORD_EXTRACTOR: llm(기본, 모든 응답 GPT 추출) / local(GPT 호출 없음) / hybrid(신뢰도가 낮은 응답만 GPT)
+# - HR_LOCAL_MIN_CONFIDENCE: hybrid 방식에서 로컬 추출 결과를 그대로 쓸 최소 신뢰도 (0~1)
+extractor_settings = {
+    "mode": os.environ.get("HR_KEYWORD_EXTRACTOR", "llm"),
+    "min_confidence": float(os.environ.get("HR_LOCAL_MIN_CONFIDENCE", "0.5")),
+}
+
+# 두 개 이상의 응답에 나온 표현만 키워드로 인정
+MIN_DF = 2
+# 전체 응답의 절반 넘게 나온 표현은 상투적인 표현으로 보고 제외 (응답이 MAX_DF_MIN_DOCS건 이상일 때)
+MAX_DF_RATIO = 0.5
+MAX_DF_MIN_DOCS = 10
+# 이웃한 두 단어는 함께 나오는 비율이 이 값 이상일 때만 하나의 표현으로 인정 ('문제 해결', '업무 이해도')
+MIN_COLLOCATION = 0.5
+# 응답 길이(후보 단어 수) WORDS_PER_KEYWORD개당 키워드 1개, 최대 MAX_KEYWORDS_PER_RESPONSE개
+WORDS_PER_KEYWORD = 8
+MAX_KEYWORDS_PER_RESPONSE = 3
+
+# 조사 (긴 것부터 떼어냄, '도'는 '태도', '이해도', '제도'처럼 명사 끝과 겹쳐 단독으로는 떼지 않음)
+PARTICLES = sorted([
+    "에서는", "으로는", "에게는", "까지는", "부터는", "에서도", "으로도", "에게도", "이라는", "라는",
+    "에서", "으로", "에게", "께서", "까지", "부터", "처럼", "보다", "이나", "이랑", "과는", "와는", "에는", "에도",
+    "은", "는", "이", "가", "을", "를", "의", "에", "와", "과", "로", "만", "랑",
+], key=len, reverse=True)
+# '하다'/'스럽다'/'적' 파생 어미: 떼어내면 명사 ('성실하게' → '성실', '적극적인' → '적극')
+DERIVATIONS = sorted([
+    "하였습니다", "했습니다", "합니다", "하십니다", "하셨습니다", "하시고", "하셔서", "하시는", "하신",
+    "하고", "하게", "하여", "해서", "하며", "하는", "하다", "한", "함", "할",
+    "스럽게", "스러운", "스럽고", "적으로", "적인", "적이고",
+], key=len, reverse=True)
+# 떼어낸 뒤에도 이 어미로 끝나면 서술어로 보고 제외
+PREDICATE_ENDINGS = (
+    "습니다", "니다", "어요", "아요", "세요", "는데", "지만", "으며", "면서", "었다", "았다", "였다", "겠다", "다",
+    "않는", "없는", "있는", "되는", "하는", "셔서", "아서", "어서", "여서", "려고", "도록", "으면", "다고", "라고",
+    "되면", "하면", "않은", "않고", "려운", "쉬운", "러운", "로운", "나서", "된", "던", "고",
+)
+# 서술어 어미와 끝이 같지만 명사인 단어
+NOUN_EXCEPTIONS = {"보고", "최고", "사고", "참고", "광고", "재고"}
+STOPWORDS = {
+    "이분", "그분", "저분", "부분", "측면", "모습", "생각", "경우", "관련", "정도", "자체", "다만", "또한", "그리고",
+    "하지만", "그래서", "평소", "항상", "가끔", "자주", "특히", "조금", "많이", "매우", "정말", "너무", "아주", "함께",
+    "앞으로", "지금", "지금처럼", "계속", "좋은", "좋겠습니다", "있는", "있고", "있어", "있어서", "없는", "없고",
+    "되고", "되는", "되어", "되면", "같은", "같습니다", "많은", "많지는", "많지", "특별히", "직접", "기회", "편입니다",
+    "동료들", "동료", "팀", "조직", "업무", "회의", "자리", "상황", "과정", "점", "분", "것", "등", "수", "때", "더",
+    "잘", "큰", "좀", "적", "면", "면에서", "대해서", "특성상", "노력", "필요", "필요해", "도움", "인상", "보여", "드릴",
+    "말씀", "잃지", "감사합니다",
+}
+# 로컬 분류용 카테고리 힌트 (category_prompt의 주요 사례 기준, 앞 카테고리부터 확인)
+CATEGORY_HINTS = {
+    "커뮤니케이션": ("소통", "협업", "협력", "리더십", "조직문화", "경청", "피드백", "배려", "보고", "조율", "공유", "대화", "관계"),
+    "업무태도": ("책임", "성실", "열정", "적극", "꼼꼼", "솔선", "끈기", "시간관리", "근면", "주도", "태도"),
+    "역량": ("해결", "전문", "능력", "이해도", "분석", "기획", "추진", "판단", "실행", "역량", "지식", "기술"),
+    "제도 및 환경": ("복지", "시스템", "근무환경", "환경", "교육", "워라밸", "제도", "평가", "분장"),
+}
+
+_TOKEN_PATTERN = re.compile(r"[0-9A-Za-z가-힣]+")
+
+
+def configure_keyword_extractor(mode=None, min_confidence=None):
+    if mode is not None:
+        if mode not in KEYWORD_MODES:
+            raise ValueError(f"지원하지 않는 키워드 추출 방식입니다: {mode} (가능: {', '.join(KEYWORD_MODES)})")
+        extractor_settings["mode"] = mode
+    if min_confidence is not None:
+        extractor_settings["min_confidence"] = min_confidence
+
+
+# 1. 한국어 어절 정리 (형태소 분석기 없이 조사/어미만 떼어냄)
+def _strip_suffix(word, suffixes):
+    for suffix in suffixes:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 2:
+            return word[:-len(suffix)], True
+    return word, False
+
+# 같은 어절이 응답마다 반복되므로 정리 결과를 캐시
+@lru_cache(maxsize=100_000)
+def normalize_word(word):
+    word = word.lower()
+    if word in STOPWORDS:
+        return None
+    # 한 글자 불용어 + 조사 ('점이', '팀에', '것을')
+    if any(word.endswith(p) and word[:-len(p)] in STOPWORDS for p in PARTICLES):
+        return None
+    # 파생 어미 → 조사 → (명사형 뒤 조사였으면) 파생 어미 순서 ('의지하는' → '의지', '성실함을' → '성실')
+    word, derived = _strip_suffix(word, DERIVATIONS)
+    word, _ = _strip_suffix(word, PARTICLES)
+    if not derived:
+        word, derived = _strip_suffix(word, DERIVATIONS)
+    if not derived and word not in NOUN_EXCEPTIONS and word.endswith(PREDICATE_ENDINGS):
+        return None
+    if len(word) < 2 or word.isdigit() or word in STOPWORDS:
+        return None
+    return word
+
+# 응답 1건의 후보 표현: 단어 1개, 바로 이웃한 단어 2개 (불용어를 사이에 두면 이웃으로 보지 않음)
+def candidate_terms(text):
+    words = [normalize_word(w) for w in _TOKEN_PATTERN.findall(unicodedata.normalize("NFKC", str(text)))]
+    terms = [w for w in words if w]
+    terms += [f"{a} {b}" for a, b in zip(words, words[1:]) if a and b and a != b]
+    return terms, len([w for w in words if w])
+
+
+# 2. 코호트 문서 빈도 기반 추출기
+class LocalKeywordExtractor:
+    def __init__(self, corpus=()):
+        self.doc_freq = Counter()
+        self.n_docs = 0
+        # 문서 빈도를 계산하며 나눈 후보 표현을 추출 때 재사용
+        self._terms = {}
+        self.fit(corpus)
+
+    # 응답 목록으로 문서 빈도 갱신 (응답 1건 = 문서 1개)
+    def fit(self, corpus):
+        for text in corpus:
+            terms = self._candidates(text)
+            self.doc_freq.update(set(terms[0]))
+            self.n_docs += 1
+        return self
+
+    def _candidates(self, text):
+        text = str(text)
+        cached = self._terms.get(text)
+        if cached is None:
+            cached = self._terms[text] = candidate_terms(text)
+        return cached
+
+    def idf(self, term):
+        return math.log((1 + self.n_docs) / (1 + self.doc_freq.get(term, 0))) + 1
+
+    def _usable(self, term):
+        df = self.doc_freq.get(term, 0)
+        if df < MIN_DF:
+            return False
+        if self.n_docs >= MAX_DF_MIN_DOCS and df / self.n_docs > MAX_DF_RATIO:
+            return False
+        if " " in term:
+            # 두 단어 중 드문 쪽이 나온 응답의 절반 이상에서 함께 나와야 하나의 표현으로 봄
+            return df / min(self.doc_freq.get(part, df) for part in term.split(" ")) >= MIN_COLLOCATION
+        return True
+
+    # 반환값: (키워드 목록, 신뢰도)
+    # 신뢰도 = 여러 응답에 반복해 나온 키워드 수 / 응답 길이에 맞는 기대 키워드 수 (후보가 없으면 0)
+    def extract(self, text):
+        terms, n_words = self._candidates(text)
+        if not terms:
+            return [], 0.0
+        expected = min(MAX_KEYWORDS_PER_RESPONSE, max(1, round(n_words / WORDS_PER_KEYWORD)))
+        tf = Counter(terms)
+        scored = sorted(
+            ((count * self.idf(term), term) for term, count in tf.items() if self._usable(term)),
+            reverse=True
+        )
+        keywords, used_words = [], set()
+        for _, term in scored:
+            parts = set(term.split(" "))
+            # 이미 고른 표현과 단어가 겹치면 건너뜀 ('문제 해결'을 골랐으면 '해결'은 제외)
+            if parts & used_words:
+                continue
+            keywords.append(term)
+            used_words |= parts
+            if len(keywords) >= expected:
+                break
+        return keywords, round(len(keywords) / expected, 3)
+
+    def extract_many(self, texts):
+        return [self.extract(text) for text in texts]
+
+
+# 3. 로컬 카테고리 분류 (GPT 없이: 카테고리 힌트 단어를 포함하면 해당 카테고리, 아니면 '기타')
+def guess_category(keyword):
+    compact = keyword.replace(" ", "")
+    for category, hints in CATEGORY_HINTS.items():
+        if any(hint in compact for hint in hints):
+            return category
+    return "기타"
@@ -1,11 +1,16 @@
 # modules/analysis/sentiment_module.py
+import json
+import logging
+import re
 import pandas as pd
-import streamlit as st
-from transformers import pipeline
+from concurrent.futures import as_completed
 from langchain.schema import HumanMessage
 
-# 0단계: 모델 로딩 (FinBERT)
-classifier = pipeline("sentiment-analysis", model="snunlp/KR-FinBert-SC")
+# 0단계: 모델 로딩 (FinBERT) - 최초 분류 시점에 한 번만 로딩
+from modules.analysis.finbert_backend import classify_keywords
+from modules.metrics import ContextThreadPoolExecutor, record_structured
+
+logger = logging.getLogger("hr_analytics")
 
 sentiment_map = {
     'positive': '긍정',
@@ -13,10 +18,25 @@ sentiment_map = {
     'neutral': '중립'
 }
 
-def analyze_sentiment_with_finbert(texts, llm, freq_df, categorized_df):
+def analyze_sentiment_with_finbert(texts, llm, freq_df, categorized_df, registry=None):
 
     unique_keywords = freq_df["keyword"].tolist()
-    results = classifier(unique_keywords)
+    if registry is not None:
+        # 이전/동시에 분석 중인 대상자가 분류하지 않은 키워드만 모델에 입력
+        missing = registry.missing_finbert(unique_keywords)
+        try:
+            if missing:
+                registry.update_finbert(dict(zip(missing, classify_keywords(missing))))
+        finally:
+            registry.release_finbert(missing)
+        known = registry.finbert_for(unique_keywords)
+        # 다른 대상자의 분류가 실패해 결과가 없는 키워드는 직접 분류
+        retry = [kw for kw in unique_keywords if kw not in known]
+        if retry:
+            known.update(zip(retry, classify_keywords(retry)))
+        results = [known[kw] for kw in unique_keywords]
+    else:
+        results = classify_keywords(unique_keywords)
 
     def map_sentiment_label(result_label, text):
         positive_keywords = ['긍정적', '적극', '모범적', '솔선수범', '개선']
@@ -35,32 +55,86 @@ def analyze_sentiment_with_finbert(texts, llm, freq_df, categorized_df):
     
     return sentiment_df
 
-def refine_neutral_keywords_with_gpt(sentiment_df, llm):
-    neutral_keywords = sentiment_df[sentiment_df['sentiment'] == '중립']['keyword'].tolist()
-    keyword_sentiments = []
+refine_prompt = """
+다음 키워드들은 사용자 응답에서 추출된 핵심 키워드입니다.
+각 키워드가 담고 있는 감정을 긍정/부정/중립 중 하나로 판단해 주세요.
 
-    for keyword in neutral_keywords:
-        prompt = f"""
-        다음 키워드는 사용자 응답에서 추출된 핵심 키워드입니다.
-        이 키워드가 담고 있는 감정을 긍정/부정/중립 중 하나로 판단해 주세요.
+키워드 목록:
+{keywords}
 
-        키워드: "{keyword}"
+- 긍정이면 1, 부정이면 0, 중립이면 2로 표시해 주세요.
+- 불필요한 설명 없이 키워드를 키로 하는 JSON 객체만 응답해 주세요.
+- 출력 예시: {{"소통": 1, "부족": 0, "업무": 2}}
+"""
 
-        - 긍정이면 1, 부정이면 0, 중립이면 2만 출력해 주세요.
-        """
-        resp = llm.invoke([HumanMessage(content=prompt)])
-        try:
-            sentiment = int(resp.content.strip())
-            sentiment = {1: '긍정', 0: '부정', 2: '중립'}.get(sentiment, '중립')
-        except:
-            sentiment = '중립'
+refine_label_map = {1: '긍정', 0: '부정', 2: '중립'}
 
-        keyword_sentiments.append({
-            'keyword': keyword,
-            'sentiment': sentiment
-        })
+# 키워드 묶음을 한 번에 판단하고, 정상적으로 라벨이 붙은 키워드만 반환
+def refine_keyword_batch(keywords, llm):
+    prompt = refine_prompt.format(keywords=json.dumps(keywords, ensure_ascii=False))
+    resp = llm.invoke([HumanMessage(content=prompt)])
 
-    refined_df = pd.DataFrame(keyword_sentiments)
+    match = re.search(r"\{.*\}", resp.content, flags=re.DOTALL)
+    parsed = None
+    if match:
+        try:
+            parsed = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            parsed = None
+    if not isinstance(parsed, dict):
+        record_structured("refine", False, len(keywords), len(keywords))
+        return {}
+
+    labels = {}
+    for keyword in keywords:
+        try:
+            label = int(parsed.get(keyword))
+        except (TypeError, ValueError):
+            continue
+        if label in refine_label_map:
+            labels[keyword] = refine_label_map[label]
+    record_structured("refine", True, len(keywords), len(keywords) - len(labels))
+    return labels
+
+def refine_neutral_keywords_with_gpt(sentiment_df, llm, batch_size=40, max_workers=4, max_retries=2, registry=None):
+    neutral_keywords = sentiment_df[sentiment_df['sentiment'] == '중립']['keyword'].tolist()
+    labels = {}
+
+    pending = neutral_keywords
+    if registry is not None:
+        pending = registry.missing_refined(neutral_keywords)
+    reserved = pending
+
+    # 배치를 동시에 요청하고, 라벨이 누락되거나 잘못된 키워드만 다시 요청
+    try:
+        for _ in range(max_retries + 1):
+            if not pending:
+                break
+            batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+            with ContextThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(refine_keyword_batch, batch, llm) for batch in batches]
+                for future in as_completed(futures):
+                    try:
+                        labels.update(future.result())
+                    except Exception as e:
+                        logger.warning("중립 키워드 재분류 실패 (남은 재시도에서 다시 요청): %s", e)
+            pending = [kw for kw in pending if kw not in labels]
+    finally:
+        if registry is not None:
+            registry.update_refined(labels)
+            registry.release_refined(reserved)
+
+    if registry is not None:
+        # 이전/동시에 분석 중인 대상자가 판단한 키워드는 그 결과를 사용
+        labels.update(registry.refined_for([kw for kw in neutral_keywords if kw not in labels]))
+
+    # 끝까지 판단되지 않은 키워드는 중립으로 유지
+    keyword_sentiments = [
+        {'keyword': keyword, 'sentiment': labels.get(keyword, '중립')}
+        for keyword in neutral_keywords
+    ]
+
+    refined_df = pd.DataFrame(keyword_sentiments, columns=['keyword', 'sentiment'])
     return refined_df
 
 def merge_sentiment_results(original_df, refined_df):
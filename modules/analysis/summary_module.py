@@ -1,28 +1,119 @@
 # modules/analysis/summary_module.py
-import openai
-import streamlit as st
+import logging
+import os
 
-# GPT 요약 함수 
-def generate_summary_with_gpt(texts):
-    client = openai.OpenAI(api_key=st.secrets["openai_section"]["api_key"])
+from modules.analysis.token_budget import count_tokens, pack_texts_by_tokens
+from modules.llm_cache import get_default_cache, make_cache_key, render_prompt
+from modules.llm_client import chat_completion, chat_completion_stream
+from modules.metrics import ContextThreadPoolExecutor
 
-    prompt = f"""다음은 구성원에 대한 응답입니다. 자주 등장하는 키워드와 전반적인 분위기를 바탕으로  
-    💡1. 긍정적인 피드백  
-    🛠️2. 개선점  
-    👥3. 구성원에 대한 팀 내 인식  
-    을 요약해 주세요.  
-    응답 샘플 (최대 50개):
-    {texts[:50]}"""
+logger = logging.getLogger("hr_analytics")
+
+SUMMARY_MODEL = "gpt-4o-mini"
+# 요약 요청 1건에 담을 응답 토큰 수 (넘으면 나눠서 요약한 뒤 합침)
+SUMMARY_CHUNK_TOKENS = int(os.environ.get("HR_SUMMARY_CHUNK_TOKENS", "6000"))
+SUMMARY_SYSTEM_PROMPT = "너는 조직 심리 분석 전문가야."
+summary_prompt = """다음은 구성원에 대한 응답입니다. 자주 등장하는 키워드와 전반적인 분위기를 바탕으로
+    💡1. 긍정적인 피드백
+    🛠️2. 개선점
+    👥3. 구성원에 대한 팀 내 인식
+    을 요약해 주세요.
+    응답 목록:
+    {texts}"""
+
+# 응답이 많을 때: 응답 묶음별 부분 요약(map) → 부분 요약 종합(reduce)
+summary_map_prompt = """다음은 구성원에 대한 응답 중 일부입니다. 이후 다른 묶음의 요약과 합쳐질 예정이므로,
+    💡1. 긍정적인 피드백
+    🛠️2. 개선점
+    👥3. 구성원에 대한 팀 내 인식
+    항목별로 자주 언급된 내용과 구체적인 근거를 빠짐없이 간결하게 정리해 주세요.
+    응답 목록:
+    {texts}"""
+
+summary_reduce_prompt = """다음은 같은 구성원에 대한 응답을 여러 묶음으로 나누어 정리한 부분 요약입니다.
+    여러 묶음에서 반복되는 내용을 중심으로 종합하여
+    💡1. 긍정적인 피드백
+    🛠️2. 개선점
+    👥3. 구성원에 대한 팀 내 인식
+    을 요약해 주세요.
+    부분 요약:
+    {summaries}"""
+
+
+def _format_texts(texts):
+    return "\n".join(f"- {text}" for text in texts)
+
+def _messages(prompt):
+    return [
+        {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+# 동일한 입력의 요약은 캐시에서 재사용, on_token이 있으면 응답을 스트리밍으로 받음
+# (재시도로 응답을 처음부터 다시 받을 때는 on_reset 호출)
+def _summarize(messages, cache, on_token=None, on_reset=None):
+    cache_key = make_cache_key(SUMMARY_MODEL, 0, render_prompt(messages))
+    cached = cache.get(cache_key)
+    if cached is not None:
+        if on_token is not None:
+            on_token(cached)
+        return cached
+
+    if on_token is not None:
+        summary_text = chat_completion_stream(
+            messages, on_token, model=SUMMARY_MODEL, temperature=0, section_name="openai_section", on_reset=on_reset
+        )
+    else:
+        response = chat_completion(messages, model=SUMMARY_MODEL, temperature=0, section_name="openai_section")
+        summary_text = response.choices[0].message.content
+    cache.set(cache_key, summary_text, model=SUMMARY_MODEL, temperature=0)
+    return summary_text
+
+
+# 부분 요약 묶음을 동시에 요약 (실패한 묶음은 제외)
+def _map_summaries(batches, prompt, key, cache, max_workers):
+    def summarize(batch):
+        try:
+            return _summarize(_messages(prompt.format(**{key: _format_texts(batch)})), cache)
+        except Exception as e:
+            logger.warning("부분 요약 실패 (%d건, 최종 요약에서 제외): %s", len(batch), e)
+            return None
+
+    with ContextThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(summarize, batches))
+    return [summary for summary in results if summary]
+
+
+# GPT 요약 함수
+# 전체 응답이 max_chunk_tokens 이내면 한 번에 요약하고, 넘으면 토큰 예산에 맞춰 묶음별로 동시에 요약한 뒤 합침
+def generate_summary_with_gpt(texts, cache=None, max_chunk_tokens=None, max_workers=4, on_token=None, on_reset=None):
+    cache = cache or get_default_cache()
+    max_chunk_tokens = max_chunk_tokens or SUMMARY_CHUNK_TOKENS
+    texts = [str(text) for text in texts]
 
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "너는 조직 심리 분석 전문가야."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0
+        batches, _ = pack_texts_by_tokens(texts, max_input_tokens=max_chunk_tokens, max_items=max(len(texts), 1))
+        if len(batches) <= 1:
+            return _summarize(_messages(summary_prompt.format(texts=_format_texts(texts))), cache, on_token, on_reset)
+
+        # map: 응답 묶음별 부분 요약
+        summaries = _map_summaries(batches, summary_map_prompt, "texts", cache, max_workers)
+        if not summaries:
+            raise RuntimeError("모든 부분 요약에 실패했습니다.")
+
+        # 부분 요약이 한 번에 담기지 않으면 묶어서 다시 요약 (한 묶음이 될 때까지)
+        while len(summaries) > 1 and count_tokens(_format_texts(summaries)) > max_chunk_tokens:
+            groups, _ = pack_texts_by_tokens(summaries, max_input_tokens=max_chunk_tokens, max_items=len(summaries))
+            if len(groups) >= len(summaries):
+                break
+            reduced = _map_summaries(groups, summary_reduce_prompt, "summaries", cache, max_workers)
+            if not reduced:
+                break
+            summaries = reduced
+
+        # reduce: 최종 세 항목 요약
+        return _summarize(
+            _messages(summary_reduce_prompt.format(summaries=_format_texts(summaries))), cache, on_token, on_reset
         )
-        return response.choices[0].message.content
     except Exception as e:
-        return f"❌ GPT 요약 실패: {e}"
\ No newline at end of file
+        return f"❌ GPT 요약 실패: {e}"
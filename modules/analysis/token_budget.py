@@ -0,0 +1,75 @@
+# modules/analysis/token_budget.py
+import logging
+import math
+import os
+import threading
+
+# 키워드 추출 요청 1건에 담을 응답 토큰 수 / 응답 개수 상한
+DEFAULT_MAX_INPUT_TOKENS = int(os.environ.get("HR_EXTRACT_MAX_INPUT_TOKENS", "3000"))
+DEFAULT_MAX_ITEMS = int(os.environ.get("HR_EXTRACT_MAX_ITEMS", "40"))
+# 기존 고정 묶음 크기 (절감량 계산 기준)
+BASELINE_CHUNK_SIZE = 5
+
+logger = logging.getLogger("hr_analytics")
+
+_encodings = {}
+_encoding_lock = threading.Lock()
+
+
+# 1. 토큰 수 계산 (tiktoken 인코딩을 불러올 수 없으면 글자 수로 보수적으로 추정)
+def get_encoding(model="gpt-4o-mini"):
+    with _encoding_lock:
+        if model not in _encodings:
+            try:
+                import tiktoken
+                try:
+                    _encodings[model] = tiktoken.encoding_for_model(model)
+                except KeyError:
+                    _encodings[model] = tiktoken.get_encoding("o200k_base")
+            except Exception as e:
+                logger.warning("tiktoken 인코딩 로딩 실패, 글자 수로 토큰을 추정합니다: %s", e)
+                _encodings[model] = None
+        return _encodings[model]
+
+def count_tokens(text, model="gpt-4o-mini") -> int:
+    encoding = get_encoding(model)
+    if encoding is None:
+        return max(1, len(text))
+    return len(encoding.encode(text))
+
+
+# 2. 토큰 예산에 맞춰 응답 묶기
+# 순서를 유지하며 max_input_tokens를 넘지 않는 범위에서 최대 max_items개까지 담음
+# (예산보다 긴 응답 하나는 단독 요청으로 보냄)
+def pack_texts_by_tokens(texts, max_input_tokens=None, max_items=None, model="gpt-4o-mini"):
+    max_input_tokens = max_input_tokens or DEFAULT_MAX_INPUT_TOKENS
+    max_items = max_items or DEFAULT_MAX_ITEMS
+
+    batches, batch_tokens = [], []
+    current, current_tokens = [], 0
+    for text in texts:
+        tokens = count_tokens(str(text), model)
+        if current and (current_tokens + tokens > max_input_tokens or len(current) >= max_items):
+            batches.append(current)
+            batch_tokens.append(current_tokens)
+            current, current_tokens = [], 0
+        current.append(text)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+        batch_tokens.append(current_tokens)
+
+    baseline_requests = math.ceil(len(texts) / BASELINE_CHUNK_SIZE)
+    stats = {
+        "requests": len(batches),
+        "baseline_requests": baseline_requests,
+        "requests_saved": baseline_requests - len(batches),
+        "tokens_per_request": batch_tokens,
+        "avg_tokens_per_request": round(sum(batch_tokens) / len(batch_tokens), 1) if batch_tokens else 0.0,
+    }
+    return batches, stats
+
+
+# 3. 묶음 크기에 비례한 키워드 개수 범위 (기존: 응답 5개당 3~5개)
+def keyword_range(batch_size):
+    return max(3, round(batch_size * 0.6)), max(5, batch_size)
@@ -1,9 +1,10 @@
 # modules/analysis_pipeline.py
-import streamlit as st
+import threading
+
 import pandas as pd
-import time
 
 from modules.analysis.categorize import run_keyword_analysis
+from modules.analysis.dedup import dedupe_texts
 from modules.analysis.summary_module import generate_summary_with_gpt
 from modules.analysis.sentiment_module import (
     analyze_sentiment_with_finbert,
@@ -11,52 +12,103 @@ from modules.analysis.sentiment_module import (
     merge_sentiment_results,
     summarize_sentiment_by_category
 )
+from modules.metrics import record_dedup, stage
+from modules.progress import ensure_reporter
+from modules.stage_graph import StageGraph
 
 class AnalysisPipeline:
-    def __init__(self, llm, long_df):
+    # keyword_extractor: 로컬/hybrid 키워드 추출에 쓸 코호트 LocalKeywordExtractor (없으면 대상자 응답으로 계산)
+    def __init__(self, llm, long_df, registry=None, reporter=None, keyword_extractor=None):
         self.llm = llm
         self.long_df = long_df
+        self.registry = registry
+        self.keyword_extractor = keyword_extractor
+        self.reporter = ensure_reporter(reporter)
         self.results = {}
         self.texts = long_df['응답'].tolist()
+        self._lock = threading.Lock()
 
+    # 단계 의존 관계: 요약은 응답 텍스트만 필요하므로 키워드 → 감정 분석과 동시에 실행
+    #   keywords ──▶ sentiment
+    #   summary
     def run(self):
-        progress_bar = st.progress(0, text="분석 파이프라인 시작 중...")
-        
-        st.subheader("키워드 분석 중...")
-        progress_bar_1 = st.progress(0, text="키워드 추출 및 카테고리 분류 중...")
-        freq_df, categorized_df = run_keyword_analysis(self.texts, self.llm)
+        reporter = self.reporter
+        reporter.progress("pipeline", 0.0, text="분석 파이프라인 시작 중...")
+
+        graph = StageGraph()
+        graph.add("keywords", self._run_keywords)
+        graph.add("sentiment", self._run_sentiment, deps=("keywords",))
+        graph.add("summary", self._run_summary)
+        self._stage_count = 3
+        self._stages_done = 0
+        graph.run(reporter)
+
+        reporter.success("🎉 모든 분석이 완료되었습니다. 결과를 확인하세요.")
+        return True
+
+    def _stage_done(self, message, text):
+        with self._lock:
+            self._stages_done += 1
+            fraction = self._stages_done / self._stage_count
+        self.reporter.success(message)
+        self.reporter.progress("pipeline", fraction, text=text)
+
+    def _run_keywords(self, inputs):
+        reporter = self.reporter
+        reporter.stage("키워드 분석 중...")
+        # 같은/거의 같은 응답은 대표 1건만 추출하고, 빈도는 대신한 응답 수만큼 되돌림
+        with stage("dedup"):
+            texts, weights, dedup_stats = dedupe_texts(self.texts)
+        record_dedup(dedup_stats)
+        if dedup_stats["unique"] < dedup_stats["responses"]:
+            reporter.debug(
+                "중복 응답 정리:",
+                f"{dedup_stats['responses']}건 → {dedup_stats['unique']}건 (중복률 {dedup_stats['duplicate_rate']:.1%})"
+            )
+        freq_df, categorized_df = run_keyword_analysis(
+            texts, self.llm, registry=self.registry, reporter=reporter, weights=dict(zip(texts, weights)),
+            extractor=self.keyword_extractor
+        )
         self.results['freq_df'] = freq_df
         self.results['categorized_df'] = categorized_df
-        progress_bar_1.progress(100)
-        st.success("✔️ 키워드 분석 완료!")
-        progress_bar.progress(0.33, text="키워드 분석 완료!")
-        
-        st.subheader("감정 분석 중...")
-        with st.spinner("감정 분석 및 재분류 중..."):
+        self._stage_done("✔️ 키워드 분석 완료!", "키워드 분석 완료!")
+        return freq_df, categorized_df
+
+    def _run_sentiment(self, inputs):
+        reporter = self.reporter
+        freq_df, categorized_df = inputs["keywords"]
+        reporter.stage("감정 분석 중...")
+        with reporter.spinner("감정 분석 및 재분류 중..."):
             sentiment_df = analyze_sentiment_with_finbert(
                 self.texts, 
                 self.llm,
-                self.results['freq_df'],
-                self.results['categorized_df']
+                freq_df,
+                categorized_df,
+                registry=self.registry
             )
-            refined_df = refine_neutral_keywords_with_gpt(sentiment_df, self.llm)
+            with stage("gpt_refine"):
+                refined_df = refine_neutral_keywords_with_gpt(sentiment_df, self.llm, registry=self.registry)
             updated_df = merge_sentiment_results(sentiment_df, refined_df)
-            sentiment_summary = summarize_sentiment_by_category(self.results['freq_df'], updated_df)
+            sentiment_summary = summarize_sentiment_by_category(freq_df, updated_df)
             self.results['updated_df'] = updated_df
             self.results['sentiment_summary'] = sentiment_summary
-            st.success("✔️ 감정 분석 완료!")
-            progress_bar.progress(0.66, text="감정 분석 완료!")
+        self._stage_done("✔️ 감정 분석 완료!", "감정 분석 완료!")
+        return updated_df, sentiment_summary
 
-        st.subheader("GPT 요약 중...")
-        with st.spinner("GPT가 응답을 요약 중입니다..."):
-            summary_text = generate_summary_with_gpt(self.texts)
+    def _run_summary(self, inputs):
+        reporter = self.reporter
+        reporter.stage("GPT 요약 중...")
+        with reporter.spinner("GPT가 응답을 요약 중입니다..."):
+            # 화면에 바로 표시할 수 있는 리포터에는 요약을 스트리밍으로 전달 (재시도하면 받은 조각을 지우고 다시 표시)
+            on_token = (lambda token: reporter.stream("summary", token)) if reporter.wants_stream else None
+            with stage("summary"):
+                summary_text = generate_summary_with_gpt(
+                    self.texts, on_token=on_token, on_reset=lambda: reporter.clear("summary")
+                )
             self.results['summary_text'] = summary_text
-            st.success("✔️ 요약 완료!")
-            progress_bar.progress(1.0, text="요약 완료!")
-            time.sleep(1)
-
-        st.success("🎉 모든 분석이 완료되었습니다. 결과를 확인하세요.")
-        return True
+        reporter.clear("summary")
+        self._stage_done("✔️ 요약 완료!", "요약 완료!")
+        return summary_text
 
     def get_results(self):
-        return self.results
\ No newline at end of file
+        return self.results
@@ -0,0 +1,351 @@
+# modules/batch_runner.py
+# Streamlit 없이 분석 파이프라인을 실행하는 배치 실행기
+# 사용 예: python -m modules.batch_runner data.xlsx --id-col 대상자 --output-dir ./results
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime
+
+from modules.analysis.category_classifier import (
+    CATEGORY_MODES,
+    classifier_settings,
+    configure_category_classifier,
+    embedder_load_error,
+    get_embedder
+)
+from modules.analysis.dedup import DEDUP_MODES, configure_dedup, dedup_settings
+from modules.analysis.local_keywords import (
+    KEYWORD_MODES,
+    LocalKeywordExtractor,
+    configure_keyword_extractor,
+    extractor_settings
+)
+from modules.analysis_pipeline import AnalysisPipeline
+from modules.charts import ChartRenderer
+from modules.config import build_llm
+from modules.file_loader import ingest_file
+from modules.keyword_index import INDEX_VERSION, canon_settings, configure_canonicalization
+from modules.keyword_registry import KeywordRegistry
+from modules.llm_client import configure_rate_limits, set_max_inflight
+from modules.long_format_converter import LongFormatIndex
+from modules.metrics import RunMetrics, metrics_scope, stage
+from modules.progress import LoggingReporter, ensure_reporter
+from modules.question_detector import detect_question_columns
+from modules.result_store import ResultStore
+from modules.run_manifest import pipeline_fingerprint, plan_incremental, subject_content_hash
+from modules.subject_executor import SubjectExecutor
+
+
+# 작업 취소 요청으로 분석을 중단할 때 발생
+class AnalysisCancelled(Exception):
+    pass
+
+
+# 1. 질문 컬럼 결정 (데이터로 먼저 판별하고 애매한 컬럼만 GPT 확인, 탐지 실패 시 ID 컬럼을 제외한 전체 컬럼)
+def resolve_question_columns(df, id_col, use_llm=True, section_name="openai_section", reporter=None):
+    reporter = ensure_reporter(reporter)
+    question_cols = []
+    if use_llm:
+        reporter.info("AI가 질문 컬럼을 탐지하고 있습니다...")
+        question_cols = detect_question_columns(
+            df.columns.tolist(), section_name=section_name, reporter=reporter, df=df, id_column=id_col
+        )
+        if not question_cols:
+            reporter.warning("GPT가 질문 컬럼을 찾지 못했습니다. 전체 컬럼을 분석 대상으로 지정합니다.")
+    if not question_cols:
+        question_cols = [col for col in df.columns if col != id_col]
+    reporter.success(f"✔️ 분석 대상 컬럼: {question_cols}")
+    return question_cols
+
+
+# 2. 대상자별 결과 저장 (표 데이터는 결과 저장소에 모아 기록, 차트 PNG는 렌더러 작업자에게 맡김)
+# renderer가 None이면 차트는 결과를 처음 볼 때 생성 (charts.ensure_store_charts)
+def save_subject_results(results, store, subject, renderer=None, content_hash=None):
+    store.add_subject(subject, results, content_hash=content_hash)
+    if renderer is not None:
+        renderer.submit(
+            results['freq_df'], results['sentiment_summary'], str(subject),
+            save=lambda images: store.add_charts(subject, images)
+        )
+
+
+# 3. 대상자 1명 분석 (분석할 텍스트가 없으면 None)
+def analyze_subject(long_df, subject, llm, registry=None, reporter=None, keyword_extractor=None):
+    reporter = ensure_reporter(reporter)
+    reporter.info(f"✨ '{subject}'에 대한 분석을 시작합니다.")
+    reporter.table("📁 Long Format 변환 결과", long_df)
+
+    if long_df.empty:
+        reporter.warning(f"'{subject}'에 대한 분석할 텍스트가 없습니다. 다음 대상자로 넘어갑니다.")
+        return None
+
+    pipeline = AnalysisPipeline(llm, long_df, registry=registry, reporter=reporter, keyword_extractor=keyword_extractor)
+    if pipeline.run():
+        return pipeline.get_results()
+    return None
+
+
+# 4. 전체 실행: 대상자별 분석 후 analysis_dir/results.sqlite3 에 저장
+# max_workers명의 대상자를 동시에 분석하고, max_inflight로 동시 LLM 요청 수를 제한
+# export_folders=True이면 기존 폴더 구조(analysis_dir/<대상자>/*.csv, *.png)로도 내보냄
+# previous_dir를 지정하면 이전 실행과 입력이 같은 대상자는 결과를 복사하고 나머지만 분석
+# resume=True이면 analysis_dir에 이미 저장된 대상자(체크포인트)를 먼저 재사용하고, 나머지만 previous_dir와 비교
+# checkpoint_every명마다 결과를 저장소에 기록, should_stop()이 True가 되면 새 대상자 분석을 시작하지 않고 중단
+def run_analysis(df, id_col, question_cols, analysis_dir, llm, subjects=None, reporter=None, registry=None,
+                 max_workers=1, max_inflight=None, lazy_charts=False, chart_workers=2,
+                 export_folders=False, source=None, previous_dir=None, checkpoint_every=50, should_stop=None,
+                 resume=False):
+    # 단계별 소요 시간, LLM 요청/토큰/캐시 적중을 실행 전체와 대상자별로 집계 (analysis_dir/metrics.json)
+    metrics = RunMetrics()
+    with metrics_scope(metrics):
+        return _run_analysis(
+            df, id_col, question_cols, analysis_dir, llm, metrics, subjects=subjects, reporter=reporter,
+            registry=registry, max_workers=max_workers, max_inflight=max_inflight, lazy_charts=lazy_charts,
+            chart_workers=chart_workers, export_folders=export_folders, source=source, previous_dir=previous_dir,
+            checkpoint_every=checkpoint_every, should_stop=should_stop, resume=resume
+        )
+
+def _run_analysis(df, id_col, question_cols, analysis_dir, llm, metrics, subjects, reporter, registry,
+                  max_workers, max_inflight, lazy_charts, chart_workers, export_folders, source, previous_dir,
+                  checkpoint_every, should_stop, resume):
+    reporter = ensure_reporter(reporter)
+    registry = registry or KeywordRegistry()
+    if subjects is None:
+        subjects = df[id_col].dropna().unique().tolist()
+    if max_inflight is not None:
+        set_max_inflight(max_inflight)
+
+    # 전체 데이터를 한 번에 Long Format으로 변환한 뒤 대상자별로 나눠 사용
+    with reporter.spinner("Long Format 변환 중..."), stage("long_format"):
+        long_index = LongFormatIndex(df, id_col, question_cols)
+
+    # 로컬/hybrid 키워드 추출은 전체 대상자 응답으로 문서 빈도를 한 번 계산해 공유
+    keyword_extractor = None
+    if extractor_settings["mode"] != "llm":
+        with stage("local_keyword_index"):
+            keyword_extractor = LocalKeywordExtractor(long_index.long_df['응답'].tolist())
+
+    # 로컬 카테고리 분류를 선택했으면 임베딩 모델을 미리 불러오고, 실패하면 GPT 분류로 대체됨을 알림
+    if classifier_settings["mode"] != "llm":
+        with reporter.spinner("임베딩 모델 로딩 중..."), stage("embedding_load"):
+            embedder = get_embedder()
+        if embedder is None:
+            reporter.warning(f"⚠️ 임베딩 모델을 불러오지 못해 키워드 카테고리를 GPT로 분류합니다: {embedder_load_error()}")
+
+    # 대상자별 입력 해시로 이전 실행 결과를 재사용할 대상자 결정
+    with stage("incremental_plan"):
+        fingerprint = pipeline_fingerprint(llm)
+        content_hashes = {
+            subject: subject_content_hash(long_index.get(subject), fingerprint) for subject in subjects
+        }
+        resumed = []
+        if resume:
+            resumed, remaining, resume_reason = plan_incremental(analysis_dir, content_hashes, fingerprint)
+            if resume_reason and ResultStore.exists(analysis_dir):
+                reporter.warning(f"저장된 체크포인트를 재사용하지 않습니다: {resume_reason}")
+            pending_hashes = {subject: content_hashes[subject] for subject in remaining}
+        else:
+            pending_hashes = content_hashes
+        reused, to_analyze, reason = plan_incremental(previous_dir, pending_hashes, fingerprint)
+    if previous_dir and reason:
+        reporter.warning(f"이전 결과를 재사용하지 않고 남은 대상자를 모두 분석합니다: {reason}")
+
+    saved, skipped = [], []
+    renderer = None if lazy_charts else ChartRenderer(max_workers=chart_workers)
+    store = ResultStore(analysis_dir, flush_every=checkpoint_every)
+    store.update_manifest(
+        source=source,
+        id_col=id_col,
+        question_cols=list(question_cols),
+        subjects=[str(s) for s in subjects],
+        lazy_charts=lazy_charts,
+        fingerprint=fingerprint,
+        previous_run=previous_dir,
+        started_at=datetime.now().isoformat(timespec="seconds"),
+        status="running",
+    )
+    if resumed:
+        reporter.success(f"♻️ 이미 저장된 대상자 {len(resumed)}명은 이어서 실행하지 않습니다.")
+    if reused:
+        # 같은 폴더에 다시 실행하는 경우에는 결과가 이미 저장되어 있음
+        if os.path.abspath(previous_dir) != os.path.abspath(analysis_dir):
+            with stage("copy_previous"):
+                store.copy_subjects_from(previous_dir, reused)
+        reporter.success(
+            f"♻️ 입력이 바뀌지 않은 대상자 {len(reused)}명은 이전 결과를 재사용합니다. "
+            f"(분석 대상 {len(to_analyze)}명)"
+        )
+    reused = resumed + reused
+
+    def analyze(subject, subject_reporter):
+        if should_stop is not None and should_stop():
+            raise AnalysisCancelled("분석이 취소되었습니다.")
+        # 대상자 분석은 작업자 스레드에서 실행되므로 계측 범위를 여기서 지정
+        with metrics_scope(metrics, subject), stage("analyze_subject"):
+            return analyze_subject(
+                long_index.get(subject), subject, llm, registry=registry, reporter=subject_reporter,
+                keyword_extractor=keyword_extractor
+            )
+
+    def on_result(subject, results):
+        if results is None:
+            skipped.append(subject)
+            return
+        with metrics_scope(metrics, subject), stage("store_write"):
+            save_subject_results(results, store, subject, renderer=renderer, content_hash=content_hashes[subject])
+        reporter.success(f"✔️ '{subject}' 분석 및 저장 완료!")
+        saved.append(subject)
+
+    status = "failed"
+    try:
+        SubjectExecutor(max_workers=max_workers).run(to_analyze, analyze, on_result, reporter=reporter)
+        status = "completed"
+    except AnalysisCancelled:
+        status = "cancelled"
+        raise
+    finally:
+        chart_stats = {}
+        if renderer is not None:
+            with reporter.spinner("차트 이미지를 저장하는 중..."):
+                failures = renderer.shutdown()
+            for subject, error in failures:
+                reporter.warning(f"'{subject}' 차트 생성 실패: {error}")
+            chart_stats = renderer.stats()
+        with stage("store_write"):
+            store.flush()
+        store.update_manifest(
+            status=status,
+            saved=[str(s) for s in saved],
+            reused=[str(s) for s in reused],
+            skipped=[str(s) for s in skipped],
+            finished_at=datetime.now().isoformat(timespec="seconds"),
+        )
+        if export_folders and status == "completed":
+            with reporter.spinner("대상자별 폴더로 내보내는 중..."), stage("export_folders"):
+                store.export_folders(analysis_dir)
+        store.close()
+
+        metrics.extra.update({
+            "status": status,
+            "settings": {
+                "max_workers": max_workers,
+                "max_inflight": max_inflight,
+                "chart_workers": chart_workers,
+                "lazy_charts": lazy_charts,
+                "dedup": dict(dedup_settings),
+                "keyword_extractor": dict(extractor_settings),
+                "canonicalization": {**canon_settings, "index_version": INDEX_VERSION},
+                "category_classifier": dict(classifier_settings),
+            },
+            "counts": {"analyzed": len(saved), "reused": len(reused), "skipped": len(skipped)},
+            "registry": registry.stats(),
+            "charts": chart_stats,
+        })
+        try:
+            metrics.save(analysis_dir)
+        except OSError as e:
+            reporter.warning(f"실행 계측 결과 저장 실패: {e}")
+
+    return {
+        "analysis_dir": analysis_dir,
+        "store_path": store.path,
+        "saved": saved,
+        "reused": reused,
+        "skipped": skipped,
+        "registry_stats": registry.stats(),
+        "chart_stats": chart_stats,
+        "metrics": metrics.to_dict(),
+    }
+
+
+# 5. CLI 진입점
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="HR 응답 분석 파이프라인 배치 실행")
+    parser.add_argument("workbook", help="분석할 엑셀/CSV/Parquet 파일 경로")
+    parser.add_argument("--id-col", required=True, help="대상자를 구분하는 ID 컬럼명")
+    parser.add_argument("--output-dir", help="결과 저장 폴더 (기본: ./<파일명>_<실행시각>)")
+    parser.add_argument("--questions", nargs="+", help="분석할 질문 컬럼 (미지정 시 GPT 탐지)")
+    parser.add_argument("--no-llm-detect", action="store_true", help="GPT 질문 컬럼 탐지 없이 ID 외 전체 컬럼 분석")
+    parser.add_argument("--subjects", nargs="+", help="특정 대상자만 분석")
+    parser.add_argument("--workers", type=int, default=4, help="동시에 분석할 대상자 수")
+    parser.add_argument("--max-inflight", type=int, default=8, help="동시에 보낼 수 있는 최대 LLM 요청 수 (0: 제한 없음)")
+    parser.add_argument("--lazy-charts", action="store_true", help="차트 PNG를 저장하지 않고 결과를 처음 볼 때 생성")
+    parser.add_argument("--chart-workers", type=int, default=2, help="차트 렌더링 작업자 스레드 수")
+    parser.add_argument("--export-folders", action="store_true", help="결과를 대상자별 폴더(CSV/PNG)로도 내보내기")
+    parser.add_argument("--previous-run", help="이전 실행 결과 폴더 (입력이 같은 대상자는 결과를 재사용)")
+    parser.add_argument("--keyword-extractor", choices=KEYWORD_MODES,
+                        help="키워드 추출 방식 (llm: GPT, local: 로컬 TF-IDF, hybrid: 로컬 신뢰도가 낮은 응답만 GPT)")
+    parser.add_argument("--local-min-confidence", type=float, help="hybrid 방식에서 로컬 결과를 쓸 최소 신뢰도 (0~1)")
+    parser.add_argument("--no-canonicalize", action="store_true",
+                        help="표현만 다른 키워드('소통', '소통 능력')를 대표 키워드로 묶지 않음")
+    parser.add_argument("--category-classifier", choices=CATEGORY_MODES,
+                        help="카테고리 분류 방식 (llm: GPT, hybrid: 로컬 신뢰도가 낮은 키워드만 GPT, local: 로컬 임베딩 분류)")
+    parser.add_argument("--category-min-confidence", type=float, help="hybrid 방식에서 로컬 분류 결과를 쓸 최소 신뢰도 (0~1)")
+    parser.add_argument("--dedup", choices=DEDUP_MODES, help="키워드 추출 전 중복 응답 정리 방식 (기본: exact)")
+    parser.add_argument("--near-dup-threshold", type=float, help="near 방식에서 같은 응답으로 볼 최소 유사도 (0~1)")
+    parser.add_argument("--rpm", type=int, help="분당 최대 OpenAI 요청 수")
+    parser.add_argument("--tpm", type=int, help="분당 최대 OpenAI 토큰 수")
+    parser.add_argument("--section", default="openai_section", help="secrets.toml의 OpenAI 섹션 이름")
+    parser.add_argument("-v", "--verbose", action="store_true", help="디버그 로그 출력")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s"
+    )
+    reporter = LoggingReporter()
+
+    # 질문 컬럼이 지정된 경우 필요한 컬럼만 읽음
+    columns = [args.id_col] + args.questions if args.questions else None
+    df, _ = ingest_file(args.workbook, columns=columns)
+    if args.id_col not in df.columns:
+        reporter.error(f"ID 컬럼 '{args.id_col}'을(를) 찾을 수 없습니다.")
+        return 2
+
+    if args.questions:
+        question_cols = args.questions
+    else:
+        question_cols = resolve_question_columns(
+            df, args.id_col, use_llm=not args.no_llm_detect, section_name=args.section, reporter=reporter
+        )
+
+    subjects = None
+    if args.subjects:
+        # CLI 인자는 문자열이므로 ID 컬럼 값과 문자열 기준으로 매칭
+        wanted = set(args.subjects)
+        subjects = [s for s in df[args.id_col].dropna().unique().tolist() if str(s) in wanted]
+
+    analysis_dir = args.output_dir
+    if not analysis_dir:
+        now = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_name_prefix = os.path.basename(args.workbook).split('.')[0]
+        analysis_dir = f"./{file_name_prefix}_{now}"
+
+    configure_rate_limits(rpm=args.rpm, tpm=args.tpm)
+    configure_dedup(mode=args.dedup, threshold=args.near_dup_threshold)
+    configure_keyword_extractor(mode=args.keyword_extractor, min_confidence=args.local_min_confidence)
+    if args.no_canonicalize:
+        configure_canonicalization(enabled=False)
+    configure_category_classifier(mode=args.category_classifier, min_confidence=args.category_min_confidence)
+    llm = build_llm(section_name=args.section)
+    summary = run_analysis(
+        df, args.id_col, question_cols, analysis_dir, llm, subjects=subjects, reporter=reporter,
+        max_workers=args.workers, max_inflight=args.max_inflight, lazy_charts=args.lazy_charts,
+        chart_workers=args.chart_workers, export_folders=args.export_folders,
+        source=os.path.basename(args.workbook), previous_dir=args.previous_run
+    )
+
+    stats = summary["registry_stats"]
+    reporter.success(
+        f"✔️ 완료: 분석 {len(summary['saved'])}명, 재사용 {len(summary['reused'])}명, "
+        f"건너뜀 {len(summary['skipped'])}명 → {analysis_dir} "
+        f"(키워드 재사용률 {stats['reuse_ratio']:.1%})"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
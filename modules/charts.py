@@ -0,0 +1,251 @@
+# modules/charts.py
+import asyncio
+import io
+import logging
+import os
+import threading
+import time
+
+import matplotlib
+import pandas as pd
+import plotly.express as px
+import plotly.io as pio
+import seaborn as sns
+from matplotlib.figure import Figure
+from matplotlib.ticker import MaxNLocator
+
+from modules.analysis.categorize import generate_wordcloud_from_freq
+from modules.analysis.sentiment_module import summarize_sentiment_by_category
+from modules.metrics import ContextThreadPoolExecutor, stage
+from modules.result_store import CHART_FILES
+
+logger = logging.getLogger("hr_analytics")
+
+# 폰트 설정
+matplotlib.rcParams['font.family'] = 'AppleGothic'
+matplotlib.rcParams['axes.unicode_minus'] = False
+
+sentiment_colors = {'긍정': '#63b2ee', '부정': '#ff9999', '중립': '#ffcc66'}
+
+
+# 1. 차트 생성
+# pyplot 대신 Figure 객체를 직접 만들어 전역 상태 없이 여러 스레드에서 그릴 수 있게 함
+def build_wordcloud_figure(freq_df):
+    wc = generate_wordcloud_from_freq(freq_df)
+    if not wc:
+        return None
+    fig_wc = Figure()
+    ax_wc = fig_wc.subplots()
+    ax_wc.imshow(wc, interpolation='bilinear')
+    ax_wc.axis('off')
+    return fig_wc
+
+# 상위 20개 키워드 막대그래프
+def build_bar_figure(freq_df):
+    fig_bar = Figure()
+    ax_bar = fig_bar.subplots()
+    freq_df = freq_df.copy()
+    freq_df["count"] = freq_df["count"].astype(int)
+    freq_plot_df = freq_df.sort_values(by="count", ascending=False).head(20)
+    sns.barplot(data=freq_plot_df, y='keyword', x='count', hue='category', dodge=False, ax=ax_bar)
+    ax_bar.xaxis.set_major_locator(MaxNLocator(integer=True))
+    ax_bar.set_ylabel("키워드")
+    ax_bar.set_xlabel("count")
+    return fig_bar
+
+# 전체 감정 분포 파이 차트
+def build_pie_figure(sentiment_summary):
+    overall_sentiment = sentiment_summary.groupby('sentiment')['percentage'].sum().reset_index()
+    return px.pie(
+        overall_sentiment,
+        names='sentiment',
+        values='percentage',
+        title='전체 감정 분포 (모든 키워드 기준)',
+        color='sentiment',
+        color_discrete_map=sentiment_colors
+    )
+
+
+# 2. PNG 변환
+def _figure_to_png(fig):
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format="png")
+    finally:
+        # 렌더링이 끝난 Figure는 바로 정리해 대상자 수만큼 메모리가 쌓이지 않게 함
+        fig.clear()
+    return buffer.getvalue()
+
+# kaleido(plotly PNG 변환)는 호출마다 헤드리스 브라우저를 새로 띄우므로,
+# 브라우저를 한 번만 띄워 전용 이벤트 루프 스레드에서 재사용
+class KaleidoSession:
+    def __init__(self):
+        self._loop = None
+        self._kaleido = None
+        self._failed = False
+        self._lock = threading.Lock()
+
+    def _open(self):
+        import kaleido
+
+        loop = asyncio.new_event_loop()
+        threading.Thread(target=loop.run_forever, name="kaleido", daemon=True).start()
+
+        async def open_kaleido():
+            k = kaleido.Kaleido(n=1)
+            await k.open()
+            return k
+
+        self._kaleido = asyncio.run_coroutine_threadsafe(open_kaleido(), loop).result(timeout=60)
+        self._loop = loop
+
+    def to_png(self, fig):
+        with self._lock:
+            if self._kaleido is None and not self._failed:
+                try:
+                    self._open()
+                except Exception as e:
+                    logger.warning("kaleido 브라우저 재사용 불가, 호출마다 새로 실행합니다: %s", e)
+                    self._failed = True
+        if self._failed:
+            return fig.to_image(format="png")
+
+        defaults = pio.defaults
+        opts = dict(
+            format="png",
+            width=defaults.default_width,
+            height=defaults.default_height,
+            scale=defaults.default_scale,
+        )
+        future = asyncio.run_coroutine_threadsafe(self._kaleido.calc_fig(fig.to_dict(), opts=opts), self._loop)
+        return future.result(timeout=120)
+
+
+kaleido_session = KaleidoSession()
+
+def _plotly_to_png(fig):
+    return kaleido_session.to_png(fig)
+
+def _wordcloud_to_png(freq_df):
+    fig = build_wordcloud_figure(freq_df)
+    return _figure_to_png(fig) if fig is not None else None
+
+
+# 3. 차트 렌더링 엔진
+# 차트 작업을 작업자 스레드에서 처리하고, 차트 종류별 소요 시간을 기록
+class ChartRenderer:
+    def __init__(self, max_workers=2):
+        self.max_workers = max_workers
+        self._executor = None
+        self._futures = []
+        self._lock = threading.Lock()
+        self.timings = {name: [] for name in CHART_FILES}
+
+    def _timed(self, name, fn):
+        start = time.perf_counter()
+        try:
+            with stage(f"chart_{name}"):
+                return fn()
+        finally:
+            with self._lock:
+                self.timings[name].append(time.perf_counter() - start)
+
+    # 차트별 PNG 바이트 (생성할 수 없는 차트는 제외)
+    def render(self, freq_df, sentiment_summary) -> dict:
+        images = {}
+        wordcloud_png = self._timed("wordcloud", lambda: _wordcloud_to_png(freq_df))
+        if wordcloud_png is not None:
+            images["wordcloud"] = wordcloud_png
+        images["barchart"] = self._timed("barchart", lambda: _figure_to_png(build_bar_figure(freq_df)))
+        images["piechart"] = self._timed("piechart", lambda: _plotly_to_png(build_pie_figure(sentiment_summary)))
+        return images
+
+    def render_to_dir(self, freq_df, sentiment_summary, participant_dir) -> list:
+        os.makedirs(participant_dir, exist_ok=True)
+        images = self.render(freq_df, sentiment_summary)
+        for name, png in images.items():
+            with open(os.path.join(participant_dir, CHART_FILES[name]), "wb") as f:
+                f.write(png)
+        return sorted(images)
+
+    def _render_job(self, freq_df, sentiment_summary, target, save):
+        if save is None:
+            return self.render_to_dir(freq_df, sentiment_summary, target)
+        images = self.render(freq_df, sentiment_summary)
+        with stage("chart_save"):
+            save(images)
+        return sorted(images)
+
+    # 작업자 스레드에 렌더링을 맡기고 바로 반환
+    # save를 지정하면 PNG 바이트를 save(images)로 넘기고, 없으면 target 폴더에 파일로 저장
+    def submit(self, freq_df, sentiment_summary, target, save=None):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ContextThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="chart")
+            future = self._executor.submit(self._render_job, freq_df, sentiment_summary, target, save)
+            self._futures.append((target, future))
+        return future
+
+    # 제출한 작업이 모두 끝날 때까지 대기, 실패한 작업(target)과 오류 목록 반환
+    def wait(self):
+        with self._lock:
+            futures, self._futures = self._futures, []
+        failures = []
+        for participant_dir, future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                failures.append((participant_dir, e))
+        return failures
+
+    def shutdown(self):
+        failures = self.wait()
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+        return failures
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                name: {
+                    "count": len(values),
+                    "total_seconds": round(sum(values), 3),
+                    "avg_seconds": round(sum(values) / len(values), 3) if values else 0.0,
+                }
+                for name, values in self.timings.items()
+            }
+
+
+# 4. 지연 렌더링: 차트 없이 저장된 결과 폴더를 처음 열 때 CSV로부터 차트 생성
+def ensure_charts(participant_dir, renderer=None):
+    freq_path = os.path.join(participant_dir, "keyword_freq.csv")
+    sentiment_path = os.path.join(participant_dir, "sentiment.csv")
+    missing = [name for name, file in CHART_FILES.items() if not os.path.exists(os.path.join(participant_dir, file))]
+    # 워드클라우드는 생성 실패로 없을 수도 있으므로 막대/파이 차트 기준으로 판단
+    if not {"barchart", "piechart"} & set(missing):
+        return []
+    if not (os.path.exists(freq_path) and os.path.exists(sentiment_path)):
+        return []
+
+    freq_df = pd.read_csv(freq_path)
+    sentiment_summary = summarize_sentiment_by_category(freq_df, pd.read_csv(sentiment_path))
+    renderer = renderer or ChartRenderer()
+    return renderer.render_to_dir(freq_df, sentiment_summary, participant_dir)
+
+# 결과 저장소(ResultStore)에 차트 없이 저장된 대상자의 차트를 생성해 저장, 저장된 차트 이름 목록 반환
+def ensure_store_charts(store, subject, renderer=None):
+    names = store.chart_names(subject)
+    if {"barchart", "piechart"} <= set(names):
+        return names
+    freq_df = store.load("keyword_freq", subject).drop(columns="subject")
+    if freq_df.empty:
+        return names
+    sentiment_df = store.load("sentiment", subject).drop(columns="subject")
+    sentiment_summary = summarize_sentiment_by_category(freq_df, sentiment_df)
+    renderer = renderer or ChartRenderer()
+    images = renderer.render(freq_df, sentiment_summary)
+    store.add_charts(subject, images)
+    store.flush()
+    return sorted(set(names) | set(images))
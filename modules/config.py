@@ -0,0 +1,44 @@
+# modules/config.py
+import os
+
+from modules.llm_cache import CachedLLM, get_default_cache
+from modules.llm_client import ManagedLLM, get_http_client
+
+DEFAULT_MODEL = "gpt-4o-mini"
+
+
+# OpenAI API 키 조회
+# Streamlit 실행 중에는 .streamlit/secrets.toml, 그 외(CLI/배치)에는 OPENAI_API_KEY 환경변수 사용
+def get_api_key(section_name: str = "openai_section") -> str:
+    try:
+        import streamlit as st
+        return st.secrets[section_name]["api_key"]
+    except Exception:
+        pass
+
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if api_key:
+        return api_key
+    raise KeyError(
+        f"OpenAI API 키를 찾을 수 없습니다. secrets.toml의 [{section_name}] 섹션 또는 OPENAI_API_KEY 환경변수를 설정하세요."
+    )
+
+
+# 분석 파이프라인에서 사용하는 GPT 모델 생성
+# 캐시 → 요청 관리(동시 요청 제한, 분당 한도, 재시도) → ChatOpenAI 순서로 감싸
+# 캐시 적중 시에는 요청 슬롯과 한도를 쓰지 않음
+def build_llm(section_name: str = "openai_section", model: str = DEFAULT_MODEL, temperature: float = 0, cache=None):
+    from langchain_openai import ChatOpenAI
+
+    return CachedLLM(
+        ManagedLLM(
+            ChatOpenAI(
+                model=model,
+                temperature=temperature,
+                openai_api_key=get_api_key(section_name),
+                http_client=get_http_client(),
+                max_retries=0
+            )
+        ),
+        cache or get_default_cache()
+    )
@@ -1,10 +1,87 @@
 # modules/file_loader.py
+import hashlib
+import io
+import logging
+import os
+
 import pandas as pd
 
-def load_file(file) -> pd.DataFrame:
-    if file.name.endswith('.csv'):
-        return pd.read_csv(file)
-    elif file.name.endswith(('.xls', '.xlsx')):
-        return pd.read_excel(file)
+logger = logging.getLogger("hr_analytics")
+
+# 업로드 파일을 파싱한 결과(Parquet)를 저장하는 위치
+INGEST_CACHE_DIR = os.environ.get("HR_INGEST_CACHE_DIR", os.path.join(".cache", "uploads"))
+
+
+def _file_name(file) -> str:
+    return str(getattr(file, 'name', file))
+
+# python-calamine이 설치되어 있으면 더 빠른 엑셀 엔진 사용 (없으면 pandas 기본값 openpyxl)
+def _excel_engine():
+    try:
+        import python_calamine  # noqa: F401
+        return "calamine"
+    except ImportError:
+        return None
+
+def load_file(file, columns=None, sheet_name=0) -> pd.DataFrame:
+    # 업로드 파일 객체와 파일 경로 모두 지원
+    name = _file_name(file).lower()
+    if name.endswith('.parquet'):
+        return pd.read_parquet(file, columns=columns, memory_map=not hasattr(file, 'read'))
+    elif name.endswith('.csv'):
+        return pd.read_csv(file, usecols=columns)
+    elif name.endswith(('.xls', '.xlsx')):
+        return pd.read_excel(file, sheet_name=sheet_name, usecols=columns, engine=_excel_engine())
     else:
-        raise ValueError("Unsupported file type: must be CSV or Excel")
\ No newline at end of file
+        raise ValueError("Unsupported file type: must be CSV, Excel or Parquet")
+
+
+# Parquet로 저장할 수 있도록 컬럼명은 문자열로, 타입이 섞인 컬럼은 값만 문자열로 통일
+def _to_parquet_compatible(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df.columns = [str(col) for col in df.columns]
+    for col in df.columns[df.dtypes == object]:
+        values = df[col].dropna()
+        if values.map(type).nunique() > 1:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+def file_digest(data: bytes, sheet_name=0) -> str:
+    digest = hashlib.sha256(data)
+    digest.update(str(sheet_name).encode("utf-8"))
+    return digest.hexdigest()
+
+
+# 업로드 파일을 해시 기준으로 한 번만 파싱하고, 이후에는 Parquet 캐시에서 메모리 매핑으로 읽음
+# 반환값: (DataFrame, 캐시 Parquet 경로 또는 None)
+def ingest_file(file, columns=None, sheet_name=0, cache_dir=None):
+    name = _file_name(file)
+    if name.lower().endswith('.parquet'):
+        return load_file(file, columns=columns), (None if hasattr(file, 'read') else name)
+
+    if hasattr(file, 'getvalue'):
+        data = file.getvalue()
+    elif hasattr(file, 'read'):
+        data = file.read()
+    else:
+        with open(file, 'rb') as f:
+            data = f.read()
+
+    cache_dir = cache_dir or INGEST_CACHE_DIR
+    parquet_path = os.path.join(cache_dir, f"{file_digest(data, sheet_name)}.parquet")
+    if os.path.exists(parquet_path):
+        return pd.read_parquet(parquet_path, columns=columns, memory_map=True), parquet_path
+
+    buffer = io.BytesIO(data)
+    buffer.name = name
+    df = _to_parquet_compatible(load_file(buffer, sheet_name=sheet_name))
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # 동시에 같은 파일을 올려도 깨진 파일이 남지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = f"{parquet_path}.{os.getpid()}.tmp"
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, parquet_path)
+    except Exception as e:
+        logger.warning("업로드 파일 캐시 저장 실패 (캐시 없이 계속 진행): %s", e)
+        return (df[columns] if columns else df), None
+    return (df[columns] if columns else df), parquet_path
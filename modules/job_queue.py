@@ -0,0 +1,401 @@
+# modules/job_queue.py
+# 분석 작업을 백그라운드에서 실행하는 로컬 작업 큐
+# - 작업 목록/상태/로그는 SQLite(.cache/jobs/jobs.sqlite3)에 저장 → 브라우저 연결이 끊겨도 계속 실행
+# - 작업자 스레드가 대기 중인 작업을 하나씩 가져와 실행 (여러 프로세스가 같은 큐를 함께 사용 가능)
+# - 대상자 1명이 끝날 때마다 결과 저장소에 기록(체크포인트)하고, 실패/취소된 작업은 이어서 실행 가능
+# - 작성 중인 GPT 요약은 작업 행(partial)에 주기적으로 기록해 작업 목록에서 미리 볼 수 있음
+# 사용 예 (Streamlit 없이 작업자만 실행): python -m modules.job_queue --workers 2
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from modules.progress import ProgressReporter
+
+JOB_DIR = os.environ.get("HR_JOB_DIR", os.path.join(".cache", "jobs"))
+JOB_STATUSES = ("queued", "running", "cancelling", "completed", "failed", "cancelled")
+# 실행 중인 작업은 주기적으로 heartbeat를 남기고, 오래 갱신되지 않으면(프로세스 종료 등) 다시 대기열로 돌림
+HEARTBEAT_INTERVAL = 10
+STALE_AFTER = 60
+MAX_LOG_MESSAGES = 200
+# 스트리밍 요약을 작업 행에 기록하는 최소 간격(초)
+PARTIAL_INTERVAL = 1.0
+JOB_COLUMNS = (
+    "id", "status", "params", "progress", "message", "result", "error", "attempts",
+    "created_at", "started_at", "finished_at", "heartbeat_at", "partial"
+)
+
+
+# 1. 작업 진행 상황을 큐에 기록하는 리포터
+class JobReporter(ProgressReporter):
+    wants_stream = True
+
+    def __init__(self, queue, job_id):
+        self.queue = queue
+        self.job_id = job_id
+        # key → 지금까지 받은 스트리밍 텍스트 (대상자별 요약 등, 끝나면 clear로 제거)
+        self._streams = {}
+        self._stream_lock = threading.Lock()
+        self._written_at = 0.0
+
+    def progress(self, key, fraction, text=""):
+        # 전체 대상자 진행률만 작업 진행률로 기록
+        if key == "run":
+            self.queue.update(self.job_id, progress=round(fraction, 4), message=text)
+
+    def stage(self, title):
+        self.queue.log(self.job_id, "info", title)
+
+    def info(self, message):
+        self.queue.log(self.job_id, "info", message)
+
+    def success(self, message):
+        self.queue.log(self.job_id, "success", message)
+
+    def warning(self, message):
+        self.queue.log(self.job_id, "warning", message)
+
+    def error(self, message):
+        self.queue.log(self.job_id, "error", message)
+
+    def _write_partial(self, force=False):
+        now = time.time()
+        if not force and now - self._written_at < PARTIAL_INTERVAL:
+            return
+        self._written_at = now
+        partial = json.dumps(self._streams, ensure_ascii=False) if self._streams else None
+        self.queue.update(self.job_id, partial=partial)
+
+    def stream(self, key, token):
+        with self._stream_lock:
+            self._streams[key] = self._streams.get(key, "") + token
+            self._write_partial()
+
+    def clear(self, key):
+        with self._stream_lock:
+            if self._streams.pop(key, None) is not None:
+                self._write_partial(force=True)
+
+
+# 2. 작업 등록 시점의 분석 설정
+# 설정 페이지/CLI에서 바꾼 모듈 설정(중복 정리, 키워드 추출, 표준화, 카테고리 분류, FinBERT, 요청 한도)을 작업 파라미터에 저장해
+# 별도 작업자 프로세스에서 실행하거나 재시작 후 이어서 실행해도 등록할 때 고른 설정으로 분석 (등록 후 바꾼 설정은 반영 안 함)
+def snapshot_settings() -> dict:
+    from modules.analysis.category_classifier import classifier_settings
+    from modules.analysis.dedup import dedup_settings
+    from modules.analysis.finbert_backend import finbert_settings
+    from modules.analysis.local_keywords import extractor_settings
+    from modules.keyword_index import canon_settings
+    from modules.llm_client import rate_limiter
+
+    return {
+        "dedup": {key: dedup_settings[key] for key in ("mode", "threshold")},
+        "keyword_extractor": {key: extractor_settings[key] for key in ("mode", "min_confidence")},
+        "canonicalization": {key: canon_settings[key] for key in ("enabled", "threshold")},
+        "category_classifier": {key: classifier_settings[key] for key in ("mode", "min_confidence", "model")},
+        "finbert": {key: finbert_settings[key] for key in ("backend", "num_threads", "batch_size")},
+        "rate_limits": {"rpm": rate_limiter.requests.capacity, "tpm": rate_limiter.tokens.capacity},
+    }
+
+def apply_settings(settings):
+    from modules.analysis.category_classifier import configure_category_classifier
+    from modules.analysis.dedup import configure_dedup
+    from modules.analysis.finbert_backend import configure_finbert
+    from modules.analysis.local_keywords import configure_keyword_extractor
+    from modules.keyword_index import configure_canonicalization
+    from modules.llm_client import configure_rate_limits
+
+    configure_dedup(**settings.get("dedup", {}))
+    configure_keyword_extractor(**settings.get("keyword_extractor", {}))
+    configure_canonicalization(**settings.get("canonicalization", {}))
+    configure_category_classifier(**settings.get("category_classifier", {}))
+    configure_finbert(**settings.get("finbert", {}))
+    configure_rate_limits(**settings.get("rate_limits", {}))
+
+# 설정은 프로세스 전체에서 공유하므로, 같은 프로세스에서는 설정이 같은 작업만 동시에 실행
+_settings_condition = threading.Condition()
+_active_settings = {"settings": None, "jobs": 0}
+
+@contextmanager
+def job_settings(settings):
+    with _settings_condition:
+        _settings_condition.wait_for(
+            lambda: _active_settings["jobs"] == 0 or _active_settings["settings"] == settings
+        )
+        if _active_settings["jobs"] == 0:
+            apply_settings(settings)
+            _active_settings["settings"] = settings
+        _active_settings["jobs"] += 1
+    try:
+        yield
+    finally:
+        with _settings_condition:
+            _active_settings["jobs"] -= 1
+            _settings_condition.notify_all()
+
+
+# 3. 작업 실행 함수: 파라미터(JSON)로 분석 실행
+# 결과 폴더에 이미 저장된 대상자는 입력이 같으면 재사용하므로, 다시 실행하면 마지막 완료 대상자 다음부터 진행
+# (저장되지 않은 대상자는 등록할 때 고른 이전 실행(previous_dir)과 비교해 재사용)
+def run_analysis_job(params, reporter, should_stop):
+    from modules.batch_runner import resolve_question_columns, run_analysis
+    from modules.config import build_llm
+    from modules.file_loader import ingest_file
+
+    df, _ = ingest_file(params["input_path"])
+    id_col = params["id_col"]
+    section_name = params.get("section_name", "openai_section")
+    question_cols = params.get("question_cols") or resolve_question_columns(
+        df, id_col, use_llm=params.get("use_llm", True), section_name=section_name, reporter=reporter
+    )
+
+    analysis_dir = params["analysis_dir"]
+    # 등록할 때 저장한 설정을 적용한 뒤 실행 (이어서 실행해도 체크포인트와 같은 설정 지문)
+    with job_settings(params.get("settings") or {}):
+        summary = run_analysis(
+            df, id_col, question_cols, analysis_dir, build_llm(section_name=section_name),
+            subjects=params.get("subjects"), reporter=reporter,
+            max_workers=params.get("max_workers", 4), max_inflight=params.get("max_inflight"),
+            lazy_charts=params.get("lazy_charts", False), export_folders=params.get("export_folders", False),
+            source=params.get("source"), previous_dir=params.get("previous_dir"), checkpoint_every=1,
+            should_stop=should_stop, resume=True
+        )
+    return {
+        "analysis_dir": analysis_dir,
+        "saved": len(summary["saved"]),
+        "reused": len(summary["reused"]),
+        "skipped": len(summary["skipped"]),
+        "registry_stats": summary["registry_stats"],
+    }
+
+
+# 4. 작업 큐
+class JobQueue:
+    def __init__(self, job_dir=None, runner=run_analysis_job, poll_interval=1.0):
+        self.job_dir = job_dir or JOB_DIR
+        self.runner = runner
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+
+        os.makedirs(self.job_dir, exist_ok=True)
+        self.path = os.path.join(self.job_dir, "jobs.sqlite3")
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30, isolation_level=None)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    progress REAL NOT NULL DEFAULT 0,
+                    message TEXT,
+                    result TEXT,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    heartbeat_at REAL,
+                    partial TEXT
+                )
+            """)
+            # 이전 버전에서 만든 작업 큐에는 partial 컬럼 추가
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            if "partial" not in columns:
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN partial TEXT")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS job_logs (
+                    job_id TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    level TEXT NOT NULL,
+                    message TEXT NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_job_logs_job ON job_logs (job_id, created_at)")
+
+    def _execute(self, query, params=()):
+        with self._lock:
+            return self._conn.execute(query, params)
+
+    @staticmethod
+    def _row_to_job(row):
+        job = dict(zip(JOB_COLUMNS, row))
+        job["params"] = json.loads(job["params"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        job["partial"] = json.loads(job["partial"]) if job["partial"] else {}
+        return job
+
+    # 4-1. 작업 등록 / 조회
+    # df를 넘기면 작업 입력으로 Parquet 파일에 저장 (input_path가 없을 때)
+    # 현재 분석 설정을 함께 저장 (settings를 직접 넘기면 그 값을 사용)
+    def submit(self, params, df=None) -> str:
+        job_id = uuid.uuid4().hex[:12]
+        params = dict(params)
+        params.setdefault("settings", snapshot_settings())
+        if not params.get("input_path"):
+            if df is None:
+                raise ValueError("작업 입력(input_path 또는 df)이 필요합니다.")
+            input_dir = os.path.join(self.job_dir, "inputs")
+            os.makedirs(input_dir, exist_ok=True)
+            params["input_path"] = os.path.join(input_dir, f"{job_id}.parquet")
+            df.to_parquet(params["input_path"], index=False)
+        self._execute(
+            "INSERT INTO jobs (id, status, params, created_at) VALUES (?, 'queued', ?, ?)",
+            (job_id, json.dumps(params, ensure_ascii=False, default=str), time.time())
+        )
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id):
+        row = self._execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def list(self, limit=20) -> list:
+        rows = self._execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def status(self, job_id):
+        row = self._execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row[0] if row else None
+
+    def update(self, job_id, **fields):
+        fields["heartbeat_at"] = time.time()
+        assignments = ", ".join(f"{key} = ?" for key in fields)
+        self._execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def log(self, job_id, level, message):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO job_logs VALUES (?, ?, ?, ?)", (job_id, time.time(), level, str(message))
+            )
+            # 작업별로 최근 로그만 유지
+            self._conn.execute(
+                "DELETE FROM job_logs WHERE job_id = ? AND created_at < ("
+                "SELECT created_at FROM job_logs WHERE job_id = ? ORDER BY created_at DESC LIMIT 1 OFFSET ?)",
+                (job_id, job_id, MAX_LOG_MESSAGES - 1)
+            )
+
+    def logs(self, job_id, limit=50) -> list:
+        rows = self._execute(
+            "SELECT created_at, level, message FROM job_logs WHERE job_id = ? ORDER BY created_at DESC LIMIT ?",
+            (job_id, limit)
+        ).fetchall()
+        return [{"created_at": t, "level": level, "message": message} for t, level, message in reversed(rows)]
+
+    # 4-2. 취소 / 재개
+    # 대기 중인 작업은 바로 취소, 실행 중인 작업은 현재 분석 중인 대상자까지만 마치고 중단
+    def cancel(self, job_id) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = CASE status WHEN 'queued' THEN 'cancelled' ELSE 'cancelling' END, "
+                "finished_at = CASE status WHEN 'queued' THEN ? ELSE finished_at END "
+                "WHERE id = ? AND status IN ('queued', 'running')",
+                (time.time(), job_id)
+            )
+        return cursor.rowcount > 0
+
+    def resume(self, job_id) -> bool:
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'queued', error = NULL, finished_at = NULL, partial = NULL "
+                "WHERE id = ? AND status IN ('failed', 'cancelled')",
+                (job_id,)
+            )
+        self._wakeup.set()
+        return cursor.rowcount > 0
+
+    # 4-3. 작업자
+    def _requeue_stale(self):
+        self._execute(
+            "UPDATE jobs SET status = CASE status WHEN 'cancelling' THEN 'cancelled' ELSE 'queued' END "
+            "WHERE status IN ('running', 'cancelling') AND COALESCE(heartbeat_at, 0) < ?",
+            (time.time() - STALE_AFTER,)
+        )
+
+    # 대기 중인 작업 하나를 원자적으로 가져옴 (다른 작업자/프로세스와 중복 실행 방지)
+    def _claim(self):
+        self._requeue_stale()
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "UPDATE jobs SET status = 'running', started_at = ?, heartbeat_at = ?, attempts = attempts + 1 "
+                "WHERE id = (SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1) "
+                "AND status = 'queued' RETURNING *",
+                (now, now)
+            ).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def _heartbeat(self, job_id, done):
+        while not done.wait(HEARTBEAT_INTERVAL):
+            self._execute("UPDATE jobs SET heartbeat_at = ? WHERE id = ?", (time.time(), job_id))
+
+    def run_job(self, job):
+        job_id = job["id"]
+        reporter = JobReporter(self, job_id)
+        done = threading.Event()
+        threading.Thread(target=self._heartbeat, args=(job_id, done), daemon=True).start()
+        try:
+            if job["attempts"] > 1:
+                reporter.info("이전 실행에서 저장된 대상자 이후부터 이어서 분석합니다.")
+            result = self.runner(job["params"], reporter, lambda: self.status(job_id) == "cancelling")
+            self.update(job_id, status="completed", progress=1.0, result=json.dumps(result, ensure_ascii=False),
+                        finished_at=time.time(), message="완료", partial=None)
+        except Exception as e:
+            if self.status(job_id) == "cancelling":
+                self.update(job_id, status="cancelled", finished_at=time.time(), message="취소됨", partial=None)
+            else:
+                reporter.error(f"작업 실패: {e}")
+                self.update(job_id, status="failed", error=str(e), finished_at=time.time(), partial=None)
+        finally:
+            done.set()
+
+    def _worker(self):
+        while not self._stop.is_set():
+            job = self._claim()
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+            self.run_job(job)
+
+    def start(self, workers=1):
+        for i in range(workers):
+            thread = threading.Thread(target=self._worker, name=f"job_worker_{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wakeup.set()
+
+
+# 5. CLI: Streamlit 서버와 별도로 작업자 프로세스 실행
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HR 분석 작업 큐 작업자")
+    parser.add_argument("--workers", type=int, default=1, help="동시에 실행할 작업 수")
+    parser.add_argument("--job-dir", help="작업 큐 저장 위치 (기본: .cache/jobs)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    queue = JobQueue(args.job_dir).start(args.workers)
+    logging.getLogger("hr_analytics").info("작업자 %d개 실행 중: %s", args.workers, queue.path)
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        queue.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
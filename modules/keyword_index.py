@@ -0,0 +1,196 @@
+# modules/keyword_index.py
+# 키워드 표준화 인덱스: 표현만 다른 키워드('소통', '소통능력', '소통 능력', '원활한 소통')를 하나의 대표 키워드로 묶음
+# - 띄어쓰기/조사/일반 수식어·명사('능력', '역량' 등)를 정리한 표준형이 같거나, 글자 bigram 유사도가 기준 이상이면 같은 키워드
+# - 부정 표현('부족', '미흡' 등)이 있는 키워드는 부정 표현이 없는 키워드와 묶지 않음 (감정 분석 결과가 달라지므로)
+# - 대표 키워드와 별칭은 디스크(SQLite)에 저장해 다음 실행에서도 같은 대표 키워드를 사용
+# - 대표 키워드는 표준형에서 띄어쓰기를 뺀 가장 짧은 형태, 글자 유사도로 묶는 대상은 디스크에서 읽은 대표 키워드와
+#   실행 중 새로 정해진 대표 키워드 (한 번에 들어온 키워드는 짧은 것부터 처리해 입력 순서와 무관)
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+from modules.analysis.local_keywords import PARTICLES
+
+# 표준화 규칙이 바뀌어 저장된 별칭을 다시 만들어야 할 때 올림
+INDEX_VERSION = 2
+# 인덱스 저장 위치 (LLM 응답 캐시와 따로 관리, 환경변수로 변경 가능)
+DEFAULT_INDEX_DIR = os.environ.get("HR_KEYWORD_INDEX_DIR", os.path.join(".cache", "keyword_index"))
+
+# 환경변수로 기본 설정 지정
+# - HR_CANONICALIZE: 0이면 키워드 표준화를 하지 않음
+# - HR_CANON_SIMILARITY: 표준형이 다를 때 같은 키워드로 볼 최소 글자 bigram 유사도 (0~1)
+canon_settings = {
+    "enabled": os.environ.get("HR_CANONICALIZE", "1") != "0",
+    "threshold": float(os.environ.get("HR_CANON_SIMILARITY", "0.8")),
+}
+
+# 뜻을 더하지 않는 평가 수식어 ('원활한 소통', '뛰어난 리더십' → '소통', '리더십')
+GENERIC_MODIFIERS = {
+    "원활한", "뛰어난", "좋은", "훌륭한", "우수한", "탁월한", "높은", "큰", "많은", "꾸준한", "확실한", "강한", "풍부한",
+    "남다른", "특별한", "충분한", "전반적인", "기본적인",
+}
+# 앞 단어에 붙어도 뜻이 같은 일반 명사 ('소통능력' → '소통')
+GENERIC_HEADS = ("능력", "역량", "부분", "측면", "자세", "모습")
+# 부정/개선 의미가 있는 표현
+POLARITY_MARKERS = ("부족", "미흡", "아쉬", "부재", "개선", "없", "않", "못", "낮", "과도", "지나", "불만", "불편")
+
+_PUNCT_PATTERN = re.compile(r"[^\w\s]")
+
+
+def configure_canonicalization(enabled=None, threshold=None):
+    if enabled is not None:
+        canon_settings["enabled"] = bool(enabled)
+    if threshold is not None:
+        canon_settings["threshold"] = threshold
+
+
+# 1. 표준형
+def is_polar(text) -> bool:
+    return any(marker in text for marker in POLARITY_MARKERS)
+
+def _strip_particle(token):
+    for particle in PARTICLES:
+        if token.endswith(particle) and len(token) - len(particle) >= 2:
+            return token[:-len(particle)]
+    return token
+
+# 반환값: 표시용 표준형 (띄어쓰기 유지, 예: '문제 해결')
+def canonical_form(keyword) -> str:
+    text = unicodedata.normalize("NFKC", str(keyword)).lower()
+    tokens = [_strip_particle(t) for t in _PUNCT_PATTERN.sub(" ", text).split()]
+    if not tokens:
+        return ""
+    # 마지막 단어 앞의 평가 수식어 제거
+    tokens = [t for t in tokens[:-1] if t not in GENERIC_MODIFIERS] + tokens[-1:]
+    # 일반 명사로 끝나면 제거 (따로 쓴 경우 / 붙여 쓴 경우)
+    if len(tokens) > 1 and tokens[-1] in GENERIC_HEADS:
+        tokens = tokens[:-1]
+    last = tokens[-1]
+    for head in GENERIC_HEADS:
+        if last.endswith(head) and len(last) - len(head) >= 2:
+            last = last[:-len(head)]
+            break
+    # '열정적', '적극적' → '열정', '적극'
+    if last.endswith("적") and len(last) >= 3:
+        last = last[:-1]
+    tokens[-1] = last
+    return " ".join(tokens)
+
+def match_key(form) -> str:
+    return form.replace(" ", "")
+
+def _bigrams(key):
+    return {key[i:i + 2] for i in range(len(key) - 1)} or {key}
+
+def similarity(bigrams_a, bigrams_b) -> float:
+    return 2 * len(bigrams_a & bigrams_b) / (len(bigrams_a) + len(bigrams_b))
+
+def _resolve_order(keyword):
+    key = match_key(canonical_form(keyword))
+    return len(key), key, str(keyword)
+
+
+# 2. 디스크에 저장되는 표준화 인덱스
+class KeywordIndex:
+    def __init__(self, cache_dir=None, threshold=None):
+        self.cache_dir = cache_dir or DEFAULT_INDEX_DIR
+        self.threshold = threshold
+        self.aliases = {}
+        # 글자 유사도로 묶을 대표 키워드 → bigram (디스크에서 읽은 것 + 실행 중 새로 정해진 것)
+        self._targets = {}
+        self._lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.path = os.path.join(self.cache_dir, "keyword_index.sqlite3")
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS aliases (
+                    alias TEXT PRIMARY KEY,
+                    canonical TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            row = self._conn.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+            if row is None or int(row[0]) != INDEX_VERSION:
+                self._conn.execute("DELETE FROM aliases")
+                self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (str(INDEX_VERSION),))
+            self._conn.commit()
+            for alias, canonical in self._conn.execute("SELECT alias, canonical FROM aliases"):
+                self.aliases[alias] = canonical
+                self._targets[canonical] = _bigrams(canonical)
+
+    # 대표 키워드 = 표준형의 match_key (같은 표준형 중 가장 짧은 형태, 예: '문제 해결' / '문제해결' → '문제해결')
+    # 표준형이 처음 나온 경우에만 기존 대표 키워드 중 유사도가 가장 높은 것으로 묶음
+    # (같은 유사도면 짧은 것, 그다음 사전순), 묶을 대상이 없으면 새 대표 키워드로 등록
+    def _resolve(self, keyword):
+        form = canonical_form(keyword)
+        if not form:
+            return keyword
+        key = match_key(form)
+        if key in self._targets:
+            return key
+
+        # 짧은 키워드는 오탈자 판단이 어려워 제외하고, 같은 극성의 대표 키워드와만 비교
+        threshold = self.threshold or canon_settings["threshold"]
+        best, best_rank = key, None
+        if len(key) >= 3:
+            grams, polar = _bigrams(key), is_polar(key)
+            for other, other_grams in self._targets.items():
+                if len(other) < 3 or is_polar(other) != polar:
+                    continue
+                score = similarity(grams, other_grams)
+                rank = (-score, len(other), other)
+                if score >= threshold and (best_rank is None or rank < best_rank):
+                    best, best_rank = other, rank
+        if best == key:
+            self._targets[key] = _bigrams(key)
+        return best
+
+    # 키워드 목록을 대표 키워드로 바꿔 반환 (순서와 개수 유지), 새 별칭은 한 번에 저장
+    # 새 키워드는 유사도 동점 규칙과 같은 순서(표준형 길이, 사전순)로 처리해 짧은 형태가 먼저 대표 키워드가 됨
+    def canonicalize(self, keywords) -> list:
+        now = time.time()
+        with self._lock:
+            new_aliases = {}
+            fresh = [keyword for keyword in dict.fromkeys(keywords) if keyword not in self.aliases]
+            for keyword in sorted(fresh, key=_resolve_order):
+                new_aliases[keyword] = self.aliases[keyword] = self._resolve(keyword)
+            if new_aliases:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO aliases VALUES (?, ?, ?)",
+                    [(alias, canonical, now) for alias, canonical in new_aliases.items()]
+                )
+                self._conn.commit()
+            return [self.aliases[keyword] for keyword in keywords]
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM aliases")
+            self._conn.commit()
+            self.aliases.clear()
+            self._targets.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "aliases": len(self.aliases),
+                "canonical_keywords": len(set(self.aliases.values())),
+                "path": self.path,
+            }
+
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+def get_default_keyword_index() -> KeywordIndex:
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = KeywordIndex()
+        return _default_index
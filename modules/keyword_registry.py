@@ -0,0 +1,123 @@
+# modules/keyword_registry.py
+import logging, os, threading, time
+
+logger = logging.getLogger("hr_analytics")
+
+# *_for()에서 다른 대상자가 처리 중인 키워드를 기다리는 최대 시간(초) — 넘으면 결과가 없는 키워드로 처리
+WAIT_TIMEOUT = float(os.environ.get("HR_REGISTRY_WAIT_TIMEOUT", "300"))
+
+
+# 한 번의 분석 실행(run) 동안 대상자 간에 공유하는 키워드 분석 결과 저장소
+# 키워드 → 카테고리, FinBERT 라벨/점수, GPT 재분류 감정
+# - missing_*()이 돌려준 키워드는 호출한 대상자가 처리 중인 것으로 예약되어, 동시에 분석 중인 다른 대상자는
+#   같은 키워드를 다시 요청하지 않고 *_for()에서 결과가 등록될 때까지 (최대 wait_timeout초) 기다림
+# - 예약한 대상자는 결과를 update_*()로 등록하고, 결과를 얻지 못한 키워드는 release_*()로 예약을 풀어야 함
+class KeywordRegistry:
+    def __init__(self, wait_timeout=None):
+        self.wait_timeout = WAIT_TIMEOUT if wait_timeout is None else wait_timeout
+        self.categories = {}
+        self.finbert = {}
+        self.refined = {}
+        self.total_keywords = 0
+        self.hits = {"category": 0, "finbert": 0, "refined": 0}
+        self._seen = set()
+        # 테이블 이름 → {처리 중인 키워드: 결과 등록/예약 해제 시 set되는 Event}
+        self._pending = {"category": {}, "finbert": {}, "refined": {}}
+        self._lock = threading.Lock()
+
+    # 대상자별 고유 키워드 목록을 등록 (통계용)
+    def observe(self, keywords):
+        with self._lock:
+            self.total_keywords += len(keywords)
+            self._seen.update(keywords)
+
+    # 반환값: 저장된 결과도, 다른 대상자가 처리 중인 것도 아닌 키워드 (호출한 쪽이 처리하도록 예약)
+    def _missing(self, table_name, table, keywords):
+        missing = []
+        pending = self._pending[table_name]
+        with self._lock:
+            for kw in dict.fromkeys(keywords):
+                if kw in table or kw in pending:
+                    self.hits[table_name] += 1
+                else:
+                    pending[kw] = threading.Event()
+                    missing.append(kw)
+        return missing
+
+    def _release(self, table_name, keywords):
+        pending = self._pending[table_name]
+        with self._lock:
+            for kw in keywords:
+                event = pending.pop(kw, None)
+                if event is not None:
+                    event.set()
+
+    def _update(self, table_name, table, values):
+        with self._lock:
+            table.update(values)
+        self._release(table_name, values)
+
+    # 반환값: {키워드: 결과} — 다른 대상자가 처리 중인 키워드는 끝날 때까지 기다린 뒤 조회
+    # (처리에 실패해 예약만 풀렸거나 wait_timeout 안에 끝나지 않은 키워드는 결과에서 빠짐)
+    def _lookup(self, table_name, table, keywords):
+        with self._lock:
+            events = {kw: self._pending[table_name][kw] for kw in keywords if kw in self._pending[table_name]}
+        deadline = time.monotonic() + self.wait_timeout
+        timed_out = [kw for kw, event in events.items() if not event.wait(max(0.0, deadline - time.monotonic()))]
+        if timed_out:
+            logger.warning("%s 결과를 %.0f초 안에 받지 못한 키워드 %d개는 결과 없이 진행합니다: %s",
+                           table_name, self.wait_timeout, len(timed_out), timed_out)
+        with self._lock:
+            return {kw: table[kw] for kw in keywords if kw in table}
+
+    # 1. 카테고리
+    def missing_categories(self, keywords):
+        return self._missing("category", self.categories, keywords)
+
+    def update_categories(self, category_map):
+        self._update("category", self.categories, category_map)
+
+    def release_categories(self, keywords):
+        self._release("category", keywords)
+
+    def categories_for(self, keywords) -> dict:
+        return self._lookup("category", self.categories, keywords)
+
+    # 2. FinBERT 결과 ({'label': ..., 'score': ...})
+    def missing_finbert(self, keywords):
+        return self._missing("finbert", self.finbert, keywords)
+
+    def update_finbert(self, results):
+        self._update("finbert", self.finbert, results)
+
+    def release_finbert(self, keywords):
+        self._release("finbert", keywords)
+
+    def finbert_for(self, keywords) -> dict:
+        return self._lookup("finbert", self.finbert, keywords)
+
+    # 3. GPT 재분류 감정
+    def missing_refined(self, keywords):
+        return self._missing("refined", self.refined, keywords)
+
+    def update_refined(self, sentiments):
+        self._update("refined", self.refined, sentiments)
+
+    def release_refined(self, keywords):
+        self._release("refined", keywords)
+
+    def refined_for(self, keywords) -> dict:
+        return self._lookup("refined", self.refined, keywords)
+
+    def stats(self) -> dict:
+        with self._lock:
+            unique = len(self._seen)
+            total = self.total_keywords
+            return {
+                "total_keywords": total,
+                "unique_keywords": unique,
+                "reuse_ratio": round(1 - unique / total, 3) if total else 0.0,
+                "category_hits": self.hits["category"],
+                "finbert_hits": self.hits["finbert"],
+                "refined_hits": self.hits["refined"],
+            }
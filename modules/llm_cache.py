@@ -0,0 +1,188 @@
+# modules/llm_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from langchain.schema import AIMessage
+
+from modules.metrics import record_cache
+
+# 캐시 저장 위치 (환경변수로 변경 가능)
+DEFAULT_CACHE_DIR = os.environ.get("HR_CACHE_DIR", os.path.join(".cache", "llm"))
+
+
+# 1. 프롬프트 렌더링 및 캐시 키 생성
+def _message_to_dict(message):
+    if isinstance(message, str):
+        return {"role": "user", "content": message}
+    if isinstance(message, dict):
+        return {"role": message.get("role"), "content": message.get("content")}
+    return {"role": getattr(message, "type", type(message).__name__), "content": message.content}
+
+def render_prompt(messages) -> str:
+    if isinstance(messages, str):
+        messages = [messages]
+    return json.dumps([_message_to_dict(m) for m in messages], ensure_ascii=False, sort_keys=True)
+
+def make_cache_key(model, temperature, prompt: str, **params) -> str:
+    payload = json.dumps({
+        "model": model,
+        "temperature": temperature,
+        "prompt": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+        "params": params,
+    }, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# 2. SQLite 기반 디스크 캐시
+class LLMCache:
+    def __init__(self, cache_dir=None, max_entries=50000, max_bytes=200 * 1024 * 1024, max_age_days=30):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_days * 24 * 60 * 60 if max_age_days else None
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.path = os.path.join(self.cache_dir, "llm_cache.sqlite3")
+        # 파이프라인의 ThreadPoolExecutor에서 함께 사용하므로 스레드 공유 허용
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    model TEXT,
+                    temperature REAL,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            self._conn.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.max_age_seconds and now - row[1] > self.max_age_seconds):
+                self.misses += 1
+                record_cache(False)
+                return None
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        record_cache(True)
+        return row[0]
+
+    def set(self, key, response: str, model=None, temperature=None):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, temperature, response, len(response.encode("utf-8")), now, now)
+            )
+            self._conn.commit()
+            self._writes += 1
+            run_eviction = self._writes % 100 == 0
+        if run_eviction:
+            self.evict()
+
+    # 오래된 항목 삭제 후, 개수/용량 한도를 넘으면 최근 사용 순으로 정리
+    def evict(self):
+        with self._lock:
+            if self.max_age_seconds:
+                self._conn.execute(
+                    "DELETE FROM entries WHERE created_at < ?", (time.time() - self.max_age_seconds,)
+                )
+            count, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+            while count > self.max_entries or size > self.max_bytes:
+                excess = max(count - self.max_entries, max(count // 10, 1))
+                self._conn.execute(
+                    "DELETE FROM entries WHERE key IN "
+                    "(SELECT key FROM entries ORDER BY last_access ASC LIMIT ?)", (excess,)
+                )
+                count, size = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+                ).fetchone()
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            count, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "entries": count,
+            "size_bytes": size,
+            "path": self.path,
+        }
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_default_cache() -> LLMCache:
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = LLMCache()
+        return _default_cache
+
+
+# 3. ChatOpenAI 래퍼: 동일한 모델/온도/프롬프트 호출은 캐시에서 응답
+class CachedLLM:
+    def __init__(self, llm, cache: LLMCache = None):
+        self.llm = llm
+        self.cache = cache or get_default_cache()
+        self.model_name = getattr(llm, "model_name", None) or getattr(llm, "model", None)
+        self.temperature = getattr(llm, "temperature", None)
+
+    def _key(self, messages, kwargs):
+        return make_cache_key(self.model_name, self.temperature, render_prompt(messages), **kwargs)
+
+    def invoke(self, messages, **kwargs):
+        key = self._key(messages, kwargs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return AIMessage(content=cached)
+        response = self.llm.invoke(messages, **kwargs)
+        self.cache.set(key, response.content, model=self.model_name, temperature=self.temperature)
+        return response
+
+    async def ainvoke(self, messages, **kwargs):
+        key = self._key(messages, kwargs)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return AIMessage(content=cached)
+        response = await self.llm.ainvoke(messages, **kwargs)
+        self.cache.set(key, response.content, model=self.model_name, temperature=self.temperature)
+        return response
+
+    def __getattr__(self, name):
+        # 캐시와 무관한 속성은 원본 llm에 위임
+        if name == "llm":
+            raise AttributeError(name)
+        return getattr(self.llm, name)
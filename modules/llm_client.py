@@ -0,0 +1,302 @@
+# modules/llm_client.py
+# 모든 OpenAI 호출이 거치는 공용 클라이언트 계층
+# - 연결 풀을 공유하는 단일 OpenAI/httpx 클라이언트
+# - 분당 요청 수(RPM) / 분당 토큰 수(TPM) 토큰 버킷
+# - 동시 요청 수 제한
+# - 429 / 5xx 오류에 대한 지수 백오프 재시도 (지터 포함)
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from modules.analysis.token_budget import count_tokens
+from modules.llm_cache import render_prompt
+from modules.metrics import record_llm_call
+
+logger = logging.getLogger("hr_analytics")
+
+DEFAULT_RPM = int(os.environ.get("HR_OPENAI_RPM", "500"))
+DEFAULT_TPM = int(os.environ.get("HR_OPENAI_TPM", "200000"))
+MAX_RETRIES = int(os.environ.get("HR_OPENAI_MAX_RETRIES", "5"))
+# 토큰 예산 계산 시 응답 길이 추정치
+EXPECTED_COMPLETION_TOKENS = 500
+
+
+# 1. 프로세스 전체의 동시 LLM 요청 수 제한
+# 여러 대상자를 동시에 분석해도 OpenAI로 나가는 요청 수는 limit개를 넘지 않음 (0이면 제한 없음)
+class InflightLimiter:
+    def __init__(self, limit=0):
+        self.limit = limit
+        self.active = 0
+        self._cond = threading.Condition()
+
+    def set_limit(self, limit):
+        with self._cond:
+            self.limit = limit
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self):
+        with self._cond:
+            while self.limit and self.active >= self.limit:
+                self._cond.wait()
+            self.active += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self.active -= 1
+                self._cond.notify()
+
+
+inflight_limiter = InflightLimiter(int(os.environ.get("HR_MAX_INFLIGHT_LLM", "8")))
+
+def set_max_inflight(limit):
+    inflight_limiter.set_limit(limit)
+
+def llm_slot():
+    return inflight_limiter.slot()
+
+
+# 2. 분당 요청/토큰 한도 (토큰 버킷)
+class TokenBucket:
+    def __init__(self, per_minute):
+        self._lock = threading.Lock()
+        self.set_rate(per_minute)
+
+    def set_rate(self, per_minute):
+        with self._lock:
+            # 같은 한도를 다시 지정하면(작업마다 설정 적용 등) 남은 토큰을 그대로 유지
+            if getattr(self, "capacity", None) == per_minute:
+                return
+            self.capacity = per_minute
+            self.rate = per_minute / 60.0
+            self.tokens = float(per_minute)
+            self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount=1):
+        if not self.capacity:
+            return
+        while True:
+            with self._lock:
+                self._refill()
+                # 한도보다 큰 요청은 버킷이 가득 찼을 때 보냄
+                needed = min(amount, self.capacity)
+                if self.tokens >= needed:
+                    self.tokens -= amount
+                    return
+                wait = (needed - self.tokens) / self.rate
+            time.sleep(min(wait, 1.0))
+
+    # 실제 사용량이 추정치와 다를 때 보정 (음수 잔량 허용)
+    def adjust(self, amount):
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class RateLimiter:
+    def __init__(self, rpm=DEFAULT_RPM, tpm=DEFAULT_TPM):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+
+    def acquire(self, estimated_tokens):
+        self.requests.acquire(1)
+        self.tokens.acquire(estimated_tokens)
+
+    def record_usage(self, estimated_tokens, actual_tokens):
+        if actual_tokens:
+            self.tokens.adjust(actual_tokens - estimated_tokens)
+
+
+rate_limiter = RateLimiter()
+
+def configure_rate_limits(rpm=None, tpm=None):
+    if rpm is not None:
+        rate_limiter.requests.set_rate(rpm)
+    if tpm is not None:
+        rate_limiter.tokens.set_rate(tpm)
+
+
+# 3. 재시도 (429 / 5xx / 연결 오류만)
+def _status_code(error):
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status
+
+def is_retryable(error) -> bool:
+    import openai
+    if isinstance(error, (openai.RateLimitError, openai.APIConnectionError, openai.APITimeoutError)):
+        return True
+    status = _status_code(error)
+    return status is not None and (status in (408, 409, 429) or status >= 500)
+
+def _retry_after(error):
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+def call_with_retry(fn, max_retries=None, base_delay=1.0, max_delay=30.0):
+    max_retries = MAX_RETRIES if max_retries is None else max_retries
+    for attempt in range(max_retries + 1):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            # full jitter 지수 백오프, 서버가 Retry-After를 주면 그 이상 대기
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+            delay = max(delay, _retry_after(e) or 0)
+            logger.warning("OpenAI 요청 재시도 %d/%d (%.1f초 후): %s", attempt + 1, max_retries, delay, e)
+            time.sleep(delay)
+
+
+# 4. 연결 풀을 공유하는 클라이언트
+_http_client = None
+_openai_clients = {}
+_client_override = None
+_client_lock = threading.Lock()
+
+def get_http_client():
+    global _http_client
+    with _client_lock:
+        if _http_client is None:
+            import httpx
+            _http_client = httpx.Client(
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                timeout=httpx.Timeout(120.0, connect=10.0)
+            )
+        return _http_client
+
+# 벤치마크 등에서 모든 OpenAI 호출을 대신 받을 클라이언트 지정 (None이면 해제)
+def set_openai_client(client):
+    global _client_override
+    with _client_lock:
+        _client_override = client
+
+def get_openai_client(section_name="openai_section"):
+    if _client_override is not None:
+        return _client_override
+    from openai import OpenAI
+    from modules.config import get_api_key
+
+    api_key = get_api_key(section_name)
+    http_client = get_http_client()
+    with _client_lock:
+        if api_key not in _openai_clients:
+            # 재시도는 call_with_retry에서 처리
+            _openai_clients[api_key] = OpenAI(api_key=api_key, http_client=http_client, max_retries=0)
+        return _openai_clients[api_key]
+
+
+def _prompt_tokens(messages):
+    return count_tokens(render_prompt(messages))
+
+# usage_of(response)는 (입력 토큰, 출력 토큰)을 반환 (알 수 없으면 None)
+def _limited_call(fn, prompt_tokens, usage_of, model=None):
+    estimated_tokens = prompt_tokens + EXPECTED_COMPLETION_TOKENS
+    attempts = 0
+
+    # 재시도 대기 중에는 동시 요청 슬롯을 점유하지 않도록 매 시도마다 획득
+    def attempt():
+        nonlocal attempts
+        attempts += 1
+        rate_limiter.acquire(estimated_tokens)
+        with llm_slot():
+            response = fn()
+        usage = usage_of(response)
+        rate_limiter.record_usage(estimated_tokens, sum(usage) if usage else None)
+        record_llm_call(model, *(usage or (prompt_tokens, 0)), retries=attempts - 1)
+        return response
+
+    try:
+        return call_with_retry(attempt)
+    except Exception:
+        record_llm_call(model, retries=max(attempts - 1, 0), failed=True)
+        raise
+
+def _openai_usage(response):
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None
+    return usage.prompt_tokens or 0, usage.completion_tokens or 0
+
+
+# openai SDK를 직접 사용하는 모듈(요약, 질문 컬럼 탐지)용 호출 함수
+def chat_completion(messages, model="gpt-4o-mini", temperature=0, section_name="openai_section", **kwargs):
+    client = get_openai_client(section_name)
+    return _limited_call(
+        lambda: client.chat.completions.create(model=model, messages=messages, temperature=temperature, **kwargs),
+        _prompt_tokens(messages),
+        _openai_usage,
+        model=model
+    )
+
+
+# 스트리밍 응답: 조각이 도착할 때마다 on_token(text)을 호출하고 전체 응답 텍스트를 반환
+# (응답을 다 받을 때까지 동시 요청 슬롯을 점유)
+# 응답 도중 실패해 재시도하면 새 응답을 보내기 전에 on_reset()을 호출 → 받는 쪽은 이전 시도에서 받은 조각을 버림
+def chat_completion_stream(messages, on_token, model="gpt-4o-mini", temperature=0, section_name="openai_section",
+                           on_reset=None, **kwargs):
+    client = get_openai_client(section_name)
+    sent = False
+
+    def consume():
+        nonlocal sent
+        if sent and on_reset is not None:
+            on_reset()
+        sent = False
+        parts = []
+        stream = client.chat.completions.create(
+            model=model, messages=messages, temperature=temperature, stream=True, **kwargs
+        )
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                sent = True
+                on_token(delta)
+        return "".join(parts)
+
+    # 스트리밍 응답에는 사용량이 없으므로 토큰 수를 직접 계산
+    prompt_tokens = _prompt_tokens(messages)
+    return _limited_call(consume, prompt_tokens, lambda text: (prompt_tokens, count_tokens(text)), model=model)
+
+
+# 5. ChatOpenAI 래퍼: 모든 invoke 호출이 동시 요청 제한, 분당 한도, 재시도를 거치도록 함
+class ManagedLLM:
+    def __init__(self, llm):
+        self.llm = llm
+
+    @staticmethod
+    def _usage(response):
+        usage = getattr(response, "usage_metadata", None)
+        if not usage:
+            return None
+        return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+
+    def invoke(self, messages, **kwargs):
+        return _limited_call(
+            lambda: self.llm.invoke(messages, **kwargs), _prompt_tokens(messages), self._usage,
+            model=getattr(self.llm, "model_name", None)
+        )
+
+    async def ainvoke(self, messages, **kwargs):
+        # 한도 대기가 이벤트 루프를 막지 않도록 스레드에서 실행
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: self.invoke(messages, **kwargs))
+
+    def __getattr__(self, name):
+        if name == "llm":
+            raise AttributeError(name)
+        return getattr(self.llm, name)
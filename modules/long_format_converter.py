@@ -19,12 +19,15 @@ def convert_to_long_format(df: pd.DataFrame, id_column: str, question_columns: l
     meaningless_responses = ["-", "없습니다.", "없음", "해당 없음", "해당없음", "x", "X"]
     
     # 응답이 비어 있거나 무의미한 문자열과 일치하는 행을 제거
-    long_df = long_df[~long_df['응답'].isin(meaningless_responses)].copy()
-    long_df = long_df[long_df['응답'] != ''].copy()
-    
     # 🚨 추가된 부분: 문장 길이가 10 단어 미만인 행을 제거합니다.
-    # 단어를 공백으로 구분하여 개수를 세고, 10 미만인 경우 삭제
-    long_df = long_df[long_df['응답'].str.split().str.len() >= 10].copy()
+    # 단어(공백 기준) 개수를 세고, 10 미만인 경우 삭제 (조건을 한 번에 적용해 복사 1회)
+    responses = long_df['응답']
+    keep_mask = (
+        ~responses.isin(meaningless_responses)
+        & (responses != '')
+        & (responses.str.count(r'\S+') >= 10)
+    )
+    long_df = long_df[keep_mask].copy()
 
     # NaN을 빈 문자열로 먼저 처리한 후 문자열 변환
     long_df[id_column] = long_df[id_column].astype(str)
@@ -38,16 +41,38 @@ def convert_to_long_format(df: pd.DataFrame, id_column: str, question_columns: l
     has_numbers = bool(re.search(r'\d+', sample_id))
     
     if has_numbers:
-        # 숫자가 포함된 경우: 숫자 부분을 추출하여 정렬
-        def extract_number(text):
-            numbers = re.findall(r'\d+', str(text))
-            return int(numbers[0]) if numbers else 0
-        
-        long_df['_sort_key'] = long_df[id_column].apply(extract_number)
+        # 숫자가 포함된 경우: 첫 번째 숫자 부분을 추출하여 정렬 (벡터 연산)
+        long_df['_sort_key'] = pd.to_numeric(
+            long_df[id_column].str.extract(r'(\d+)', expand=False), errors='coerce'
+        ).fillna(0)
         long_df = long_df.sort_values(['_sort_key', '질문']).reset_index(drop=True)
         long_df = long_df.drop('_sort_key', axis=1)
     else:
         # 숫자가 없는 경우: 문자열 그대로 정렬
         long_df = long_df.sort_values([id_column, '질문']).reset_index(drop=True)
     
-    return long_df
\ No newline at end of file
+    return long_df
+
+
+# 전체 데이터를 한 번만 Long Format으로 변환하고, 대상자별 행 위치를 미리 계산해 두는 인덱스
+class LongFormatIndex:
+    def __init__(self, df: pd.DataFrame, id_column: str, question_columns: list):
+        self.id_column = id_column
+        question_columns = [col for col in question_columns if col in df.columns and col != id_column]
+        self.long_df = convert_to_long_format(df, id_column, question_columns)
+        self._positions = (
+            self.long_df.groupby(id_column, sort=False).indices if not self.long_df.empty else {}
+        )
+
+    def subjects(self) -> list:
+        return list(self._positions.keys())
+
+    # 대상자 ID는 변환 과정에서 문자열로 바뀌므로 문자열 기준으로 조회
+    def get(self, subject) -> pd.DataFrame:
+        positions = self._positions.get(str(subject))
+        if positions is None:
+            return self.long_df.iloc[0:0]
+        return self.long_df.iloc[positions]
+
+    def __len__(self):
+        return len(self._positions)
@@ -2,11 +2,13 @@
 from modules.long_format_converter import convert_to_long_format
 from modules.question_detector import detect_question_columns
 
-def make_longformat(df, id_column, use_llm=False, section_name="openai"):
+def make_longformat(df, id_column, use_llm=False, section_name="openai", reporter=None):
     if use_llm:
         question_columns = detect_question_columns(
             [col for col in df.columns if col != id_column],
-            section_name=section_name
+            section_name=section_name,
+            reporter=reporter,
+            df=df
         )
     else:
         question_columns = [col for col in df.columns if col != id_column]
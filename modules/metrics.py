@@ -0,0 +1,251 @@
+# modules/metrics.py
+# 분석 실행 계측: 단계별 소요 시간 / 호출 수, LLM 요청·토큰·재시도·캐시 적중, 응답 형식 오류율, 중복 응답 비율, 키워드 표준화 비율, 로컬 카테고리 분류 비율, 예상 비용
+# - 실행(run) 전체와 대상자별로 집계해 실행 폴더의 metrics.json으로 저장
+# - 현재 실행/대상자는 contextvars로 전달하므로 분석 모듈은 stage()와 record_*()만 호출
+import contextvars
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+METRICS_FILE_NAME = "metrics.json"
+# 모델별 100만 토큰당 가격 (USD, 입력 / 출력)
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+
+# (RunMetrics, 대상자) — 대상자가 None이면 실행 전체 단계
+_scope = contextvars.ContextVar("metrics_scope", default=(None, None))
+
+
+def _empty_llm():
+    return {
+        "requests": 0,
+        "failed_requests": 0,
+        "retries": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "cache_hits": 0,
+        "cache_misses": 0,
+        "models": {},
+        "structured": {},
+    }
+
+def _empty_dedup():
+    return {"responses": 0, "unique": 0, "exact_duplicates": 0, "near_duplicates": 0}
+
+def _empty_canonicalization():
+    return {"raw_keywords": 0, "canonical_keywords": 0}
+
+def _empty_categorization():
+    return {"local": 0, "escalated": 0}
+
+def _empty_bucket():
+    return {
+        "stages": {}, "llm": _empty_llm(), "dedup": _empty_dedup(), "canonicalization": _empty_canonicalization(),
+        "categorization": _empty_categorization(),
+    }
+
+def estimate_cost(models: dict) -> float:
+    cost = 0.0
+    for model, usage in models.items():
+        input_price, output_price = MODEL_PRICES.get(model, (0.0, 0.0))
+        cost += usage["prompt_tokens"] / 1e6 * input_price + usage["completion_tokens"] / 1e6 * output_price
+    return round(cost, 6)
+
+
+# 1. 실행 1회의 계측 결과
+class RunMetrics:
+    def __init__(self):
+        self.started_at = time.time()
+        self.total = _empty_bucket()
+        self.subjects = {}
+        self.extra = {}
+        self._lock = threading.Lock()
+
+    def _buckets(self, subject):
+        buckets = [self.total]
+        if subject is not None:
+            buckets.append(self.subjects.setdefault(str(subject), _empty_bucket()))
+        return buckets
+
+    def add_stage(self, subject, name, seconds):
+        with self._lock:
+            for bucket in self._buckets(subject):
+                stage = bucket["stages"].setdefault(name, {"calls": 0, "seconds": 0.0})
+                stage["calls"] += 1
+                stage["seconds"] += seconds
+
+    def add_llm(self, subject, model, prompt_tokens=0, completion_tokens=0, retries=0, failed=False):
+        with self._lock:
+            for bucket in self._buckets(subject):
+                llm = bucket["llm"]
+                llm["failed_requests" if failed else "requests"] += 1
+                llm["retries"] += retries
+                llm["prompt_tokens"] += prompt_tokens
+                llm["completion_tokens"] += completion_tokens
+                usage = llm["models"].setdefault(model or "unknown", {"prompt_tokens": 0, "completion_tokens": 0})
+                usage["prompt_tokens"] += prompt_tokens
+                usage["completion_tokens"] += completion_tokens
+
+    def add_cache(self, subject, hit):
+        with self._lock:
+            for bucket in self._buckets(subject):
+                bucket["llm"]["cache_hits" if hit else "cache_misses"] += 1
+
+    def add_structured(self, subject, kind, parsed, requested_items, missing_items):
+        with self._lock:
+            for bucket in self._buckets(subject):
+                stats = bucket["llm"]["structured"].setdefault(
+                    kind, {"responses": 0, "parse_failures": 0, "requested_items": 0, "missing_items": 0}
+                )
+                stats["responses"] += 1
+                stats["parse_failures"] += 0 if parsed else 1
+                stats["requested_items"] += requested_items
+                stats["missing_items"] += missing_items
+
+    def add_dedup(self, subject, stats):
+        with self._lock:
+            for bucket in self._buckets(subject):
+                for key in bucket["dedup"]:
+                    bucket["dedup"][key] += stats.get(key, 0)
+
+    def add_canonicalization(self, subject, raw_keywords, canonical_keywords):
+        with self._lock:
+            for bucket in self._buckets(subject):
+                bucket["canonicalization"]["raw_keywords"] += raw_keywords
+                bucket["canonicalization"]["canonical_keywords"] += canonical_keywords
+
+    def add_categorization(self, subject, local, escalated):
+        with self._lock:
+            for bucket in self._buckets(subject):
+                bucket["categorization"]["local"] += local
+                bucket["categorization"]["escalated"] += escalated
+
+    @staticmethod
+    def _bucket_dict(bucket):
+        stages = {
+            name: {
+                "calls": stage["calls"],
+                "seconds": round(stage["seconds"], 3),
+                "avg_seconds": round(stage["seconds"] / stage["calls"], 3) if stage["calls"] else 0.0,
+            }
+            for name, stage in bucket["stages"].items()
+        }
+        llm = dict(bucket["llm"])
+        lookups = llm["cache_hits"] + llm["cache_misses"]
+        llm["cache_hit_rate"] = round(llm["cache_hits"] / lookups, 3) if lookups else 0.0
+        llm["estimated_cost_usd"] = estimate_cost(llm["models"])
+        llm["structured"] = {
+            kind: {
+                **stats,
+                "parse_failure_rate": round(stats["parse_failures"] / stats["responses"], 3) if stats["responses"] else 0.0,
+                "missing_item_rate": (
+                    round(stats["missing_items"] / stats["requested_items"], 3) if stats["requested_items"] else 0.0
+                ),
+            }
+            for kind, stats in llm["structured"].items()
+        }
+        dedup = dict(bucket["dedup"])
+        dedup["duplicate_rate"] = round(1 - dedup["unique"] / dedup["responses"], 3) if dedup["responses"] else 0.0
+        canon = dict(bucket["canonicalization"])
+        canon["reduction_rate"] = (
+            round(1 - canon["canonical_keywords"] / canon["raw_keywords"], 3) if canon["raw_keywords"] else 0.0
+        )
+        categorization = dict(bucket["categorization"])
+        classified = categorization["local"] + categorization["escalated"]
+        categorization["local_rate"] = round(categorization["local"] / classified, 3) if classified else 0.0
+        return {"stages": stages, "llm": llm, "dedup": dedup, "canonicalization": canon, "categorization": categorization}
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "wall_seconds": round(time.time() - self.started_at, 3),
+                "run": self._bucket_dict(self.total),
+                "subjects": {subject: self._bucket_dict(bucket) for subject, bucket in self.subjects.items()},
+                **self.extra,
+            }
+
+    def save(self, run_dir) -> str:
+        path = os.path.join(run_dir, METRICS_FILE_NAME)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        return path
+
+
+def load_metrics(run_dir):
+    path = os.path.join(run_dir, METRICS_FILE_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# 2. 현재 계측 범위 지정 (실행 전체 / 대상자)
+@contextmanager
+def metrics_scope(metrics, subject=None):
+    token = _scope.set((metrics, subject))
+    try:
+        yield metrics
+    finally:
+        _scope.reset(token)
+
+# 현재 범위(실행/대상자)를 작업자 스레드에도 그대로 전달하는 스레드 풀
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    def submit(self, fn, /, *args, **kwargs):
+        context = contextvars.copy_context()
+        return super().submit(context.run, fn, *args, **kwargs)
+
+
+# 3. 기록 함수 (계측 범위 밖에서는 아무것도 하지 않음)
+@contextmanager
+def stage(name):
+    metrics, subject = _scope.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add_stage(subject, name, time.perf_counter() - start)
+
+def record_llm_call(model, prompt_tokens=0, completion_tokens=0, retries=0, failed=False):
+    metrics, subject = _scope.get()
+    if metrics is not None:
+        metrics.add_llm(subject, model, prompt_tokens or 0, completion_tokens or 0, retries, failed)
+
+def record_cache(hit):
+    metrics, subject = _scope.get()
+    if metrics is not None:
+        metrics.add_cache(subject, hit)
+
+# 구조화 응답 1건의 검증 결과 (parsed=False면 JSON/스키마 오류, missing_items는 빠지거나 잘못된 항목 수)
+def record_structured(kind, parsed, requested_items=1, missing_items=0):
+    metrics, subject = _scope.get()
+    if metrics is not None:
+        metrics.add_structured(subject, kind, parsed, requested_items, missing_items)
+
+# 키워드 추출 전 중복 응답 정리 결과 (dedup.dedupe_texts의 통계)
+def record_dedup(stats):
+    metrics, subject = _scope.get()
+    if metrics is not None:
+        metrics.add_dedup(subject, stats)
+
+# 키워드 표준화 전/후 고유 키워드 수
+def record_canonicalization(raw_keywords, canonical_keywords):
+    metrics, subject = _scope.get()
+    if metrics is not None:
+        metrics.add_canonicalization(subject, raw_keywords, canonical_keywords)
+
+# 키워드 카테고리 분류: 로컬 분류기로 확정한 키워드 수 / GPT로 넘긴 키워드 수
+def record_categorization(local, escalated):
+    metrics, subject = _scope.get()
+    if metrics is not None:
+        metrics.add_categorization(subject, local, escalated)
@@ -0,0 +1,102 @@
+# modules/progress.py
+import logging
+from contextlib import contextmanager
+
+logger = logging.getLogger("hr_analytics")
+
+
+# 1. 기본 리포터: 분석 모듈은 이 인터페이스로만 진행 상황을 알림 (아무것도 표시하지 않음)
+class ProgressReporter:
+    # True인 리포터에게만 GPT 응답을 스트리밍으로 전달
+    wants_stream = False
+
+    # key로 구분되는 진행률 (0.0 ~ 1.0)
+    def progress(self, key, fraction, text=""):
+        pass
+
+    # 진행률/스트리밍 텍스트 표시 제거
+    def clear(self, key):
+        pass
+
+    def stage(self, title):
+        pass
+
+    def info(self, message):
+        pass
+
+    def success(self, message):
+        pass
+
+    def warning(self, message):
+        pass
+
+    def error(self, message):
+        pass
+
+    def debug(self, label, value):
+        pass
+
+    # 중간 결과 표 (Long Format 변환 결과 등)
+    def table(self, title, df):
+        pass
+
+    # key로 구분되는 스트리밍 텍스트 조각 (GPT 요약 등)
+    def stream(self, key, token):
+        pass
+
+    @contextmanager
+    def spinner(self, text):
+        yield
+
+    # 다른 스레드에서 쌓인 이벤트 반영 (필요한 리포터만 구현)
+    def flush(self):
+        pass
+
+
+def ensure_reporter(reporter):
+    return reporter if reporter is not None else ProgressReporter()
+
+
+# 2. 로그 출력 리포터 (CLI / 배치 작업용)
+class LoggingReporter(ProgressReporter):
+    def __init__(self, log=None, step=0.1):
+        self.log = log or logger
+        self.step = step
+        self._last = {}
+
+    def progress(self, key, fraction, text=""):
+        # 로그가 너무 많아지지 않도록 일정 간격마다만 출력
+        last = self._last.get(key)
+        if last is None or fraction >= 1.0 or fraction - last >= self.step:
+            self._last[key] = fraction
+            self.log.info("[%s] %3d%% %s", key, int(fraction * 100), text)
+
+    def clear(self, key):
+        self._last.pop(key, None)
+
+    def stage(self, title):
+        self.log.info("== %s", title)
+
+    def info(self, message):
+        self.log.info(message)
+
+    def success(self, message):
+        self.log.info(message)
+
+    def warning(self, message):
+        self.log.warning(message)
+
+    def error(self, message):
+        self.log.error(message)
+
+    def debug(self, label, value):
+        self.log.debug("%s %s", label, value)
+
+    def table(self, title, df):
+        self.log.debug("%s (%d rows)", title, len(df))
+
+    @contextmanager
+    def spinner(self, text):
+        self.log.info(text)
+        yield
+
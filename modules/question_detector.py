@@ -1,11 +1,98 @@
 # modules/question_detector.py
-from openai import OpenAI
+# 질문 컬럼 탐지
+# - 실제 데이터(자료형, 평균 응답 길이, 고유값 비율, ID 형식)로 먼저 판별하고, 애매한 컬럼만 GPT에 확인
+# - GPT 판별 결과는 LLM 캐시에 저장해 같은 컬럼 목록이면 다시 요청하지 않음 (정기 설문 재업로드)
 import json
-import streamlit as st
 import re
 
-def detect_question_columns(columns: list, section_name: str='openai') -> list:
-    prompt = f"""
+import pandas as pd
+
+from modules.llm_cache import get_default_cache, make_cache_key, render_prompt
+from modules.llm_client import chat_completion
+from modules.progress import ensure_reporter
+
+DETECT_MODEL = "gpt-4o-mini"
+DETECT_TEMPERATURE = 0.2
+# 컬럼별로 살펴볼 최대 값 개수
+SAMPLE_SIZE = 500
+
+# 식별자/속성 컬럼명 (대상자, 응답자, 관계, 부서 등)
+META_NAME_PATTERN = re.compile(
+    r"(^|[\s_\-(])(id|no|code)($|[\s_\-)])|번호|사번|코드|이름|성명|응답자|평가자|대상자|관계|부서|직급|직책|소속|"
+    r"성별|연령|나이|일시|날짜|일자|시간|date|time|e-?mail|이메일",
+    re.IGNORECASE
+)
+# 질문 문장 형태의 컬럼명
+QUESTION_NAME_PATTERN = re.compile(
+    r"\?|무엇|어떻|어떤|적어|서술|의견|생각|평가해|말씀|바라는|개선|강점|약점|잘한|아쉬|하고 싶은|문항|질문|^q\d+",
+    re.IGNORECASE
+)
+# 'A-12', '대상자3', 'R0001-01', '2023001' 같은 식별자 값
+ID_VALUE_PATTERN = re.compile(r"^[A-Za-z가-힣]{0,10}[\s_\-]?\d+([\s_\-]\d+)*$")
+
+
+# 1. 로컬 판별: 컬럼별 특징 계산
+# object뿐 아니라 pandas string 자료형(convert_dtypes, pyarrow 등)도 텍스트 컬럼으로 판별
+def _is_text(series: pd.Series) -> bool:
+    return pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
+
+def column_features(series: pd.Series) -> dict:
+    values = series.dropna()
+    is_text = _is_text(values)
+    if is_text:
+        values = values.astype(str).str.strip()
+        values = values[values != ""]
+    sample = values.head(SAMPLE_SIZE)
+    features = {
+        "dtype": str(series.dtype),
+        "fill_ratio": round(len(values) / len(series), 3) if len(series) else 0.0,
+        "distinct_ratio": round(sample.nunique() / len(sample), 3) if len(sample) else 0.0,
+        "distinct_count": int(sample.nunique()),
+        "avg_chars": 0.0,
+        "avg_words": 0.0,
+        "id_like_ratio": 0.0,
+    }
+    if len(sample) and is_text:
+        features["avg_chars"] = round(float(sample.str.len().mean()), 1)
+        features["avg_words"] = round(float(sample.str.count(r"\S+").mean()), 1)
+        features["id_like_ratio"] = round(float(sample.str.match(ID_VALUE_PATTERN).mean()), 3)
+    return features
+
+# 컬럼 1개 판별: ("question" | "meta" | "ambiguous", 판단 근거)
+def classify_column(name, series: pd.Series):
+    features = column_features(series)
+    name = str(name)
+
+    if not features["fill_ratio"]:
+        return "meta", "값이 없는 컬럼", features
+    if not _is_text(series):
+        return "meta", "숫자/날짜 컬럼", features
+    if features["id_like_ratio"] >= 0.9:
+        return "meta", "식별자 형식의 값", features
+    if features["avg_words"] >= 6 and features["distinct_ratio"] >= 0.5:
+        return "question", "서술형 응답", features
+    if features["avg_chars"] <= 15 and features["distinct_count"] <= 20 and features["distinct_ratio"] <= 0.5:
+        return "meta", "반복되는 짧은 범주 값", features
+    if META_NAME_PATTERN.search(name) and features["avg_words"] < 3:
+        return "meta", "식별자/속성 컬럼명", features
+    if QUESTION_NAME_PATTERN.search(name) and features["avg_words"] >= 3:
+        return "question", "질문 형태의 컬럼명", features
+    return "ambiguous", "판단 보류", features
+
+def classify_columns_locally(df: pd.DataFrame, id_column=None) -> dict:
+    decisions = {}
+    for col in df.columns:
+        if col == id_column:
+            decisions[col] = {"label": "meta", "reason": "ID 컬럼"}
+            continue
+        label, reason, features = classify_column(col, df[col])
+        decisions[col] = {"label": label, "reason": reason, **features}
+    return decisions
+
+
+# 2. GPT 판별 (컬럼 목록으로 만든 프롬프트 기준 캐시)
+def _detect_prompt(columns):
+    return f"""
 아래는 설문 데이터의 컬럼명 목록입니다.
 이 중에서 응답자가 텍스트로 답변을 작성하는 질문 컬럼들을 모두 골라주세요.
 
@@ -24,43 +111,95 @@ def detect_question_columns(columns: list, section_name: str='openai') -> list:
 반드시 JSON 배열 형식으로만 응답하세요. 다른 설명 없이 오직 배열만 주세요.
 예시: ["질문1", "질문2", "Q1"]
 """
-    
+
+def _parse_columns(content, reporter):
+    content = content.strip()
+    # 마크다운 코드 블록 제거
+    if content.startswith('```'):
+        # ```json 또는 ``` 로 시작하는 경우
+        lines = content.split('\n')
+        # 첫 번째와 마지막 라인 제거 (``` 라인들)
+        content = '\n'.join(lines[1:-1]).strip()
+
+    # JSON 추출 (배열 형태만)
+    json_match = re.search(r'\[.*\]', content, re.DOTALL)
+    if json_match:
+        content = json_match.group()
+
+    reporter.debug("정제된 JSON:", content)
+    result = json.loads(content)
+    if not isinstance(result, list):
+        raise json.JSONDecodeError("JSON 배열이 아닙니다.", content, 0)
+    return result
+
+def detect_question_columns_with_gpt(columns: list, section_name: str='openai', reporter=None, cache=None) -> list:
+    reporter = ensure_reporter(reporter)
+    cache = cache or get_default_cache()
+    messages = [{"role": "user", "content": _detect_prompt(columns)}]
+    cache_key = make_cache_key(DETECT_MODEL, DETECT_TEMPERATURE, render_prompt(messages))
+
+    # 캐시에는 컬럼명을 문자열로 저장하고, 돌려줄 때는 입력받은 컬럼으로 되돌림
+    def matching(names):
+        names = {str(col) for col in names}
+        return [col for col in columns if str(col) in names]
+
+    cached = cache.get(cache_key)
+    if cached is not None:
+        reporter.debug("질문 컬럼 탐지 캐시 사용:", cached)
+        return matching(json.loads(cached))
+
+    content = ""
     try:
-        client = OpenAI(api_key=st.secrets[section_name]['api_key'])
-        
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.2,
+        response = chat_completion(
+            messages,
+            model=DETECT_MODEL,
+            temperature=DETECT_TEMPERATURE,
+            section_name=section_name
         )
-        content = response.choices[0].message.content.strip()
-        
+        content = response.choices[0].message.content
+
         # 디버깅: OpenAI 응답 확인
-        st.write("OpenAI 응답:", content)
-        
-        # 마크다운 코드 블록 제거
-        if content.startswith('```'):
-            # ```json 또는 ``` 로 시작하는 경우
-            lines = content.split('\n')
-            # 첫 번째와 마지막 라인 제거 (``` 라인들)
-            content = '\n'.join(lines[1:-1]).strip()
-        
-        # JSON 추출 (배열 형태만)
-        json_match = re.search(r'\[.*\]', content, re.DOTALL)
-        if json_match:
-            content = json_match.group()
-        
-        st.write("정제된 JSON:", content)
-        
-        # JSON 파싱 시도
-        result = json.loads(content)
-        st.write("파싱된 결과:", result)
-        return result
-        
+        reporter.debug("OpenAI 응답:", content)
+        result = _parse_columns(content, reporter)
+        reporter.debug("파싱된 결과:", result)
     except json.JSONDecodeError as e:
-        st.error(f"JSON 파싱 에러: {e}")
-        st.write("원본 응답:", content)
+        reporter.error(f"JSON 파싱 에러: {e}")
+        reporter.debug("원본 응답:", content)
         return []
     except Exception as e:
-        st.error(f"OpenAI API 에러: {e}")
-        return []
\ No newline at end of file
+        reporter.error(f"OpenAI API 에러: {e}")
+        return []
+
+    # 목록에 없는 컬럼명은 제외하고, 정상적으로 파싱된 결과만 캐시
+    # (GPT는 컬럼명을 문자열로 돌려주므로 숫자/날짜 컬럼명도 문자열로 비교하고, 캐시에도 문자열로 저장)
+    result = matching(result)
+    cache.set(
+        cache_key, json.dumps([str(col) for col in result], ensure_ascii=False),
+        model=DETECT_MODEL, temperature=DETECT_TEMPERATURE
+    )
+    return result
+
+
+# 3. 통합 탐지
+# df가 있으면 로컬 판별로 확실한 컬럼을 먼저 정하고, 애매한 컬럼만 GPT에 확인
+# (df가 없으면 컬럼명만으로 GPT 판별)
+def detect_question_columns(columns: list, section_name: str='openai', reporter=None, df=None, id_column=None,
+                            cache=None) -> list:
+    reporter = ensure_reporter(reporter)
+    if df is None:
+        return detect_question_columns_with_gpt(columns, section_name=section_name, reporter=reporter, cache=cache)
+
+    decisions = classify_columns_locally(df[[col for col in columns if col in df.columns]], id_column=id_column)
+    ambiguous = [col for col, decision in decisions.items() if decision["label"] == "ambiguous"]
+    reporter.debug("질문 컬럼 로컬 판별:", {col: (d["label"], d["reason"]) for col, d in decisions.items()})
+
+    confirmed = set()
+    if ambiguous:
+        reporter.info(f"판단이 애매한 컬럼 {len(ambiguous)}개를 GPT로 확인합니다: {ambiguous}")
+        confirmed = {str(col) for col in detect_question_columns_with_gpt(
+            ambiguous, section_name=section_name, reporter=reporter, cache=cache
+        )}
+    return [
+        col for col, decision in decisions.items()
+        if decision["label"] == "question" or str(col) in confirmed
+    ]
@@ -0,0 +1,108 @@
+# modules/result_browser.py
+# 분석 페이지에서 사용하는 결과 탐색 도우미 (Streamlit 비의존)
+# - 실행(run) 폴더와 대상자 목록 인덱스, 수정 시각(mtime) 기반 무효화용 서명
+# - ID 형식에 상관없는 자연 정렬
+# - 표 페이지 나누기, 차트 썸네일 생성
+import io
+import math
+import os
+import re
+
+from modules.result_store import RESULT_DB_NAME, ResultStore
+
+THUMBNAIL_SIZE = (360, 360)
+
+
+# 1. 자연 정렬: '대상자2' < '대상자10', 'A-3' < 'A-12'
+def natural_key(value):
+    return [(0, int(part), "") if part.isdigit() else (1, 0, part.lower())
+            for part in re.split(r"(\d+)", str(value)) if part]
+
+def natural_sorted(values):
+    return sorted(values, key=natural_key)
+
+
+# 2. 변경 감지용 서명 (캐시 키로 사용)
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+def run_signature(run_dir) -> tuple:
+    if ResultStore.exists(run_dir):
+        # WAL 모드에서는 기록 내용이 -wal 파일에 먼저 쌓이므로 함께 확인
+        db_path = os.path.join(run_dir, RESULT_DB_NAME)
+        return (_mtime(run_dir), _mtime(db_path), _mtime(db_path + "-wal"))
+    return (_mtime(run_dir),)
+
+def subject_dir_signature(subject_dir) -> int:
+    return _mtime(subject_dir)
+
+
+# 3. 실행 폴더 탐색: base_dir 바로 아래에서 결과 저장소 또는 대상자 폴더가 있는 실행 폴더 찾기
+def discover_runs(base_dir=".") -> list:
+    runs = []
+    try:
+        entries = list(os.scandir(base_dir))
+    except OSError:
+        return runs
+    for entry in entries:
+        if entry.is_dir() and not entry.name.startswith(".") and ResultStore.exists(entry.path):
+            runs.append((entry.name, entry.path, entry.stat().st_mtime))
+    # 최근 실행이 먼저 오도록 정렬
+    return [(name, path) for name, path, _ in sorted(runs, key=lambda run: run[2], reverse=True)]
+
+
+# 4. 실행 1건의 대상자 인덱스
+# kind: 'store'(results.sqlite3) 또는 'folders'(대상자별 폴더)
+def build_run_index(run_dir, store=None) -> dict:
+    if ResultStore.exists(run_dir):
+        owned = store is None
+        store = store or ResultStore(run_dir)
+        try:
+            return {
+                "kind": "store",
+                "subjects": natural_sorted(store.subjects()),
+                "manifest": store.manifest(),
+            }
+        finally:
+            if owned:
+                store.close()
+
+    with os.scandir(run_dir) as entries:
+        subjects = [entry.name for entry in entries if entry.is_dir() and not entry.name.startswith(".")]
+    return {"kind": "folders", "subjects": natural_sorted(subjects), "manifest": {}}
+
+# 대상자 폴더 안의 결과 파일 목록 (표 / 이미지)
+def list_subject_files(subject_dir) -> dict:
+    tables, images = [], []
+    with os.scandir(subject_dir) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            ext = os.path.splitext(entry.name)[1].lower()
+            if ext in (".csv", ".txt"):
+                tables.append(entry.name)
+            elif ext in (".png", ".jpg", ".jpeg"):
+                images.append(entry.name)
+    return {"tables": natural_sorted(tables), "images": natural_sorted(images)}
+
+
+# 5. 페이지 나누기 / 썸네일
+def page_count(total_rows, page_size) -> int:
+    return max(1, math.ceil(total_rows / page_size))
+
+def paginate(df, page, page_size):
+    start = (page - 1) * page_size
+    return df.iloc[start:start + page_size]
+
+def make_thumbnail(image, size=THUMBNAIL_SIZE) -> bytes:
+    from PIL import Image
+
+    source = io.BytesIO(image) if isinstance(image, (bytes, bytearray)) else image
+    with Image.open(source) as img:
+        img.thumbnail(size)
+        buffer = io.BytesIO()
+        img.save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
@@ -0,0 +1,286 @@
+# modules/result_store.py
+# 분석 실행(run) 1회의 결과를 하나의 SQLite 파일에 저장하는 결과 저장소
+# - 대상자별 폴더/CSV 대신 subject 컬럼을 가진 테이블에 모아서 저장
+# - manifest 테이블에 실행 정보(원본 파일, ID 컬럼, 질문 컬럼, 상태 등) 기록
+# - 결과는 메모리에 모았다가 flush_every명 단위로 한 번에 기록
+# - 기존 폴더 구조(<대상자>/keyword_freq.csv ...)는 export_folders로 내보낼 수 있음
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+RESULT_DB_NAME = "results.sqlite3"
+STORE_VERSION = 1
+
+# 결과 테이블별 컬럼 (기존 CSV 파일과 동일한 구성)
+RESULT_TABLES = {
+    "keyword_freq": ["keyword", "category", "count"],
+    "sentiment": ["keyword", "sentiment", "category"],
+    "summary": ["summary"],
+}
+CHART_FILES = {
+    "wordcloud": "wordcloud.png",
+    "barchart": "barchart.png",
+    "piechart": "piechart.png",
+}
+
+
+def store_path(run_dir) -> str:
+    return os.path.join(run_dir, RESULT_DB_NAME)
+
+
+class ResultStore:
+    def __init__(self, run_dir, flush_every=50):
+        self.run_dir = run_dir
+        self.flush_every = flush_every
+        self.path = store_path(run_dir)
+        self._lock = threading.Lock()
+        self._pending_subjects = []
+        self._pending_rows = {table: [] for table in RESULT_TABLES}
+        self._pending_charts = []
+
+        os.makedirs(run_dir, exist_ok=True)
+        # 차트 렌더러 작업자 스레드에서도 기록하므로 스레드 공유 허용
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS manifest (key TEXT PRIMARY KEY, value TEXT)")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS subjects (
+                    subject TEXT PRIMARY KEY,
+                    position INTEGER NOT NULL,
+                    saved_at REAL NOT NULL,
+                    content_hash TEXT
+                )
+            """)
+            # 입력 해시 컬럼이 없던 이전 저장소 호환
+            subject_columns = [row[1] for row in self._conn.execute("PRAGMA table_info(subjects)")]
+            if "content_hash" not in subject_columns:
+                self._conn.execute("ALTER TABLE subjects ADD COLUMN content_hash TEXT")
+            for table, columns in RESULT_TABLES.items():
+                column_defs = ", ".join(f'"{col}"' for col in columns)
+                self._conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (subject TEXT NOT NULL, {column_defs})")
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_subject ON {table} (subject)")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS charts (
+                    subject TEXT NOT NULL,
+                    chart TEXT NOT NULL,
+                    png BLOB NOT NULL,
+                    PRIMARY KEY (subject, chart)
+                )
+            """)
+            self._conn.execute(
+                "INSERT OR IGNORE INTO manifest VALUES ('version', ?)", (json.dumps(STORE_VERSION),)
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def exists(run_dir) -> bool:
+        return os.path.isfile(store_path(run_dir))
+
+    # 1. 실행 정보 (manifest)
+    def update_manifest(self, **values):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO manifest VALUES (?, ?)",
+                [(key, json.dumps(value, ensure_ascii=False, default=str)) for key, value in values.items()]
+            )
+            self._conn.commit()
+
+    def manifest(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM manifest").fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    # 2. 결과 기록 (버퍼에 모았다가 일괄 기록)
+    def add_subject(self, subject, results, content_hash=None):
+        subject = str(subject)
+        summary_df = pd.DataFrame([{'summary': results['summary_text']}])
+        tables = {
+            "keyword_freq": results['freq_df'],
+            "sentiment": results['updated_df'],
+            "summary": summary_df,
+        }
+        with self._lock:
+            self._pending_subjects.append((subject, content_hash))
+            for table, df in tables.items():
+                frame = df.reindex(columns=RESULT_TABLES[table]).astype(object)
+                frame = frame.where(frame.notna(), None)
+                self._pending_rows[table].extend((subject, *row) for row in frame.itertuples(index=False))
+            should_flush = len(self._pending_subjects) >= self.flush_every
+        if should_flush:
+            self.flush()
+
+    def add_charts(self, subject, images: dict):
+        with self._lock:
+            self._pending_charts.extend((str(subject), name, png) for name, png in images.items())
+            should_flush = len(self._pending_charts) >= self.flush_every * len(CHART_FILES)
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            if not self._pending_subjects and not self._pending_charts:
+                return
+            now = time.time()
+            with self._conn:
+                if self._pending_subjects:
+                    # 같은 대상자를 다시 저장하면 이전 결과를 교체
+                    subjects = [subject for subject, _ in self._pending_subjects]
+                    self._delete_subjects(subjects)
+                    start = self._conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM subjects").fetchone()[0]
+                    self._conn.executemany(
+                        "INSERT INTO subjects VALUES (?, ?, ?, ?) ON CONFLICT(subject) "
+                        "DO UPDATE SET saved_at = excluded.saved_at, content_hash = excluded.content_hash",
+                        [(s, start + i, now, h) for i, (s, h) in enumerate(self._pending_subjects)]
+                    )
+                    for table, rows in self._pending_rows.items():
+                        placeholders = ",".join("?" * (len(RESULT_TABLES[table]) + 1))
+                        self._conn.executemany(f"INSERT INTO {table} VALUES ({placeholders})", rows)
+                if self._pending_charts:
+                    self._conn.executemany("INSERT OR REPLACE INTO charts VALUES (?, ?, ?)", self._pending_charts)
+            self._pending_subjects = []
+            self._pending_rows = {table: [] for table in RESULT_TABLES}
+            self._pending_charts = []
+
+    def _delete_subjects(self, subjects, charts=False):
+        tables = list(RESULT_TABLES) + (["charts"] if charts else [])
+        for start in range(0, len(subjects), 500):
+            chunk = subjects[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for table in tables:
+                self._conn.execute(f"DELETE FROM {table} WHERE subject IN ({placeholders})", chunk)
+
+    # 이전 실행 저장소에서 대상자 결과(표, 차트, 입력 해시)를 한 번에 복사
+    def copy_subjects_from(self, source_dir, subjects) -> int:
+        subjects = [str(s) for s in subjects]
+        if not subjects:
+            return 0
+        self.flush()
+        with self._lock:
+            self._conn.execute("ATTACH DATABASE ? AS source", (store_path(source_dir),))
+            try:
+                with self._conn:
+                    self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS copy_subjects (subject TEXT PRIMARY KEY)")
+                    self._conn.execute("DELETE FROM copy_subjects")
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO copy_subjects VALUES (?)", [(s,) for s in subjects]
+                    )
+                    self._delete_subjects(subjects, charts=True)
+                    for table in list(RESULT_TABLES) + ["charts"]:
+                        self._conn.execute(
+                            f"INSERT INTO {table} SELECT * FROM source.{table} "
+                            f"WHERE subject IN (SELECT subject FROM copy_subjects) ORDER BY rowid"
+                        )
+                    start = self._conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM subjects").fetchone()[0]
+                    rows = self._conn.execute(
+                        "SELECT subject, content_hash FROM source.subjects "
+                        "WHERE subject IN (SELECT subject FROM copy_subjects) ORDER BY position"
+                    ).fetchall()
+                    self._conn.executemany(
+                        "INSERT INTO subjects VALUES (?, ?, ?, ?) ON CONFLICT(subject) "
+                        "DO UPDATE SET saved_at = excluded.saved_at, content_hash = excluded.content_hash",
+                        [(s, start + i, time.time(), h) for i, (s, h) in enumerate(rows)]
+                    )
+            finally:
+                self._conn.execute("DETACH DATABASE source")
+        return len(rows)
+
+    # 3. 조회 (subject를 지정하지 않으면 전체 대상자)
+    def subjects(self) -> list:
+        with self._lock:
+            rows = self._conn.execute("SELECT subject FROM subjects ORDER BY position").fetchall()
+        return [row[0] for row in rows]
+
+    def _where(self, table, subject):
+        if table not in RESULT_TABLES:
+            raise ValueError(f"알 수 없는 결과 테이블입니다: {table}")
+        if subject is None:
+            return "", ()
+        return " WHERE subject = ?", (str(subject),)
+
+    # limit/offset으로 필요한 구간만 읽을 수 있음 (페이지 단위 조회)
+    def load(self, table, subject=None, limit=None, offset=0) -> pd.DataFrame:
+        where, params = self._where(table, subject)
+        query = f"SELECT * FROM {table}{where} ORDER BY rowid"
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            params = (*params, int(limit), int(offset))
+        with self._lock:
+            return pd.read_sql_query(query, self._conn, params=params)
+
+    def count(self, table, subject=None) -> int:
+        where, params = self._where(table, subject)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {table}{where}", params).fetchone()[0]
+
+    def subject_hashes(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT subject, content_hash FROM subjects").fetchall()
+        return {subject: content_hash for subject, content_hash in rows if content_hash}
+
+    def summary(self, subject) -> str:
+        with self._lock:
+            row = self._conn.execute("SELECT summary FROM summary WHERE subject = ?", (str(subject),)).fetchone()
+        return row[0] if row else ""
+
+    def charts(self, subject, names=None) -> dict:
+        query = "SELECT chart, png FROM charts WHERE subject = ?"
+        params = [str(subject)]
+        if names is not None:
+            names = list(names)
+            query += f" AND chart IN ({','.join('?' * len(names))})"
+            params += names
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return {name: png for name, png in rows}
+
+    def chart_names(self, subject) -> list:
+        with self._lock:
+            rows = self._conn.execute("SELECT chart FROM charts WHERE subject = ?", (str(subject),)).fetchall()
+        return [row[0] for row in rows]
+
+    # 4. 내보내기
+    # 기존 폴더 구조: <output_dir>/<대상자>/keyword_freq.csv, sentiment.csv, summary.csv, *.png
+    def export_folders(self, output_dir=None, subjects=None) -> list:
+        output_dir = output_dir or self.run_dir
+        subjects = [str(s) for s in subjects] if subjects is not None else self.subjects()
+        tables = {table: self.load(table).groupby("subject", sort=False) for table in RESULT_TABLES}
+        exported = []
+        for subject in subjects:
+            participant_dir = os.path.join(output_dir, subject)
+            os.makedirs(participant_dir, exist_ok=True)
+            for table, groups in tables.items():
+                df = groups.get_group(subject) if subject in groups.groups else pd.DataFrame()
+                df = df.reindex(columns=RESULT_TABLES[table])
+                df.to_csv(os.path.join(participant_dir, f"{table}.csv"), index=False)
+            for name, png in self.charts(subject).items():
+                with open(os.path.join(participant_dir, CHART_FILES.get(name, f"{name}.png")), "wb") as f:
+                    f.write(png)
+            exported.append(participant_dir)
+        return exported
+
+    # 전체 대상자 결과를 테이블별 Parquet 파일로 저장
+    def export_parquet(self, output_dir=None) -> dict:
+        output_dir = output_dir or self.run_dir
+        os.makedirs(output_dir, exist_ok=True)
+        paths = {}
+        for table in RESULT_TABLES:
+            path = os.path.join(output_dir, f"{table}.parquet")
+            self.load(table).to_parquet(path, index=False)
+            paths[table] = path
+        return paths
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
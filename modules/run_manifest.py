@@ -0,0 +1,88 @@
+# modules/run_manifest.py
+# 증분 재분석: 대상자별 입력 해시와 분석 설정 지문(fingerprint)을 비교해
+# 이전 실행과 입력이 같은 대상자는 결과를 복사하고, 바뀌었거나 새로 추가된 대상자만 다시 분석
+import hashlib
+import json
+
+from modules.analysis.categorize import category_prompt, category_schema, keyword_prompt, keyword_schema
+from modules.analysis.category_classifier import classifier_settings
+from modules.analysis.dedup import dedup_settings
+from modules.analysis.finbert_backend import FINBERT_MODEL, finbert_settings
+from modules.analysis.local_keywords import extractor_settings
+from modules.analysis.sentiment_module import refine_prompt
+from modules.analysis.summary_module import (
+    SUMMARY_CHUNK_TOKENS,
+    SUMMARY_MODEL,
+    SUMMARY_SYSTEM_PROMPT,
+    summary_map_prompt,
+    summary_prompt,
+    summary_reduce_prompt
+)
+from modules.keyword_index import INDEX_VERSION, canon_settings
+from modules.result_store import ResultStore
+
+# 분석 로직이 바뀌어 이전 결과를 재사용하면 안 될 때 올림
+PIPELINE_VERSION = 1
+
+
+def _sha256(payload) -> str:
+    data = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+def _template_text(prompt):
+    return [message.prompt.template for message in prompt.messages]
+
+
+# 1. 분석 설정 지문: 파이프라인 버전, 모델, 프롬프트가 같아야 결과를 재사용
+def pipeline_fingerprint(llm=None) -> str:
+    return _sha256({
+        "pipeline_version": PIPELINE_VERSION,
+        "llm_model": getattr(llm, "model_name", None),
+        "llm_temperature": getattr(llm, "temperature", None),
+        "summary_model": SUMMARY_MODEL,
+        "summary_chunk_tokens": SUMMARY_CHUNK_TOKENS,
+        "finbert_model": FINBERT_MODEL,
+        "finbert_backend": finbert_settings["backend"],
+        "dedup": dict(dedup_settings),
+        "keyword_extractor": dict(extractor_settings),
+        # 표준화 인덱스 내용(별칭)은 지문에 넣지 않음: 대표 키워드는 키워드 자체로 정해지고,
+        # 실행마다 달라질 수 있는 것은 이전 실행에서 저장된 대표 키워드와의 글자 유사도 묶음뿐이므로 재사용 시 무시
+        "canonicalization": {**canon_settings, "index_version": INDEX_VERSION},
+        "category_classifier": {key: classifier_settings[key] for key in ("mode", "min_confidence", "model")},
+        "prompts": {
+            "keyword": _template_text(keyword_prompt),
+            "category": _template_text(category_prompt),
+            "refine": refine_prompt,
+            "summary": [SUMMARY_SYSTEM_PROMPT, summary_prompt, summary_map_prompt, summary_reduce_prompt],
+        },
+        "schemas": {"keyword": keyword_schema, "category": category_schema},
+    })
+
+
+# 2. 대상자 입력 해시 (정제된 Long Format의 질문/응답, 순서 포함)
+def subject_content_hash(long_df, fingerprint) -> str:
+    rows = long_df[['질문', '응답']].astype(str).values.tolist() if not long_df.empty else []
+    return _sha256({"fingerprint": fingerprint, "rows": rows})
+
+
+# 3. 이전 실행과 비교해 재사용할 대상자 / 다시 분석할 대상자 분리
+def plan_incremental(previous_dir, content_hashes: dict, fingerprint):
+    subjects = list(content_hashes)
+    if not previous_dir or not ResultStore.exists(previous_dir):
+        return [], subjects, "이전 결과 저장소 없음"
+
+    previous = ResultStore(previous_dir)
+    try:
+        if previous.manifest().get("fingerprint") != fingerprint:
+            return [], subjects, "분석 설정(모델/프롬프트/버전) 변경"
+        previous_hashes = previous.subject_hashes()
+    finally:
+        previous.close()
+
+    reuse, analyze = [], []
+    for subject in subjects:
+        if previous_hashes.get(str(subject)) == content_hashes[subject]:
+            reuse.append(subject)
+        else:
+            analyze.append(subject)
+    return reuse, analyze, None
@@ -0,0 +1,57 @@
+# modules/stage_graph.py
+# 분석 단계를 의존 관계 그래프로 실행하는 작은 스케줄러
+# - 선행 단계가 모두 끝난 단계는 바로 작업자 스레드에서 시작하므로, 서로 독립인 단계는 동시에 실행됨
+#   (대상자 1명의 소요 시간이 단계별 시간의 합이 아니라 가장 긴 경로에 가까워짐)
+# - 기다리는 동안 호출한 스레드에서 reporter.flush()를 호출해 다른 스레드에서 쌓인 진행 상황을 반영
+# - 한 단계가 실패하면 아직 시작하지 않은 단계는 실행하지 않고 첫 오류를 그대로 전달
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from modules.metrics import ContextThreadPoolExecutor
+from modules.progress import ensure_reporter
+
+
+class StageGraph:
+    def __init__(self, max_workers=None, poll_interval=0.2):
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval
+        self._stages = {}
+
+    # fn(inputs)는 선행 단계 결과를 {단계 이름: 결과} 형태로 받음
+    # 선행 단계는 먼저 추가되어 있어야 하므로 순환 의존은 생길 수 없음
+    def add(self, name, fn, deps=()):
+        if name in self._stages:
+            raise ValueError(f"이미 추가된 단계입니다: {name}")
+        unknown = [dep for dep in deps if dep not in self._stages]
+        if unknown:
+            raise ValueError(f"'{name}' 단계의 선행 단계를 찾을 수 없습니다: {unknown}")
+        self._stages[name] = (fn, tuple(deps))
+        return self
+
+    def run(self, reporter=None) -> dict:
+        reporter = ensure_reporter(reporter)
+        results = {}
+        waiting = dict(self._stages)
+        running = {}
+        max_workers = self.max_workers or max(len(self._stages), 1)
+
+        with ContextThreadPoolExecutor(max_workers=max_workers) as executor:
+            while waiting or running:
+                for name, (fn, deps) in list(waiting.items()):
+                    if all(dep in results for dep in deps):
+                        del waiting[name]
+                        running[executor.submit(fn, {dep: results[dep] for dep in deps})] = name
+
+                done, _ = wait(running, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                reporter.flush()
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception:
+                        # 이미 실행 중인 단계는 끝날 때까지 기다린 뒤 오류 전달
+                        waiting.clear()
+                        for other in running:
+                            other.cancel()
+                        raise
+        reporter.flush()
+        return results
@@ -0,0 +1,79 @@
+# modules/subject_executor.py
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from modules.progress import ProgressReporter, ensure_reporter
+
+
+# 병렬 분석 중 대상자별 파이프라인이 사용하는 리포터
+# 진행률/표 등은 대상자끼리 겹치므로 생략하고 경고·오류와 스트리밍 텍스트(대상자별 key)만 상위 리포터로 전달
+class SubjectReporter(ProgressReporter):
+    def __init__(self, parent, subject):
+        self.parent = parent
+        self.subject = subject
+        self.wants_stream = parent.wants_stream
+
+    def _key(self, key):
+        return f"{key} · {self.subject}"
+
+    def stream(self, key, token):
+        self.parent.stream(self._key(key), token)
+
+    def clear(self, key):
+        self.parent.clear(self._key(key))
+
+    def warning(self, message):
+        self.parent.warning(f"[{self.subject}] {message}")
+
+    def error(self, message):
+        self.parent.error(f"[{self.subject}] {message}")
+
+
+# 여러 대상자를 동시에 분석하되, 결과 저장(on_result)은 항상 입력 순서대로 메인 스레드에서 실행
+class SubjectExecutor:
+    def __init__(self, max_workers=4, poll_interval=0.5):
+        self.max_workers = max(1, int(max_workers))
+        self.poll_interval = poll_interval
+
+    def run(self, subjects, analyze, on_result, reporter=None):
+        reporter = ensure_reporter(reporter)
+        total = len(subjects)
+        reporter.progress("run", 0.0, text=f"분석 및 저장 진행 중 (0 / {total})")
+        if not total:
+            return
+
+        def report(done):
+            reporter.progress("run", done / total, text=f"분석 및 저장 진행 중 ({done} / {total})")
+
+        # 작업자가 1명이면 기존처럼 순서대로 실행 (진행률/표 등 상세 과정도 그대로 전달)
+        if self.max_workers == 1:
+            for i, subject in enumerate(subjects):
+                on_result(subject, analyze(subject, reporter))
+                report(i + 1)
+            return
+
+        buffered = {}
+        next_index = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(analyze, subject, SubjectReporter(reporter, subject)): i
+                for i, subject in enumerate(subjects)
+            }
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                reporter.flush()
+                for future in done:
+                    try:
+                        buffered[futures[future]] = future.result()
+                    except Exception:
+                        # 한 대상자가 실패하면 아직 시작하지 않은 대상자는 취소
+                        for other in pending:
+                            other.cancel()
+                        raise
+
+                # 앞선 대상자가 모두 끝난 경우에만 순서대로 저장
+                while next_index in buffered:
+                    on_result(subjects[next_index], buffered.pop(next_index))
+                    next_index += 1
+                    report(next_index)
+        reporter.flush()
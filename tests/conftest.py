@@ -0,0 +1,41 @@
+# tests/conftest.py
+# 테스트는 실제 캐시(.cache/*)를 건드리지 않도록 분석 모듈을 불러오기 전에 임시 위치 지정
+import os
+import tempfile
+
+os.environ.setdefault("HR_CACHE_DIR", tempfile.mkdtemp(prefix="hr_test_llm_cache_"))
+os.environ.setdefault("HR_KEYWORD_INDEX_DIR", tempfile.mkdtemp(prefix="hr_test_keyword_index_"))
+os.environ.setdefault("HR_INGEST_CACHE_DIR", tempfile.mkdtemp(prefix="hr_test_uploads_"))
+
+import pytest
+
+from benchmarks.fakes import FakeChatModel, FakeEmbedder, FakeLLMBackend, FakeOpenAI, FakeSentimentClassifier
+from benchmarks.synthetic_survey import generate_survey, question_columns
+
+
+# 모든 OpenAI / FinBERT / 임베딩 호출을 가짜 모델로 연결
+@pytest.fixture
+def fake_backend():
+    from modules.analysis.category_classifier import set_embedder
+    from modules.analysis.finbert_backend import set_classifier
+    from modules.llm_client import set_openai_client
+
+    backend = FakeLLMBackend(latency=0.0, seed=0)
+    set_openai_client(FakeOpenAI(backend))
+    set_classifier(FakeSentimentClassifier(latency_per_item=0.0))
+    set_embedder(FakeEmbedder(latency_per_item=0.0))
+    yield backend
+    set_openai_client(None)
+    set_classifier(None)
+    set_embedder(None)
+
+
+@pytest.fixture
+def fake_llm(fake_backend):
+    return FakeChatModel(fake_backend)
+
+
+# 대상자 4명 × 평가자 3명 × 질문 2개
+@pytest.fixture
+def survey():
+    return generate_survey(n_subjects=4, raters_per_subject=3, n_questions=2, seed=0), question_columns(2)
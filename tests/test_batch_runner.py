@@ -0,0 +1,26 @@
+# tests/test_batch_runner.py
+# 이어서 실행하면 저장된 체크포인트를 먼저 재사용하고, 나머지 대상자는 지정한 이전 실행 결과와 비교해야 함
+from benchmarks.synthetic_survey import ID_COLUMN
+from modules.batch_runner import run_analysis
+from modules.result_store import ResultStore
+
+
+def _run(survey, llm, run_dir, **kwargs):
+    df, question_cols = survey
+    return run_analysis(df, ID_COLUMN, question_cols, str(run_dir), llm, lazy_charts=True, **kwargs)
+
+
+def test_resume_uses_checkpoint_then_previous_run(survey, fake_llm, tmp_path):
+    df, _ = survey
+    subjects = df[ID_COLUMN].unique().tolist()
+    baseline = _run(survey, fake_llm, tmp_path / "baseline")
+    assert baseline["saved"] == subjects
+
+    # 앞의 두 명만 저장된 상태(중단된 작업)에서 이어서 실행
+    _run(survey, fake_llm, tmp_path / "current", subjects=subjects[:2])
+    resumed = _run(survey, fake_llm, tmp_path / "current", resume=True, previous_dir=str(tmp_path / "baseline"))
+
+    assert resumed["saved"] == []
+    assert resumed["reused"] == subjects
+    with ResultStore(str(tmp_path / "current")) as store:
+        assert sorted(store.subjects()) == sorted(str(s) for s in subjects)
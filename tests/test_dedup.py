@@ -0,0 +1,45 @@
+# tests/test_dedup.py
+# 중복 응답을 정리한 뒤 키워드를 추출해도 키워드 빈도(freq_df)가 정리하지 않은 경우와 같아야 함
+from benchmarks.fakes import FakeChatModel, FakeLLMBackend
+from modules.analysis.categorize import run_keyword_analysis
+from modules.analysis.dedup import dedupe_texts, expand_keyword_counts
+from modules.keyword_index import KeywordIndex
+
+DUPLICATED_RESPONSES = (
+    ["팀원들과의 소통이 원활합니다."] * 5
+    + ["항상 책임감 있게 업무를 마무리합니다.", "항상 책임감 있게 업무를 마무리합니다!"]
+    + ["소통과 협업 모두 좋습니다.", "문제해결 능력이 뛰어납니다.", "복지 제도가 아쉽습니다."]
+    + ["문제해결 과정에서 리더십을 보여 주셨습니다."] * 3
+)
+
+
+def _freq(texts, tmp_path, name, weights=None):
+    llm = FakeChatModel(FakeLLMBackend(latency=0.0, seed=0))
+    freq, _ = run_keyword_analysis(
+        texts, llm, weights=weights, mode="llm", keyword_index=KeywordIndex(cache_dir=str(tmp_path / name))
+    )
+    return freq.sort_values("keyword").reset_index(drop=True)
+
+
+def test_deduped_freq_matches_undeduped(tmp_path):
+    representatives, weights, stats = dedupe_texts(DUPLICATED_RESPONSES, mode="exact")
+    assert stats["exact_duplicates"] == 7
+
+    plain = _freq(DUPLICATED_RESPONSES, tmp_path, "plain")
+    deduped = _freq(representatives, tmp_path, "deduped", weights=dict(zip(representatives, weights)))
+
+    assert plain.to_dict("records") == deduped.to_dict("records")
+    assert dict(zip(plain["keyword"], plain["count"]))["소통"] == 6
+
+
+def test_expand_counts_uses_source_weights():
+    batch = ["팀원들과의 의사소통이 원활합니다", "협업을 잘 합니다"]
+    weights = {batch[0]: 5}
+    items = [("의사소통", [0]), ("소통", [0]), ("협업 능력", [1]), ("소통", [0, 1])]
+
+    counts = {}
+    for keyword in expand_keyword_counts(items, batch, weights):
+        counts[keyword] = counts.get(keyword, 0) + 1
+
+    # 겹치는 키워드도 나온 응답의 weight만큼만, 같은 키워드는 응답마다 한 번만 셈
+    assert counts == {"의사소통": 5, "소통": 6, "협업 능력": 1}
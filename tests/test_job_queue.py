@@ -0,0 +1,66 @@
+# tests/test_job_queue.py
+# 취소한 작업은 저장된 대상자까지 남기고, 이어서 실행하면 남은 대상자만 분석해야 함
+import pytest
+
+from benchmarks.synthetic_survey import ID_COLUMN
+from modules.job_queue import JobQueue, run_analysis_job
+from modules.result_store import ResultStore
+
+
+@pytest.fixture
+def queue(tmp_path, fake_llm, monkeypatch):
+    monkeypatch.setattr("modules.config.build_llm", lambda **kwargs: fake_llm)
+    return JobQueue(job_dir=str(tmp_path / "jobs"))
+
+
+def _submit(queue, survey, tmp_path):
+    df, question_cols = survey
+    params = {
+        "id_col": ID_COLUMN, "question_cols": question_cols, "analysis_dir": str(tmp_path / "run"),
+        "max_workers": 1, "lazy_charts": True,
+    }
+    return queue.submit(params, df=df)
+
+
+def _run_next(queue):
+    job = queue._claim()
+    queue.run_job(job)
+    return queue.get(job["id"])
+
+
+def test_cancel_queued_job(queue, survey, tmp_path):
+    job_id = _submit(queue, survey, tmp_path)
+    assert queue.cancel(job_id)
+    assert queue.status(job_id) == "cancelled"
+    assert queue._claim() is None
+
+    assert queue.resume(job_id)
+    assert queue.status(job_id) == "queued"
+
+
+def test_cancel_running_job_then_resume(queue, survey, tmp_path):
+    job_id = _submit(queue, survey, tmp_path)
+
+    # 세 번째 대상자를 시작하기 전에 취소 요청
+    checks = []
+    def runner(params, reporter, should_stop):
+        def stop():
+            checks.append(None)
+            if len(checks) == 3:
+                queue.cancel(job_id)
+            return should_stop()
+        return run_analysis_job(params, reporter, stop)
+    queue.runner = runner
+
+    job = _run_next(queue)
+    assert job["status"] == "cancelled"
+    with ResultStore(str(tmp_path / "run")) as store:
+        assert len(store.subjects()) == 2
+
+    assert queue.resume(job_id)
+    job = _run_next(queue)
+    assert job["status"] == "completed"
+    assert job["attempts"] == 2
+    assert (job["result"]["saved"], job["result"]["reused"]) == (2, 2)
+    with ResultStore(str(tmp_path / "run")) as store:
+        assert len(store.subjects()) == 4
@@ -0,0 +1,32 @@
+# tests/test_keyword_index.py
+# 표현만 다른 키워드는 같은 실행 안에서도 하나의 대표 키워드로 묶여야 함
+from modules.keyword_index import KeywordIndex
+
+
+def test_near_duplicates_merge_within_one_run(tmp_path):
+    index = KeywordIndex(cache_dir=str(tmp_path))
+    # 한 번에 들어온 키워드는 짧은 표준형부터 대표 키워드가 됨 (입력 순서와 무관)
+    assert index.canonicalize(["문제해결력", "문제해결 능력"]) == ["문제해결", "문제해결"]
+    assert index.canonicalize(["커뮤니케이숀", "커뮤니케이션"]) == ["커뮤니케이션", "커뮤니케이션"]
+    # 앞선 묶음에서 정해진 대표 키워드와도 묶임
+    assert index.canonicalize(["문제 해결력"]) == ["문제해결"]
+
+
+def test_surface_variants_share_one_canonical(tmp_path):
+    index = KeywordIndex(cache_dir=str(tmp_path))
+    keywords = ["원활한 소통", "소통능력", "소통", "소통 능력", "적극적", "적극", "문제 해결", "문제해결"]
+    # 순서와 개수는 입력 그대로
+    assert index.canonicalize(keywords) == ["소통", "소통", "소통", "소통", "적극", "적극", "문제해결", "문제해결"]
+
+
+def test_negative_keywords_are_kept_apart(tmp_path):
+    index = KeywordIndex(cache_dir=str(tmp_path))
+    assert index.canonicalize(["의사소통 부족", "의사소통"]) == ["의사소통부족", "의사소통"]
+
+
+def test_aliases_persist_across_instances(tmp_path):
+    KeywordIndex(cache_dir=str(tmp_path)).canonicalize(["문제 해결"])
+    reopened = KeywordIndex(cache_dir=str(tmp_path))
+    assert reopened.aliases == {"문제 해결": "문제해결"}
+    # 디스크에서 읽은 대표 키워드와도 글자 유사도로 묶음
+    assert reopened.canonicalize(["문제해결력"]) == ["문제해결"]
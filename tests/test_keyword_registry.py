@@ -0,0 +1,91 @@
+# tests/test_keyword_registry.py
+# 동시에 분석 중인 대상자는 다른 대상자가 처리 중인 키워드를 다시 요청하지 않고 결과를 기다려야 함
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from benchmarks.fakes import FakeChatModel, FakeLLMBackend, FakeSentimentClassifier
+from modules.analysis.categorize import run_keyword_analysis
+from modules.analysis.finbert_backend import set_classifier
+from modules.analysis.sentiment_module import analyze_sentiment_with_finbert
+from modules.keyword_index import KeywordIndex
+from modules.keyword_registry import KeywordRegistry
+
+
+def test_in_flight_keywords_are_not_requested_twice():
+    registry = KeywordRegistry()
+    assert registry.missing_categories(["소통", "책임감"]) == ["소통", "책임감"]
+    # 첫 번째 대상자가 분류 중인 키워드는 다시 예약되지 않음
+    assert registry.missing_categories(["소통", "복지"]) == ["복지"]
+
+    result = {}
+    waiter = threading.Thread(target=lambda: result.update(registry.categories_for(["소통", "책임감"])))
+    waiter.start()
+    waiter.join(timeout=0.1)
+    assert waiter.is_alive()
+
+    registry.update_categories({"소통": "커뮤니케이션"})
+    # 결과를 얻지 못한 키워드는 예약만 풀리고 결과에서 빠짐
+    registry.release_categories(["소통", "책임감"])
+    waiter.join(timeout=1)
+    assert not waiter.is_alive()
+    assert result == {"소통": "커뮤니케이션"}
+    assert registry.missing_categories(["책임감"]) == ["책임감"]
+
+
+class FailingKeywordIndex(KeywordIndex):
+    # 첫 묶음은 정상 처리(키워드 예약)하고 두 번째 묶음에서 실패
+    calls = 0
+
+    def canonicalize(self, keywords):
+        self.calls += 1
+        if self.calls > 1:
+            raise RuntimeError("canonicalize failed")
+        return super().canonicalize(keywords)
+
+
+def test_failed_subject_releases_reserved_keywords(tmp_path):
+    texts = ["팀원들과의 소통이 원활합니다.", "항상 책임감 있게 업무를 마무리합니다.", "복지 제도가 아쉽습니다."]
+    llm = FakeChatModel(FakeLLMBackend(latency=0.0, seed=0))
+    registry = KeywordRegistry(wait_timeout=5)
+
+    failing = FailingKeywordIndex(cache_dir=str(tmp_path / "failing"))
+    with pytest.raises(RuntimeError):
+        run_keyword_analysis(texts, llm, registry=registry, max_input_tokens=20, mode="llm", keyword_index=failing)
+    assert not registry._pending["category"]
+
+    # 두 번째 대상자는 실패한 대상자가 예약했던 키워드도 직접 분류해 기다리지 않고 끝남
+    started = time.monotonic()
+    freq, category_map = run_keyword_analysis(
+        texts, llm, registry=registry, max_input_tokens=20, mode="llm",
+        keyword_index=KeywordIndex(cache_dir=str(tmp_path / "ok"))
+    )
+    assert time.monotonic() - started < 5
+    assert set(freq["keyword"]) == set(category_map)
+    assert all(category != "기타" for category in category_map.values())
+
+
+def test_lookup_gives_up_after_wait_timeout():
+    registry = KeywordRegistry(wait_timeout=0.1)
+    registry.missing_categories(["소통"])
+    assert registry.categories_for(["소통"]) == {}
+
+
+def test_failed_finbert_releases_reserved_keywords(fake_backend):
+    freq_df = pd.DataFrame({"keyword": ["소통", "책임감"]})
+    registry = KeywordRegistry(wait_timeout=5)
+
+    def broken(keywords, **kwargs):
+        raise RuntimeError("model failed")
+    set_classifier(broken)
+    with pytest.raises(RuntimeError):
+        analyze_sentiment_with_finbert([], None, freq_df, {}, registry=registry)
+    assert not registry._pending["finbert"]
+
+    # 두 번째 대상자는 예약이 풀린 키워드를 직접 분류
+    set_classifier(FakeSentimentClassifier(latency_per_item=0.0))
+    sentiment_df = analyze_sentiment_with_finbert([], None, freq_df, {"소통": "커뮤니케이션"}, registry=registry)
+    assert sentiment_df["keyword"].tolist() == ["소통", "책임감"]
+    assert set(registry.finbert) == {"소통", "책임감"}
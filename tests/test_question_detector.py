@@ -0,0 +1,18 @@
+# tests/test_question_detector.py
+# 날짜/숫자처럼 JSON으로 저장할 수 없는 컬럼명도 GPT 탐지 결과를 캐시하고 같은 컬럼으로 돌려줘야 함
+import pandas as pd
+
+from benchmarks.synthetic_survey import ID_COLUMN
+from modules.llm_cache import LLMCache
+from modules.question_detector import detect_question_columns_with_gpt
+
+
+def test_non_string_columns_are_cached(fake_backend, tmp_path):
+    cache = LLMCache(cache_dir=str(tmp_path))
+    columns = [ID_COLUMN, "잘한 점", pd.Timestamp("2024-01-01")]
+
+    assert detect_question_columns_with_gpt(columns, cache=cache) == ["잘한 점", pd.Timestamp("2024-01-01")]
+    assert fake_backend.stats()["calls"] == 1
+    # 두 번째 호출은 캐시에서 읽고 원래 컬럼(Timestamp)으로 되돌림
+    assert detect_question_columns_with_gpt(columns, cache=cache) == ["잘한 점", pd.Timestamp("2024-01-01")]
+    assert fake_backend.stats()["calls"] == 1
@@ -0,0 +1,54 @@
+# tests/test_result_store.py
+# 저장한 대상자 결과(표, 요약, 차트, 입력 해시)는 저장소를 다시 열거나 다른 실행으로 복사해도 그대로여야 함
+import pandas as pd
+
+from modules.result_store import ResultStore
+
+
+def _results(subject):
+    return {
+        "freq_df": pd.DataFrame([
+            {"keyword": "소통", "category": "커뮤니케이션", "count": 3},
+            {"keyword": f"책임감 {subject}", "category": "업무태도", "count": 1},
+        ]),
+        "updated_df": pd.DataFrame([
+            {"keyword": "소통", "sentiment": "긍정", "category": "커뮤니케이션"},
+            {"keyword": f"책임감 {subject}", "sentiment": "중립", "category": None},
+        ]),
+        "summary_text": f"{subject} 요약",
+    }
+
+
+def test_round_trip(tmp_path):
+    run_dir = str(tmp_path / "run")
+    with ResultStore(run_dir, flush_every=10) as store:
+        store.update_manifest(id_col="대상자", question_cols=["Q1"], status="completed")
+        for subject in ["A", 7]:
+            store.add_subject(subject, _results(subject), content_hash=f"hash-{subject}")
+        store.add_charts("A", {"wordcloud": b"png-bytes"})
+
+    with ResultStore(run_dir) as store:
+        assert store.subjects() == ["A", "7"]
+        assert store.subject_hashes() == {"A": "hash-A", "7": "hash-7"}
+        assert store.manifest()["question_cols"] == ["Q1"]
+        assert store.summary(7) == "7 요약"
+        assert store.count("keyword_freq") == 4
+        assert store.load("keyword_freq", "A").drop(columns="subject").to_dict("records") == \
+            _results("A")["freq_df"].to_dict("records")
+        assert store.load("sentiment", "A")["category"].tolist() == ["커뮤니케이션", None]
+        assert store.charts("A") == {"wordcloud": b"png-bytes"}
+
+
+def test_copy_subjects_from(tmp_path):
+    with ResultStore(str(tmp_path / "previous")) as store:
+        for subject in ["A", "B"]:
+            store.add_subject(subject, _results(subject), content_hash=f"hash-{subject}")
+        store.add_charts("B", {"barchart": b"bar"})
+
+    with ResultStore(str(tmp_path / "current")) as store:
+        store.add_subject("B", _results("old"), content_hash="stale")
+        assert store.copy_subjects_from(str(tmp_path / "previous"), ["B"]) == 1
+        assert store.subjects() == ["B"]
+        assert store.subject_hashes() == {"B": "hash-B"}
+        assert store.summary("B") == "B 요약"
+        assert store.charts("B") == {"barchart": b"bar"}
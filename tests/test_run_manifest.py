@@ -0,0 +1,36 @@
+# tests/test_run_manifest.py
+# 이전 실행과 입력 해시가 같은 대상자만 재사용하고, 설정 지문이 바뀌면 전체를 다시 분석해야 함
+import pandas as pd
+
+from modules.result_store import ResultStore
+from modules.run_manifest import plan_incremental
+
+
+def _previous_run(run_dir, fingerprint, hashes):
+    with ResultStore(run_dir) as store:
+        store.update_manifest(fingerprint=fingerprint)
+        for subject, content_hash in hashes.items():
+            results = {"freq_df": pd.DataFrame(), "updated_df": pd.DataFrame(), "summary_text": ""}
+            store.add_subject(subject, results, content_hash=content_hash)
+
+
+def test_reuses_only_unchanged_subjects(tmp_path):
+    _previous_run(str(tmp_path), "fp", {"A": "a", "B": "b", "3": "c"})
+    hashes = {"A": "a", "B": "changed", 3: "c", "D": "d"}
+
+    # 숫자 ID도 저장소의 문자열 대상자와 비교
+    assert plan_incremental(str(tmp_path), hashes, "fp") == (["A", 3], ["B", "D"], None)
+
+
+def test_fingerprint_change_reanalyzes_everything(tmp_path):
+    _previous_run(str(tmp_path), "fp", {"A": "a"})
+    reuse, analyze, reason = plan_incremental(str(tmp_path), {"A": "a"}, "new-fp")
+    assert (reuse, analyze) == ([], ["A"])
+    assert reason
+
+
+def test_missing_previous_run(tmp_path):
+    reuse, analyze, reason = plan_incremental(str(tmp_path / "missing"), {"A": "a"}, "fp")
+    assert (reuse, analyze) == ([], ["A"])
+    assert reason
+    assert plan_incremental(None, {"A": "a"}, "fp")[:2] == ([], ["A"])